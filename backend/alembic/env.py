@@ -14,7 +14,7 @@ from app.core.config import settings
 from app.db.base_class import Base
 
 # Import all models so Alembic detects them
-from app.models import driver, expense, maintenance, trip, user, vehicle  # noqa: F401
+from app.models import driver, expense, maintenance, rollup, token, tracking, trip, user, vehicle  # noqa: F401
 
 config = context.config
 if config.config_file_name is not None:
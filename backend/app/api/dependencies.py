@@ -9,9 +9,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
+from app.core.config import settings
 from app.core.security import decode_access_token
 from app.db.session import get_db
 from app.models.user import RoleEnum, User
+from app.services.principal_cache import Principal, principal_cache
+from app.services.token_revocation import denylist
 
 logger = logging.getLogger(__name__)
 security_scheme = HTTPBearer()
@@ -19,31 +22,61 @@ security_scheme = HTTPBearer()
 DbSession = Annotated[AsyncSession, Depends(get_db)]
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    """Decode the JWT and return the authenticated ``User``."""
+def get_token_claims(credentials: HTTPAuthorizationCredentials = Depends(security_scheme)) -> dict:
+    """Verify the bearer access token and return its claims.  No DB access."""
     try:
         payload = decode_access_token(credentials.credentials)
     except Exception:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+    if denylist.is_revoked(payload):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+    return payload
+
 
-    stmt = select(User).options(joinedload(User.role_rel)).where(User.id == payload["sub"])
+async def _load_principal(db: AsyncSession, user_id: str) -> Principal:
+    """Return the principal for *user_id*, consulting the cache before the DB."""
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    stmt = select(User).options(joinedload(User.role_rel)).where(User.id == user_id)
     result = await db.execute(stmt)
     user = result.scalar_one_or_none()
 
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.set(user_id, principal)
+    return principal
+
+
+async def _resolve_principal(db: AsyncSession, payload: dict) -> Principal:
+    if settings.AUTH_TRUST_ROLE_CLAIM:
+        try:
+            return Principal.from_claims(payload)
+        except (KeyError, ValueError):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+    return await _load_principal(db, payload["sub"])
+
+
+async def get_current_user(
+    payload: dict = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_db),
+) -> Principal:
+    """Return the authenticated ``Principal``.
+
+    With ``AUTH_TRUST_ROLE_CLAIM`` enabled (the default) the principal is
+    built from the verified token claims and the users table is not
+    consulted; otherwise it is resolved through the principal cache.
+    """
+    return await _resolve_principal(db, payload)
 
 
 def require_role(*roles: RoleEnum):
     """Return a FastAPI dependency that restricts access to the given roles."""
 
-    async def _guard(current_user: User = Depends(get_current_user)) -> User:
-        user_role = current_user.role_rel.name
-        if user_role not in roles:
+    async def _guard(current_user: Principal = Depends(get_current_user)) -> Principal:
+        if current_user.role not in roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Operation not permitted")
         return current_user
 
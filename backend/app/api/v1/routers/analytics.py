@@ -1,99 +1,98 @@
 """Analytics API router."""
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Literal
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from sqlalchemy import Select, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import joinedload
 
-from app.api.dependencies import require_role
-from app.db.session import get_db
-from app.models.expense import Expense
-from app.models.maintenance import MaintenanceLog
+from app.api.dependencies import Principal, require_role
+from app.core.config import settings
+from app.core.rate_limit import analytics_limit, limiter
+from app.db.session import get_read_db, get_read_session_factory
+from app.models.driver import Driver
+from app.models.rollup import VehicleRollup
 from app.models.trip import Trip, TripStatus
-from app.models.user import RoleEnum, User
+from app.models.user import RoleEnum
 from app.models.vehicle import Vehicle, VehicleStatus
+from app.services.analytics_service import AnalyticsService, Bucket, SeriesPoint, VehicleSort
+from app.services.parquet_export_service import ParquetExportService
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["analytics"])
 
 
 @router.get("/dashboard")
 async def get_dashboard_metrics(
-    db: AsyncSession = Depends(get_db),
-    _current_user: User = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.FINANCIAL_ANALYST)),
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.FINANCIAL_ANALYST)),
 ):
-    """Retrieve high-level KPIs for the command center dashboard."""
-    active_fleet_result = await db.execute(
-        select(func.count(Vehicle.id)).where(Vehicle.status == VehicleStatus.ON_TRIP)
+    """Retrieve high-level KPIs for the command center dashboard in one pass over ``vehicles``."""
+    stmt = select(
+        func.count().filter(Vehicle.status == VehicleStatus.ON_TRIP).label("active_fleet"),
+        func.count().filter(Vehicle.status == VehicleStatus.IN_SHOP).label("maintenance_alerts"),
+        func.count().filter(Vehicle.status != VehicleStatus.RETIRED).label("total_fleet"),
     )
-    active_fleet = active_fleet_result.scalar_one()
+    row = (await db.execute(stmt)).one()
 
-    in_shop_result = await db.execute(
-        select(func.count(Vehicle.id)).where(Vehicle.status == VehicleStatus.IN_SHOP)
-    )
-    maintenance_alerts = in_shop_result.scalar_one()
-
-    total_fleet_result = await db.execute(
-        select(func.count(Vehicle.id)).where(Vehicle.status != VehicleStatus.RETIRED)
-    )
-    total_fleet = total_fleet_result.scalar_one()
-
-    utilization_rate = (active_fleet / total_fleet) if total_fleet > 0 else 0.0
+    utilization_rate = (row.active_fleet / row.total_fleet) if row.total_fleet > 0 else 0.0
 
     return {
-        "activeFleet": active_fleet,
-        "maintenanceAlerts": maintenance_alerts,
+        "activeFleet": row.active_fleet,
+        "maintenanceAlerts": row.maintenance_alerts,
         "utilizationRate": round(utilization_rate, 2),
-        "totalFleet": total_fleet,
+        "totalFleet": row.total_fleet,
     }
 
 
+def _roi_statement() -> Select:
+    """Build a single statement returning every fleet-wide financial total.
+
+    Revenue, distance, fuel and maintenance come from ``vehicle_rollups``
+    (one row per vehicle) instead of the unbounded source tables; the two
+    single-row CTEs are cross-joined so the report is one round-trip over
+    one consistent snapshot.
+    """
+    rollup_totals = select(
+        func.coalesce(func.sum(VehicleRollup.revenue), 0).label("revenue"),
+        func.coalesce(func.sum(VehicleRollup.distance_km), 0).label("distance"),
+        func.coalesce(func.sum(VehicleRollup.fuel_cost), 0).label("fuel_cost"),
+        func.coalesce(func.sum(VehicleRollup.fuel_liters), 0).label("liters"),
+        func.coalesce(func.sum(VehicleRollup.maintenance_cost), 0).label("maintenance_cost"),
+    ).cte("rollup_totals")
+    fleet_totals = select(
+        func.coalesce(func.sum(Vehicle.acquisition_cost), 0).label("acquisition"),
+    ).cte("fleet_totals")
+
+    return select(rollup_totals, fleet_totals.c.acquisition).select_from(rollup_totals).join(fleet_totals, true())
+
+
 @router.get("/roi")
+@limiter.limit(analytics_limit)
 async def get_financial_roi(
-    db: AsyncSession = Depends(get_db),
-    _current_user: User = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.FINANCIAL_ANALYST)),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.FINANCIAL_ANALYST)),
 ):
     """Aggregate financial ROI across the fleet."""
-    # Total trip revenue
-    revenue_result = await db.execute(
-        select(func.coalesce(func.sum(Trip.revenue), 0))
-    )
-    total_revenue = float(revenue_result.scalar_one())
-
-    # Total fuel cost
-    fuel_result = await db.execute(
-        select(func.coalesce(func.sum(Expense.fuel_cost), 0))
-    )
-    total_fuel_cost = float(fuel_result.scalar_one())
-
-    # Total maintenance cost
-    maint_result = await db.execute(
-        select(func.coalesce(func.sum(MaintenanceLog.cost), 0))
-    )
-    total_maint_cost = float(maint_result.scalar_one())
+    row = (await db.execute(_roi_statement())).one()
 
+    total_revenue = float(row.revenue)
+    total_fuel_cost = float(row.fuel_cost)
+    total_maint_cost = float(row.maintenance_cost)
     total_expenses = total_fuel_cost + total_maint_cost
-
-    # Vehicle acquisition cost
-    acq_result = await db.execute(
-        select(func.coalesce(func.sum(Vehicle.acquisition_cost), 0))
-    )
-    total_acquisition = float(acq_result.scalar_one())
+    total_acquisition = float(row.acquisition)
+    total_distance = float(row.distance)
+    total_liters = float(row.liters)
 
     # ROI = (Revenue - Expenses) / Acquisition * 100
     roi_pct = ((total_revenue - total_expenses) / total_acquisition * 100) if total_acquisition > 0 else 0.0
-
-    # Total distance for cost-per-km
-    dist_result = await db.execute(
-        select(func.coalesce(func.sum(Trip.distance_km), 0))
-    )
-    total_distance = float(dist_result.scalar_one())
     cost_per_km = (total_expenses / total_distance) if total_distance > 0 else 0.0
-
-    # Fuel efficiency
-    liters_result = await db.execute(
-        select(func.coalesce(func.sum(Expense.fuel_liters), 0))
-    )
-    total_liters = float(liters_result.scalar_one())
     fuel_efficiency = (total_distance / total_liters) if total_liters > 0 else 0.0
 
     return {
@@ -109,15 +108,131 @@ async def get_financial_roi(
     }
 
 
+def _series_point(point: SeriesPoint, days: int, vehicles: int) -> dict:
+    costs = point.fuel_cost + point.maintenance_cost
+    capacity = days * vehicles
+    return {
+        "bucketStart": point.bucket_start.isoformat(),
+        "vehicleId": point.vehicle_id,
+        "tripCount": point.trip_count,
+        "revenue": round(point.revenue, 2),
+        "fuelCost": round(point.fuel_cost, 2),
+        "maintenanceCost": round(point.maintenance_cost, 2),
+        "distanceKm": round(point.distance_km, 2),
+        "costPerKm": round(costs / point.distance_km, 2) if point.distance_km > 0 else 0.0,
+        "fuelEfficiencyKmPerL": round(point.distance_km / point.fuel_liters, 2) if point.fuel_liters > 0 else 0.0,
+        # Share of vehicle-days in the bucket with at least one trip started.
+        "utilizationRate": round(point.active_days / capacity, 2) if capacity > 0 else 0.0,
+    }
+
+
+@router.get("/timeseries")
+@limiter.limit(analytics_limit)
+async def get_time_series(
+    request: Request,
+    bucket: Bucket = Bucket.DAY,
+    date_from: date | None = Query(default=None, alias="from"),
+    date_to: date | None = Query(default=None, alias="to"),
+    vehicle_id: str | None = None,
+    per_vehicle: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.FINANCIAL_ANALYST)),
+):
+    """Revenue, costs, cost per km, fuel efficiency and utilization per day, week or month.
+
+    ``from`` / ``to`` are inclusive UTC days and default to the 30 days up
+    to today; a range spanning more than ``ANALYTICS_MAX_BUCKETS`` buckets
+    is rejected.  The series is fleet-wide unless ``vehicle_id`` selects one
+    vehicle or ``per_vehicle`` splits every bucket by vehicle.  Trips count
+    towards the bucket they started in.
+    """
+    date_to = date_to or datetime.now(timezone.utc).date()
+    date_from = date_from or date_to - timedelta(days=29)
+    if date_from > date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="'from' must not be after 'to'")
+    if bucket.count(date_from, date_to) > settings.ANALYTICS_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range spans more than {settings.ANALYTICS_MAX_BUCKETS} {bucket.value} buckets; "
+            "narrow it or use a coarser bucket",
+        )
+
+    points, fleet_size = await AnalyticsService.time_series(
+        db, bucket, date_from, date_to, vehicle_id=vehicle_id, per_vehicle=per_vehicle
+    )
+    vehicles = 1 if per_vehicle or vehicle_id else fleet_size
+    day_after = date_to + timedelta(days=1)
+    return {
+        "currency": "INR",
+        "bucket": bucket.value,
+        "from": date_from.isoformat(),
+        "to": date_to.isoformat(),
+        "series": [
+            _series_point(
+                point,
+                (min(bucket.after(point.bucket_start), day_after) - max(point.bucket_start, date_from)).days,
+                vehicles,
+            )
+            for point in points
+        ],
+    }
+
+
+def _rounded(value) -> float | None:
+    return None if value is None else round(float(value), 2)
+
+
+@router.get("/vehicles")
+@limiter.limit(analytics_limit)
+async def get_vehicle_ranking(
+    request: Request,
+    sort: VehicleSort = VehicleSort.ROI,
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = Query(default=10, ge=1, le=settings.MAX_PAGE_SIZE),
+    include_retired: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.FINANCIAL_ANALYST)),
+):
+    """Rank vehicles by ROI, profit, revenue, cost, cost per km or fuel efficiency.
+
+    Defaults to the ten lowest-ROI vehicles.  Ratios without a denominator
+    (no distance, no fuel logged) are ``null`` and ranked last.
+    """
+    rows = await AnalyticsService.vehicle_ranking(
+        db, sort, descending=order == "desc", limit=limit, include_retired=include_retired
+    )
+    return [
+        {
+            "vehicleId": row.id,
+            "name": row.name,
+            "licensePlate": row.license_plate,
+            "status": row.status.value,
+            "tripCount": row.trip_count,
+            "revenue": _rounded(row.revenue),
+            "fuelCost": _rounded(row.fuel_cost),
+            "maintenanceCost": _rounded(row.maintenance_cost),
+            "totalCost": _rounded(row.total_cost),
+            "netProfit": _rounded(row.net_profit),
+            "roiPercentage": _rounded(row.roi),
+            "costPerKm": _rounded(row.cost_per_km),
+            "fuelEfficiencyKmPerL": _rounded(row.fuel_efficiency),
+        }
+        for row in rows
+    ]
+
+
 @router.get("/active-trips")
 async def get_active_trips(
-    db: AsyncSession = Depends(get_db),
-    _current_user: User = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.DISPATCHER)),
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.DISPATCHER)),
 ):
     """List currently active (dispatched/in-transit) trips with driver & vehicle info."""
     stmt = (
         select(Trip)
-        .options(joinedload(Trip.vehicle), joinedload(Trip.driver))
+        .options(
+            joinedload(Trip.vehicle).load_only(Vehicle.license_plate),
+            joinedload(Trip.driver).load_only(Driver.name),
+        )
         .where(Trip.status.in_([TripStatus.DISPATCHED, TripStatus.IN_TRANSIT, TripStatus.OUT_FOR_DELIVERY]))
     )
     result = await db.execute(stmt)
@@ -137,3 +252,40 @@ async def get_active_trips(
         }
         for t in trips
     ]
+
+
+async def _export_parquet_in_background(
+    session_factory: async_sessionmaker[AsyncSession], directory: Path, since: date | None, full: bool
+) -> None:
+    try:
+        datasets = await ParquetExportService.export(session_factory, directory, since=since, full=full)
+    except Exception:
+        logger.exception("Parquet export to %s failed.", directory)
+        return
+    rows = {name: sum(partitions.values()) for name, partitions in datasets.items()}
+    logger.info("Parquet export to %s finished; rows written: %s.", directory, rows)
+
+
+@router.post("/exports/parquet", status_code=status.HTTP_202_ACCEPTED)
+@limiter.limit(analytics_limit)
+async def export_parquet(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    since: date | None = None,
+    full: bool = False,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_read_session_factory),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.FINANCIAL_ANALYST)),
+):
+    """Start refreshing the month-partitioned Parquet export in ``PARQUET_EXPORT_DIR``.
+
+    Incremental from each table's watermark unless ``since`` or ``full`` is
+    given.  The export runs after the response is sent, queued behind any
+    export already writing the directory; its outcome is logged.
+    """
+    if not ParquetExportService.available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Parquet export requires the 'analytics' extra"
+        )
+    directory = Path(settings.PARQUET_EXPORT_DIR)
+    background_tasks.add_task(_export_parquet_in_background, session_factory, directory, since, full)
+    return {"directory": str(directory), "since": since, "full": full}
@@ -1,25 +1,82 @@
 """Authentication router."""
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.dependencies import get_token_claims
+from app.core.config import settings
+from app.core.rate_limit import limiter, set_rate_limit_subject, subject_key
+from app.core.security import PasswordPoolBusy, decode_refresh_token
 from app.db.session import get_db
-from app.schemas.auth import LoginRequest, LoginResponse
+from app.schemas.auth import LoginRequest, LoginResponse, LogoutRequest, RefreshRequest
 from app.services.auth_service import AuthService
 
 router = APIRouter(tags=["auth"])
 
-limiter = Limiter(key_func=get_remote_address)
+
+def _token_response(tokens: tuple[str, str, str]) -> LoginResponse:
+    access_token, refresh_token, role = tokens
+    return LoginResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        expires_in=settings.JWT_EXPIRATION_MINUTES * 60,
+        role=role,
+    )
+
+
+def _login_attempt(request: Request, body: LoginRequest) -> LoginRequest:
+    # Every client may reach us through the same load balancer address, so
+    # attempts are counted against the account they name.
+    set_rate_limit_subject(request, f"login:{body.email.lower()}")
+    return body
+
+
+def _refresh_attempt(request: Request, body: RefreshRequest) -> RefreshRequest:
+    try:
+        set_rate_limit_subject(request, f"refresh:{decode_refresh_token(body.refresh_token)['sub']}")
+    except Exception:
+        pass  # rejected by the handler; counted against the client address
+    return body
 
 
 @router.post("/login", response_model=LoginResponse)
-@limiter.limit("5/minute")
-async def login(request: Request, body: LoginRequest, db: AsyncSession = Depends(get_db)):
-    """Authenticate a user and return a JWT. Rate-limited to 5 req/min per IP."""
+@limiter.limit("5/minute", key_func=subject_key)
+async def login(request: Request, body: LoginRequest = Depends(_login_attempt), db: AsyncSession = Depends(get_db)):
+    """Authenticate a user and return an access/refresh token pair. Rate-limited to 5 req/min per account."""
     try:
-        token, role = await AuthService.authenticate(db, body.email, body.password)
+        tokens = await AuthService.authenticate(db, body.email, body.password)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    return LoginResponse(access_token=token, role=role)
+    except PasswordPoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is busy, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    return _token_response(tokens)
+
+
+@router.post("/refresh", response_model=LoginResponse)
+@limiter.limit("30/minute", key_func=subject_key)
+async def refresh(
+    request: Request, body: RefreshRequest = Depends(_refresh_attempt), db: AsyncSession = Depends(get_db)
+):
+    """Exchange a refresh token for a new token pair. The presented refresh token is revoked.
+
+    Rate-limited to 30 req/min per user.
+    """
+    try:
+        tokens = await AuthService.refresh(db, body.refresh_token)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc))
+    return _token_response(tokens)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    body: LogoutRequest | None = None,
+    claims: dict = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_db),
+):
+    """Revoke the current access token and, if given, the matching refresh token."""
+    await AuthService.logout(db, claims, body.refresh_token if body else None)
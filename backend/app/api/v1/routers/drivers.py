@@ -1,35 +1,49 @@
 """Driver management router."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import require_role
-from app.db.session import get_db
-from app.models.driver import Driver
-from app.models.user import RoleEnum, User
+from app.api.dependencies import Principal, require_role
+from app.core.responses import response_columns, rows_response
+from app.db.concurrency import ensure_version
+from app.db.session import get_db, get_read_db
+from app.models.driver import Driver, DriverStatus
+from app.models.user import RoleEnum
 from app.schemas.driver import DriverCreate, DriverResponse, DriverUpdate
+from app.services.tracking_service import TrackingService
+from app.utils.pagination import PageParams, finish_page, keyset_paginate, page_params
 
 router = APIRouter(tags=["drivers"])
 
+_COLUMNS = response_columns(Driver, DriverResponse)
+
 @router.get("/", response_model=list[DriverResponse])
-async def list_drivers(db: AsyncSession = Depends(get_db)):
-    """Return all drivers."""
-    result = await db.execute(select(Driver))
-    return list(result.scalars().all())
+async def list_drivers(
+    response: Response,
+    driver_status: DriverStatus | None = Query(default=None, alias="status"),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Return a page of drivers ordered by license number, optionally filtered by status."""
+    stmt = select(*_COLUMNS)
+    if driver_status is not None:
+        stmt = stmt.where(Driver.status == driver_status)
+    stmt = keyset_paginate(stmt, Driver.license_number, Driver.id, page)
+    result = await db.execute(stmt)
+    return rows_response(finish_page(list(result.all()), "license_number", page, response), response)
 
 
 @router.post("/", response_model=DriverResponse, status_code=status.HTTP_201_CREATED)
 async def create_driver(
     body: DriverCreate,
     db: AsyncSession = Depends(get_db),
-    _current_user: User = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.SAFETY_OFFICER)),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.SAFETY_OFFICER)),
 ):
     """Register a new driver."""
     driver = Driver(**body.model_dump())
     db.add(driver)
     await db.commit()
-    await db.refresh(driver)
     return driver
 
 
@@ -38,14 +52,22 @@ async def update_driver(
     driver_id: str,
     body: DriverUpdate,
     db: AsyncSession = Depends(get_db),
-    _current_user: User = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.SAFETY_OFFICER)),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.SAFETY_OFFICER)),
 ):
-    """Update an existing driver."""
+    """Update an existing driver.
+
+    Send the ``version`` from the last read to get 409 instead of overwriting a concurrent edit.
+    """
     driver = await db.get(Driver, driver_id)
     if driver is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Driver not found")
-    for field, value in body.model_dump(exclude_unset=True).items():
+    ensure_version(driver, body.version)
+    changes = body.model_dump(exclude_unset=True, exclude={"version"})
+    for field, value in changes.items():
         setattr(driver, field, value)
+    # Tracking pages show the driver's name; keep their read model in step.
+    renamed = await TrackingService.record_driver_name(db, driver) if "name" in changes else []
     await db.commit()
-    await db.refresh(driver)
+    for tracking_id in renamed:
+        TrackingService.invalidate(tracking_id)
     return driver
@@ -1,34 +1,81 @@
 """Expense API router."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.api.dependencies import require_role
-from app.db.session import get_db
+from app.api.dependencies import Principal, require_role
+from app.core.rate_limit import analytics_limit, limiter
+from app.core.responses import response_columns, rows_response, streaming_export
+from app.db.session import get_db, get_read_db, get_read_session_factory
 from app.models.expense import Expense
 from app.models.trip import Trip
-from app.models.user import RoleEnum, User
+from app.models.user import RoleEnum
 from app.models.vehicle import Vehicle
 from app.schemas.expense import ExpenseCreate, ExpenseResponse
+from app.services.export_service import ExportFormat, ExportService
+from app.services.rollup_service import RollupService
+from app.utils.pagination import PageParams, finish_page, keyset_paginate, page_params
 
 router = APIRouter(tags=["expenses"])
 
+_COLUMNS = response_columns(Expense, ExpenseResponse)
+
 @router.get("/", response_model=list[ExpenseResponse])
 async def list_expenses(
-    db: AsyncSession = Depends(get_db),
-    _current_user: User = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.FINANCIAL_ANALYST)),
+    response: Response,
+    vehicle_id: str | None = None,
+    trip_id: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.FINANCIAL_ANALYST)),
+):
+    """List expenses for financial analytics, newest first."""
+    stmt = select(*_COLUMNS)
+    if vehicle_id is not None:
+        stmt = stmt.where(Expense.vehicle_id == vehicle_id)
+    if trip_id is not None:
+        stmt = stmt.where(Expense.trip_id == trip_id)
+    if date_from is not None:
+        stmt = stmt.where(Expense.date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(Expense.date <= date_to)
+    stmt = keyset_paginate(stmt, Expense.date, Expense.id, page, descending=True)
+    result = await db.execute(stmt)
+    return rows_response(finish_page(list(result.all()), "date", page, response), response)
+
+
+@router.get("/export", response_class=StreamingResponse)
+@limiter.limit(analytics_limit)
+async def export_expenses(
+    request: Request,
+    fmt: ExportFormat = Query(default=ExportFormat.NDJSON, alias="format"),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_read_session_factory),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.FINANCIAL_ANALYST)),
 ):
-    """List all expenses for financial analytics."""
-    result = await db.execute(select(Expense))
-    return list(result.scalars().all())
+    """Stream every expense dated in the range as NDJSON or CSV, oldest first."""
+    stmt = select(*_COLUMNS)
+    if date_from is not None:
+        stmt = stmt.where(Expense.date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(Expense.date <= date_to)
+    stmt = stmt.order_by(Expense.date, Expense.id)
+    chunks = ExportService.stream(session_factory, stmt, fmt)
+    return streaming_export(chunks, fmt.media_type, f"expenses.{fmt.value}")
 
 
 @router.post("/", response_model=ExpenseResponse, status_code=status.HTTP_201_CREATED)
 async def log_expense(
     body: ExpenseCreate,
     db: AsyncSession = Depends(get_db),
-    _current_user: User = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.FINANCIAL_ANALYST)),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.FINANCIAL_ANALYST)),
 ):
     vehicle = await db.get(Vehicle, body.vehicle_id)
     if not vehicle:
@@ -45,6 +92,6 @@ async def log_expense(
 
     expense = Expense(**body.model_dump())
     db.add(expense)
+    await RollupService.record_expense(db, expense)
     await db.commit()
-    await db.refresh(expense)
     return expense
@@ -1,56 +1,108 @@
 """Maintenance API router."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.api.dependencies import require_role
-from app.db.session import get_db
+from app.api.dependencies import Principal, require_role
+from app.core.rate_limit import analytics_limit, limiter
+from app.core.responses import response_columns, rows_response, streaming_export
+from app.db.concurrency import run_optimistic
+from app.db.session import get_db, get_read_db, get_read_session_factory
 from app.models.maintenance import MaintenanceLog, MaintenanceStatus
-from app.models.user import RoleEnum, User
+from app.models.user import RoleEnum
 from app.models.vehicle import Vehicle, VehicleStatus
 from app.schemas.maintenance import MaintenanceLogCreate, MaintenanceLogResponse, MaintenanceLogUpdate
+from app.services.export_service import ExportFormat, ExportService
+from app.services.rollup_service import RollupService
+from app.utils.pagination import PageParams, finish_page, keyset_paginate, page_params
 
 router = APIRouter(tags=["maintenance"])
 
+_COLUMNS = response_columns(MaintenanceLog, MaintenanceLogResponse)
+
 @router.get("/", response_model=list[MaintenanceLogResponse])
 async def list_maintenance_logs(
-    db: AsyncSession = Depends(get_db),
-    _current_user: User = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.FINANCIAL_ANALYST)),
+    response: Response,
+    log_status: MaintenanceStatus | None = Query(default=None, alias="status"),
+    vehicle_id: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.FINANCIAL_ANALYST)),
+):
+    """List maintenance logs, newest first."""
+    stmt = select(*_COLUMNS)
+    if log_status is not None:
+        stmt = stmt.where(MaintenanceLog.status == log_status)
+    if vehicle_id is not None:
+        stmt = stmt.where(MaintenanceLog.vehicle_id == vehicle_id)
+    if date_from is not None:
+        stmt = stmt.where(MaintenanceLog.date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(MaintenanceLog.date <= date_to)
+    stmt = keyset_paginate(stmt, MaintenanceLog.date, MaintenanceLog.id, page, descending=True)
+    result = await db.execute(stmt)
+    return rows_response(finish_page(list(result.all()), "date", page, response), response)
+
+
+@router.get("/export", response_class=StreamingResponse)
+@limiter.limit(analytics_limit)
+async def export_maintenance_logs(
+    request: Request,
+    fmt: ExportFormat = Query(default=ExportFormat.NDJSON, alias="format"),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_read_session_factory),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.FINANCIAL_ANALYST)),
 ):
-    """List all maintenance logs."""
-    result = await db.execute(select(MaintenanceLog))
-    return list(result.scalars().all())
+    """Stream every maintenance log dated in the range as NDJSON or CSV, oldest first."""
+    stmt = select(*_COLUMNS)
+    if date_from is not None:
+        stmt = stmt.where(MaintenanceLog.date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(MaintenanceLog.date <= date_to)
+    stmt = stmt.order_by(MaintenanceLog.date, MaintenanceLog.id)
+    chunks = ExportService.stream(session_factory, stmt, fmt)
+    return streaming_export(chunks, fmt.media_type, f"maintenance_logs.{fmt.value}")
 
 
 @router.post("/", response_model=MaintenanceLogResponse, status_code=status.HTTP_201_CREATED)
 async def create_maintenance_log(
     body: MaintenanceLogCreate,
     db: AsyncSession = Depends(get_db),
-    _current_user: User = Depends(require_role(RoleEnum.FLEET_MANAGER)),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER)),
 ):
     """Create a new maintenance log and set Vehicle status to 'In Shop' (Fleet Manager only)."""
-    # Verify vehicle exists and is NOT on an active trip or retired.
-    # To put a vehicle in shop, it should usually be Available (or at least not On Trip).
-    vehicle = await db.get(Vehicle, body.vehicle_id)
-    if not vehicle:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vehicle not found")
 
-    if vehicle.status in [VehicleStatus.ON_TRIP, VehicleStatus.RETIRED]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot put vehicle in shop while it is {vehicle.status.value}",
-        )
+    async def _attempt() -> MaintenanceLog:
+        # Verify vehicle exists and is NOT on an active trip or retired.
+        # To put a vehicle in shop, it should usually be Available (or at least not On Trip).
+        vehicle = await db.get(Vehicle, body.vehicle_id)
+        if not vehicle:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vehicle not found")
 
-    # Change vehicle status
-    vehicle.status = VehicleStatus.IN_SHOP
+        if vehicle.status in [VehicleStatus.ON_TRIP, VehicleStatus.RETIRED]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot put vehicle in shop while it is {vehicle.status.value}",
+            )
 
-    # Create log
-    log = MaintenanceLog(**body.model_dump())
-    db.add(log)
-    await db.commit()
-    await db.refresh(log)
-    return log
+        # Change vehicle status
+        vehicle.status = VehicleStatus.IN_SHOP
+
+        # Create log
+        log = MaintenanceLog(**body.model_dump())
+        db.add(log)
+        await RollupService.record_maintenance(db, log)
+        await db.commit()
+        return log
+
+    return await run_optimistic(db, _attempt)
 
 
 @router.patch("/{log_id}", response_model=MaintenanceLogResponse)
@@ -58,20 +110,23 @@ async def complete_maintenance_log(
     log_id: str,
     body: MaintenanceLogUpdate,
     db: AsyncSession = Depends(get_db),
-    _current_user: User = Depends(require_role(RoleEnum.FLEET_MANAGER)),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER)),
 ):
     """Update a maintenance log status. Completing it sets Vehicle back to 'Available'."""
-    log = await db.get(MaintenanceLog, log_id)
-    if not log:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Maintenance log not found")
-
-    if body.status == MaintenanceStatus.COMPLETED and log.status != MaintenanceStatus.COMPLETED:
-        # Update vehicle back to available
-        vehicle = await db.get(Vehicle, log.vehicle_id)
-        if vehicle and vehicle.status == VehicleStatus.IN_SHOP:
-            vehicle.status = VehicleStatus.AVAILABLE
-
-    log.status = body.status
-    await db.commit()
-    await db.refresh(log)
-    return log
+
+    async def _attempt() -> MaintenanceLog:
+        log = await db.get(MaintenanceLog, log_id)
+        if not log:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Maintenance log not found")
+
+        if body.status == MaintenanceStatus.COMPLETED and log.status != MaintenanceStatus.COMPLETED:
+            # Update vehicle back to available
+            vehicle = await db.get(Vehicle, log.vehicle_id)
+            if vehicle and vehicle.status == VehicleStatus.IN_SHOP:
+                vehicle.status = VehicleStatus.AVAILABLE
+
+        log.status = body.status
+        await db.commit()
+        return log
+
+    return await run_optimistic(db, _attempt)
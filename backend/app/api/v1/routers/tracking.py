@@ -1,81 +1,126 @@
 """Tracking API router — customer-facing shipment tracking."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+import asyncio
+from collections.abc import AsyncIterator, Callable
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
-from app.api.dependencies import get_current_user
-from app.db.session import get_db
-from app.models.trip import Trip
-from app.models.user import RoleEnum, User
+from app.api.dependencies import Principal, get_current_user
+from app.core.config import settings
+from app.db.session import get_read_db
+from app.models.user import RoleEnum
+from app.services.tracking_service import TrackingService
+from app.services.trip_events import TripEvent, broker
 
 router = APIRouter(tags=["tracking"])
 
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Evaluate an ``If-None-Match`` header against *etag* (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+async def _event_stream(request: Request, predicate: Callable[[TripEvent], bool]) -> AsyncIterator[str]:
+    subscription = broker.subscribe(predicate)
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                trip_event = await asyncio.wait_for(
+                    subscription.get(), timeout=settings.TRACKING_STREAM_HEARTBEAT_SECONDS
+                )
+            except TimeoutError:
+                if await request.is_disconnected():
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            if trip_event is None:
+                return
+            yield trip_event.to_sse()
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def stream_trip_events(
+    request: Request,
+    tracking_id: str | None = None,
+    current_user: Principal = Depends(get_current_user),
+):
+    """Push trip status changes as server-sent events (``event: trip_status``).
+
+    Customers receive events for their own shipments only; staff receive
+    every trip, optionally narrowed to one ``tracking_id``.  Clients should
+    re-read current state after reconnecting, since events published while
+    disconnected are not replayed.
+    """
+    is_customer = current_user.role == RoleEnum.CUSTOMER
+
+    def _visible(trip_event: TripEvent) -> bool:
+        if is_customer and trip_event.customer_id != current_user.id:
+            return False
+        return tracking_id is None or trip_event.tracking_id == tracking_id
+
+    return StreamingResponse(
+        _event_stream(request, _visible),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/my-shipments")
 async def get_my_shipments(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Return all shipments for the current customer."""
-    stmt = (
-        select(Trip)
-        .where(Trip.customer_id == current_user.id)
-        .order_by(Trip.start_time.desc())
-    )
-    result = await db.execute(stmt)
-    trips = result.scalars().all()
+    views = await TrackingService.list_for_customer(db, current_user.id)
 
     return [
         {
-            "tracking_id": t.tracking_id,
-            "origin": t.origin,
-            "destination": t.destination,
-            "status": t.status.value,
-            "start_time": t.start_time.isoformat() if t.start_time else None,
+            "tracking_id": v.tracking_id,
+            "origin": v.origin,
+            "destination": v.destination,
+            "status": v.status.value,
+            "start_time": v.start_time.isoformat() if v.start_time else None,
         }
-        for t in trips
+        for v in views
     ]
 
 
 @router.get("/{tracking_id}")
 async def get_tracking_status(
     tracking_id: str,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    """Fetch shipment status by tracking ID. Customers can only see their own."""
-    stmt = (
-        select(Trip)
-        .options(joinedload(Trip.vehicle), joinedload(Trip.driver))
-        .where(Trip.tracking_id == tracking_id)
-    )
-    result = await db.execute(stmt)
-    trip = result.unique().scalar_one_or_none()
+    """Fetch shipment status by tracking ID. Customers can only see their own.
+
+    Responses carry an ``ETag``; a poll that sends it back in
+    ``If-None-Match`` gets ``304 Not Modified`` while the status is unchanged.
+    """
+    entry = await TrackingService.lookup(db, tracking_id)
 
-    if not trip:
+    if entry is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Tracking ID not found"
         )
 
     # Customers can only track their own shipments
-    if current_user.role_rel.name == RoleEnum.CUSTOMER:
-        if trip.customer_id != current_user.id:
+    if current_user.role == RoleEnum.CUSTOMER:
+        if entry.customer_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You can only track your own shipments",
             )
 
-    return {
-        "tracking_id": trip.tracking_id,
-        "status": trip.status.value,
-        "origin": trip.origin,
-        "destination": trip.destination,
-        "vehicle_plate": trip.vehicle.license_plate if trip.vehicle else "N/A",
-        "driver_name": trip.driver.name if trip.driver else "N/A",
-        "cargo_weight": trip.cargo_weight,
-        "distance_km": float(trip.distance_km) if trip.distance_km else None,
-        "start_time": trip.start_time.isoformat() if trip.start_time else None,
-        "end_time": trip.end_time.isoformat() if trip.end_time else None,
-    }
+    headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse(entry.body, headers=headers)
@@ -1,27 +1,78 @@
 """Trip management router."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
 
-from app.api.dependencies import require_role
-from app.db.session import get_db
-from app.models.user import RoleEnum, User
-from app.schemas.trip import TripCreate, TripResponse, TripStatusUpdate
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.dependencies import Principal, require_role
+from app.core.rate_limit import analytics_limit, limiter
+from app.core.responses import rows_response, streaming_export
+from app.db.session import get_db, get_read_db, get_read_session_factory
+from app.models.trip import TripStatus
+from app.models.user import RoleEnum
+from app.schemas.trip import (
+    BulkTripCreate,
+    BulkTripResult,
+    TripAssignment,
+    TripAssignRequest,
+    TripCreate,
+    TripResponse,
+    TripStatusUpdate,
+)
+from app.services.assignment_service import AssignmentService
+from app.services.export_service import ExportFormat, ExportService
 from app.services.trip_service import TripService
+from app.utils.pagination import PageParams, finish_page, page_params
 
 router = APIRouter(tags=["trips"])
 
 @router.get("/", response_model=list[TripResponse])
-async def list_trips(db: AsyncSession = Depends(get_db)):
-    """Return all trips."""
-    return await TripService.list_trips(db)
+async def list_trips(
+    response: Response,
+    trip_status: TripStatus | None = Query(default=None, alias="status"),
+    vehicle_id: str | None = None,
+    driver_id: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Return a page of trips, newest first."""
+    trips = await TripService.list_trips(
+        db,
+        page,
+        status=trip_status,
+        vehicle_id=vehicle_id,
+        driver_id=driver_id,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    return rows_response(finish_page(trips, "start_time", page, response), response)
+
+
+@router.get("/export", response_class=StreamingResponse)
+@limiter.limit(analytics_limit)
+async def export_trips(
+    request: Request,
+    fmt: ExportFormat = Query(default=ExportFormat.NDJSON, alias="format"),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_read_session_factory),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER, RoleEnum.FINANCIAL_ANALYST)),
+):
+    """Stream every trip started in the date range (UTC days) as NDJSON or CSV, oldest first."""
+    stmt = TripService.export_query(date_from, date_to)
+    chunks = ExportService.stream(session_factory, stmt, fmt)
+    return streaming_export(chunks, fmt.media_type, f"trips.{fmt.value}")
 
 
 @router.post("/", response_model=TripResponse, status_code=status.HTTP_201_CREATED)
 async def create_trip(
     body: TripCreate,
     db: AsyncSession = Depends(get_db),
-    _current_user: User = Depends(require_role(RoleEnum.DISPATCHER, RoleEnum.FLEET_MANAGER)),
+    _current_user: Principal = Depends(require_role(RoleEnum.DISPATCHER, RoleEnum.FLEET_MANAGER)),
 ):
     """Dispatch a new trip (Dispatcher / Fleet Manager only)."""
     try:
@@ -31,12 +82,45 @@ async def create_trip(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
 
 
+@router.post("/bulk", response_model=list[BulkTripResult])
+async def create_trips_bulk(
+    body: BulkTripCreate,
+    db: AsyncSession = Depends(get_db),
+    _current_user: Principal = Depends(require_role(RoleEnum.DISPATCHER, RoleEnum.FLEET_MANAGER)),
+):
+    """Dispatch a batch of trips in one transaction (Dispatcher / Fleet Manager only).
+
+    Returns one result per submitted trip, in order: either the created trip
+    or the validation error that rejected it.
+    """
+    results = await TripService.dispatch_trips(db, body.trips)
+    return [
+        BulkTripResult(index=index, trip=trip, error=error) for index, (trip, error) in enumerate(results)
+    ]
+
+
+@router.post("/assign", response_model=list[TripAssignment])
+async def assign_trips(
+    body: TripAssignRequest,
+    db: AsyncSession = Depends(get_db),
+    _current_user: Principal = Depends(require_role(RoleEnum.DISPATCHER, RoleEnum.FLEET_MANAGER)),
+):
+    """Pick a vehicle and driver for each pending trip (Dispatcher / Fleet Manager only).
+
+    Each trip gets the smallest available vehicle that fits its cargo and an
+    on-duty driver with a valid licence.  With ``dispatch: true`` the plan is
+    dispatched in the same request; otherwise it is only returned.
+    """
+    results = await AssignmentService.assign_trips(db, body.trips, dispatch=body.dispatch)
+    return [TripAssignment(index=index, **result) for index, result in enumerate(results)]
+
+
 @router.patch("/{trip_id}/status", response_model=TripResponse)
 async def update_trip_status(
     trip_id: str,
     body: TripStatusUpdate,
     db: AsyncSession = Depends(get_db),
-    _current_user: User = Depends(require_role(RoleEnum.DISPATCHER, RoleEnum.FLEET_MANAGER)),
+    _current_user: Principal = Depends(require_role(RoleEnum.DISPATCHER, RoleEnum.FLEET_MANAGER)),
 ):
     """Progress a trip through its lifecycle."""
     try:
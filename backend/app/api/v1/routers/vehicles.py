@@ -1,35 +1,48 @@
 """Vehicle management router."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import require_role
-from app.db.session import get_db
-from app.models.user import RoleEnum, User
-from app.models.vehicle import Vehicle
+from app.api.dependencies import Principal, require_role
+from app.core.responses import response_columns, rows_response
+from app.db.concurrency import ensure_version
+from app.db.session import get_db, get_read_db
+from app.models.user import RoleEnum
+from app.models.vehicle import Vehicle, VehicleStatus
 from app.schemas.vehicle import VehicleCreate, VehicleResponse, VehicleUpdate
+from app.utils.pagination import PageParams, finish_page, keyset_paginate, page_params
 
 router = APIRouter(tags=["vehicles"])
 
+_COLUMNS = response_columns(Vehicle, VehicleResponse)
+
 @router.get("/", response_model=list[VehicleResponse])
-async def list_vehicles(db: AsyncSession = Depends(get_db)):
-    """Return all vehicles."""
-    result = await db.execute(select(Vehicle))
-    return list(result.scalars().all())
+async def list_vehicles(
+    response: Response,
+    vehicle_status: VehicleStatus | None = Query(default=None, alias="status"),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Return a page of vehicles ordered by license plate, optionally filtered by status."""
+    stmt = select(*_COLUMNS)
+    if vehicle_status is not None:
+        stmt = stmt.where(Vehicle.status == vehicle_status)
+    stmt = keyset_paginate(stmt, Vehicle.license_plate, Vehicle.id, page)
+    result = await db.execute(stmt)
+    return rows_response(finish_page(list(result.all()), "license_plate", page, response), response)
 
 
 @router.post("/", response_model=VehicleResponse, status_code=status.HTTP_201_CREATED)
 async def create_vehicle(
     body: VehicleCreate,
     db: AsyncSession = Depends(get_db),
-    _current_user: User = Depends(require_role(RoleEnum.FLEET_MANAGER)),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER)),
 ):
     """Register a new vehicle (Fleet Manager only)."""
     vehicle = Vehicle(**body.model_dump())
     db.add(vehicle)
     await db.commit()
-    await db.refresh(vehicle)
     return vehicle
 
 
@@ -38,16 +51,19 @@ async def update_vehicle(
     vehicle_id: str,
     body: VehicleUpdate,
     db: AsyncSession = Depends(get_db),
-    _current_user: User = Depends(require_role(RoleEnum.FLEET_MANAGER)),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER)),
 ):
-    """Update an existing vehicle (Fleet Manager only)."""
+    """Update an existing vehicle (Fleet Manager only).
+
+    Send the ``version`` from the last read to get 409 instead of overwriting a concurrent edit.
+    """
     vehicle = await db.get(Vehicle, vehicle_id)
     if vehicle is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vehicle not found")
-    for field, value in body.model_dump(exclude_unset=True).items():
+    ensure_version(vehicle, body.version)
+    for field, value in body.model_dump(exclude_unset=True, exclude={"version"}).items():
         setattr(vehicle, field, value)
     await db.commit()
-    await db.refresh(vehicle)
     return vehicle
 
 
@@ -55,13 +71,11 @@ async def update_vehicle(
 async def retire_vehicle(
     vehicle_id: str,
     db: AsyncSession = Depends(get_db),
-    _current_user: User = Depends(require_role(RoleEnum.FLEET_MANAGER)),
+    _current_user: Principal = Depends(require_role(RoleEnum.FLEET_MANAGER)),
 ):
     """Soft-delete (retire) a vehicle (Fleet Manager only)."""
     vehicle = await db.get(Vehicle, vehicle_id)
     if vehicle is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vehicle not found")
-    from app.models.vehicle import VehicleStatus
-
     vehicle.status = VehicleStatus.RETIRED
     await db.commit()
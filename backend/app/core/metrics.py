@@ -0,0 +1,72 @@
+"""Minimal in-process metric primitives."""
+
+import bisect
+from collections.abc import Iterable, Sequence
+
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style.
+
+    ``observe`` is O(log buckets) and allocation-free, so it is cheap enough
+    to call on every request or connection checkout.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """Return ``(upper_bound, cumulative_count)`` pairs, ending with ``+Inf``."""
+        pairs = []
+        running = 0
+        for bound, bucket_count in zip((*self.buckets, float("inf")), self._counts):
+            running += bucket_count
+            pairs.append((bound, running))
+        return pairs
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "buckets": {("+Inf" if bound == float("inf") else str(bound)): n for bound, n in self.cumulative()},
+        }
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def render_metric(
+    name: str, kind: str, help_text: str, samples: Iterable[tuple[dict[str, str], "float | Histogram"]]
+) -> str:
+    """Render one metric family in the Prometheus text exposition format.
+
+    *kind* is ``counter``, ``gauge`` or ``histogram``; histogram samples are
+    :class:`Histogram` instances, the others plain numbers.
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        if isinstance(value, Histogram):
+            for bound, count in value.cumulative():
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{name}_bucket{_format_labels({**labels, 'le': le})} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {value.sum:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {value.count}")
+        else:
+            lines.append(f"{name}{_format_labels(labels)} {value:g}")
+    return "\n".join(lines) + "\n"
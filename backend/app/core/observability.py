@@ -0,0 +1,153 @@
+"""Per-request latency and SQL instrumentation.
+
+:class:`RequestMetricsMiddleware` times every HTTP request and, through the
+cursor events installed by :func:`instrument_engine`, counts the SQL
+statements it ran and the time spent in them.  Results are aggregated per
+method and route template (``/api/v1/trips/{trip_id}/status``, never the
+concrete path) so label cardinality stays bounded, and rendered for
+Prometheus by :meth:`RequestMetrics.render`.
+
+A route whose statements-per-request histogram sits well above one is the
+signature of an N+1 query; one whose database time is a small share of its
+latency is spending it elsewhere.
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import Histogram, render_metric
+
+STATEMENT_BUCKETS: tuple[float, ...] = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+UNMATCHED_ROUTE = "unmatched"
+
+_QUERY_STARTED = "metrics_query_started"
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """SQL work done on behalf of one request."""
+
+    statements: int = 0
+    seconds: float = 0.0
+
+
+# Mutated in place by the cursor events, so it is shared with any context
+# copied from the request's (SQLAlchemy's greenlets, ``asyncio.to_thread``).
+_current_stats: ContextVar[QueryStats | None] = ContextVar("request_query_stats", default=None)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attribute every statement *engine* executes to the request it runs for."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+        # A DBAPI connection runs one statement at a time, so one slot suffices.
+        conn.info[_QUERY_STARTED] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info.pop(_QUERY_STARTED, None)
+        stats = _current_stats.get()
+        if stats is not None and started is not None:
+            stats.statements += 1
+            stats.seconds += time.perf_counter() - started
+
+
+class RequestMetrics:
+    """Latency, statement-count and database-time histograms keyed by route."""
+
+    def __init__(self) -> None:
+        self.latency: dict[tuple[str, str, str], Histogram] = {}
+        self.statements: dict[tuple[str, str], Histogram] = {}
+        self.db_seconds: dict[tuple[str, str], Histogram] = {}
+
+    def record(self, method: str, route: str, status: int, seconds: float, stats: QueryStats) -> None:
+        key = (method, route)
+        latency_key = (method, route, str(status))
+        if latency_key not in self.latency:
+            self.latency[latency_key] = Histogram()
+        self.latency[latency_key].observe(seconds)
+        if key not in self.statements:
+            self.statements[key] = Histogram(STATEMENT_BUCKETS)
+            self.db_seconds[key] = Histogram()
+        self.statements[key].observe(stats.statements)
+        self.db_seconds[key].observe(stats.seconds)
+
+    def clear(self) -> None:
+        self.latency.clear()
+        self.statements.clear()
+        self.db_seconds.clear()
+
+    def render(self) -> str:
+        """Return the three families in the Prometheus text format."""
+        return "".join(
+            [
+                render_metric(
+                    "http_request_duration_seconds",
+                    "histogram",
+                    "Time to send the complete response.",
+                    (
+                        ({"method": method, "route": route, "status": status}, histogram)
+                        for (method, route, status), histogram in self.latency.items()
+                    ),
+                ),
+                render_metric(
+                    "http_request_sql_statements",
+                    "histogram",
+                    "SQL statements executed per request.",
+                    (({"method": m, "route": r}, histogram) for (m, r), histogram in self.statements.items()),
+                ),
+                render_metric(
+                    "http_request_db_seconds",
+                    "histogram",
+                    "Time spent executing SQL per request.",
+                    (({"method": m, "route": r}, histogram) for (m, r), histogram in self.db_seconds.items()),
+                ),
+            ]
+        )
+
+
+request_metrics = RequestMetrics()
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware feeding :data:`request_metrics`.
+
+    Timing covers the whole response, streamed bodies included, and the
+    statements issued while producing it.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # unless a response starts, the error handler answers with 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_stats.reset(token)
+            # FastAPI records the matched route in the scope.
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            self.metrics.record(scope["method"], route, status, elapsed, stats)
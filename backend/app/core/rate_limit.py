@@ -0,0 +1,84 @@
+"""Shared request rate limiter.
+
+One slowapi ``Limiter`` serves every router.  Counters live in the store
+named by ``RATE_LIMIT_STORAGE_URI``: ``memory://`` keeps them per worker
+process, while ``redis://`` (Redis or a compatible server such as Valkey)
+shares them between workers and hosts.  If that store becomes unreachable
+the limiter falls back to per-worker memory rather than failing requests.
+
+Requests carrying a valid access token are counted per user, and their
+role selects the budget; anonymous requests are counted per client
+address, which ``ProxyHeadersMiddleware`` takes from ``X-Forwarded-For``
+when the load balancer is listed in ``FORWARDED_ALLOW_IPS``.  Login and
+token refresh are counted per account instead (:func:`subject_key`), so
+a shift's worth of users signing in through one address do not share a
+budget.  The default ``sliding-window-counter`` strategy keeps two
+counters per key (the current and previous window) and weights the
+previous one by how much of it still overlaps the window, so a client
+cannot double its budget across a window boundary.
+"""
+
+from fastapi import Request
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from app.core.config import settings
+from app.core.security import decode_access_token
+
+ANONYMOUS = "anonymous"
+_KEY_SEPARATOR = "|"
+
+
+def rate_limit_key(request: Request) -> str:
+    """Return ``"<role>|<user id>"`` for an authenticated request, else ``"anonymous|<address>"``.
+
+    The token signature is verified so a client cannot pick its own
+    bucket; revocation is left to the authentication dependency.
+    """
+    cached = getattr(request.state, "rate_limit_key", None)
+    if cached is not None:
+        return cached
+    key = f"{ANONYMOUS}{_KEY_SEPARATOR}{get_remote_address(request)}"
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            claims = decode_access_token(token)
+            key = f"{claims['role']}{_KEY_SEPARATOR}{claims['sub']}"
+        except Exception:
+            pass  # rejected later by get_token_claims; count it as anonymous
+    request.state.rate_limit_key = key
+    return key
+
+
+def set_rate_limit_subject(request: Request, subject: str) -> None:
+    """Count *request* against *subject*, such as the account a login names, for :func:`subject_key` limits."""
+    request.state.rate_limit_subject = subject
+
+
+def subject_key(request: Request) -> str:
+    """Return ``"subject|<subject>"`` when a subject was set, else :func:`rate_limit_key`.
+
+    The subject is set by a dependency of the route, which FastAPI resolves
+    before the limit is checked.
+    """
+    subject = getattr(request.state, "rate_limit_subject", None)
+    if subject is None:
+        return rate_limit_key(request)
+    return f"subject{_KEY_SEPARATOR}{subject}"
+
+
+def analytics_limit(key: str) -> str:
+    """Return the analytics budget for the role encoded in *key*."""
+    role = key.partition(_KEY_SEPARATOR)[0]
+    limits = settings.RATE_LIMIT_ANALYTICS
+    return limits.get(role, limits.get("default", "10/minute"))
+
+
+limiter = Limiter(
+    key_func=rate_limit_key,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    strategy=settings.RATE_LIMIT_STRATEGY,
+    enabled=settings.RATE_LIMIT_ENABLED,
+    in_memory_fallback_enabled=not settings.RATE_LIMIT_STORAGE_URI.startswith("memory://"),
+    key_prefix="fleetflow",
+)
@@ -0,0 +1,77 @@
+"""JSON response rendering.
+
+The application's default response class is chosen by ``JSON_RESPONSE_ENCODER``:
+``orjson`` (the default) renders in C, ``stdlib`` falls back to Starlette's
+``json.dumps``-based ``JSONResponse``.
+
+List endpoints skip response-model validation altogether: they select
+exactly the columns of their response schema and hand the result rows to
+:func:`rows_response`, which encodes them without building ORM instances or
+pydantic models.  The schema stays on the route as ``response_model`` for
+the OpenAPI document.
+"""
+
+from collections.abc import AsyncIterator, Sequence
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Row
+
+from app.core.config import settings
+
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    # Numeric columns come back as Decimal; response schemas declare them as float.
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode *content* with orjson, accepting ``Decimal``, ``datetime`` and enums as-is."""
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered with :func:`dumps`."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response_class() -> type[JSONResponse]:
+    """Return the configured default response class."""
+    return ORJSONResponse if settings.JSON_RESPONSE_ENCODER == "orjson" else JSONResponse
+
+
+def response_columns(model: type, schema: type[BaseModel]) -> list:
+    """Return the mapped attributes of *model* named by *schema*'s fields, in field order."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def rows_response(rows: Sequence[Row], response: Response) -> JSONResponse:
+    """Encode result *rows* as a JSON array of objects keyed by column name.
+
+    Headers already set on the endpoint's injected *response* (such as the
+    next-page cursor) are carried over.
+    """
+    content: Any = [row._asdict() for row in rows]
+    response_class = json_response_class()
+    if response_class is JSONResponse:
+        # jsonable_encoder would turn a whole-number Decimal into an int; match _default.
+        content = jsonable_encoder(content, custom_encoder={Decimal: float})
+    return response_class(content, headers=dict(response.headers))
+
+
+def streaming_export(chunks: AsyncIterator[bytes], media_type: str, filename: str) -> StreamingResponse:
+    """Stream *chunks* as a file download named *filename*."""
+    return StreamingResponse(
+        chunks, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
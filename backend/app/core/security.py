@@ -1,11 +1,23 @@
 """Password hashing and JWT token utilities."""
 
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from typing import TypeVar
 
 import bcrypt
 import jwt
 
 from app.core.config import settings
+from app.core.metrics import render_metric
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 
 def hash_password(plain: str) -> str:
@@ -23,17 +35,175 @@ def verify_password(plain: str, hashed: str) -> bool:
         return False
 
 
-def create_access_token(subject: str, role: str) -> str:
-    """Create a signed JWT containing *subject* (user id) and *role*."""
-    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.JWT_EXPIRATION_MINUTES)
+def bcrypt_rounds(hashed: str) -> int | None:
+    """Return the cost factor encoded in a bcrypt hash, or ``None`` if it is not one."""
+    parts = hashed.split("$")
+    if len(parts) != 4 or parts[1] not in ("2a", "2b", "2y") or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def password_needs_rehash(hashed: str) -> bool:
+    """Return ``True`` if *hashed* was produced with parameters other than the configured ones."""
+    return bcrypt_rounds(hashed) != settings.BCRYPT_ROUNDS or not hashed.startswith("$2b$")
+
+
+class PasswordPoolBusy(RuntimeError):
+    """Raised when too many password operations are already queued."""
+
+
+class PasswordWorkPool:
+    """Dedicated, bounded thread pool for bcrypt work.
+
+    bcrypt releases the GIL while hashing, so a small thread pool runs it in
+    parallel without blocking the event loop.  Callers beyond
+    ``max_pending`` queued/running operations are rejected immediately
+    rather than letting a login burst build an unbounded backlog.
+    """
+
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_seconds = 0.0
+        self.work_seconds = 0.0
+        self.max_queue_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password")
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """Run ``fn(*args)`` on the pool and await its result.
+
+        Raises:
+            PasswordPoolBusy: If ``max_pending`` operations are already in flight.
+        """
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            logger.warning("Password pool saturated (%d pending); rejecting request.", self.pending)
+            raise PasswordPoolBusy("Password hashing capacity exhausted")
+
+        submitted = time.perf_counter()
+        timings: list[float] = []
+
+        def _timed() -> T:
+            started = time.perf_counter()
+            timings.append(started - submitted)
+            try:
+                return fn(*args)
+            finally:
+                timings.append(time.perf_counter() - started)
+
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), _timed)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+            if len(timings) == 2:
+                queued, worked = timings
+                self.queue_seconds += queued
+                self.work_seconds += worked
+                self.max_queue_seconds = max(self.max_queue_seconds, queued)
+
+    def stats(self) -> dict[str, float | int]:
+        """Return a snapshot of pool counters."""
+        return {
+            "workers": self.workers,
+            "maxPending": self.max_pending,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queueSecondsTotal": round(self.queue_seconds, 6),
+            "workSecondsTotal": round(self.work_seconds, 6),
+            "maxQueueSeconds": round(self.max_queue_seconds, 6),
+        }
+
+    def metrics(self) -> str:
+        """Return the pool counters in the Prometheus text format."""
+        families = [
+            ("password_pool_pending", "gauge", "Hash operations queued or running.", self.pending),
+            ("password_pool_completed_total", "counter", "Hash operations finished.", self.completed),
+            ("password_pool_rejected_total", "counter", "Hash operations shed when the queue was full.", self.rejected),
+            ("password_pool_queue_seconds_total", "counter", "Time operations spent queued.", self.queue_seconds),
+            ("password_pool_work_seconds_total", "counter", "Time spent hashing.", self.work_seconds),
+        ]
+        return "".join(render_metric(name, kind, help_text, [({}, value)]) for name, kind, help_text, value in families)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_pool = PasswordWorkPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
+async def hash_password_async(plain: str) -> str:
+    """Like :func:`hash_password`, run on :data:`password_pool`."""
+    return await password_pool.run(hash_password, plain)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    """Like :func:`verify_password`, run on :data:`password_pool`."""
+    return await password_pool.run(verify_password, plain, hashed)
+
+
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+
+
+def _encode_token(claims: dict, lifetime: timedelta) -> str:
+    now = datetime.now(timezone.utc)
     payload = {
-        "sub": subject,
-        "role": role,
-        "exp": expire,
+        **claims,
+        "jti": str(uuid.uuid4()),
+        # Sub-second precision so a per-user revocation cut-off does not
+        # also reject tokens issued moments later in the same second.
+        "iat": now.timestamp(),
+        "exp": now + lifetime,
     }
     return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
 
+def create_access_token(subject: str, role: str, email: str | None = None) -> str:
+    """Create a short-lived signed JWT carrying *subject* (user id), *role* and *email*.
+
+    The claims are sufficient to authorise a request without a DB lookup.
+    """
+    claims = {"sub": subject, "role": role, "type": ACCESS_TOKEN_TYPE}
+    if email is not None:
+        claims["email"] = email
+    return _encode_token(claims, timedelta(minutes=settings.JWT_EXPIRATION_MINUTES))
+
+
+def create_refresh_token(subject: str) -> str:
+    """Create a long-lived JWT that can only be exchanged at ``/auth/refresh``."""
+    claims = {"sub": subject, "type": REFRESH_TOKEN_TYPE}
+    return _encode_token(claims, timedelta(minutes=settings.JWT_REFRESH_EXPIRATION_MINUTES))
+
+
+def _decode_token(token: str, expected_type: str) -> dict:
+    payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+    # Tokens minted before refresh support carry no type; they are access tokens.
+    if payload.get("type", ACCESS_TOKEN_TYPE) != expected_type:
+        raise jwt.InvalidTokenError(f"Expected a {expected_type} token")
+    return payload
+
+
 def decode_access_token(token: str) -> dict:
-    """Decode and return the JWT payload.  Raises on expiry / tamper."""
-    return jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+    """Decode and return an access-token payload.  Raises on expiry / tamper / wrong type."""
+    return _decode_token(token, ACCESS_TOKEN_TYPE)
+
+
+def decode_refresh_token(token: str) -> dict:
+    """Decode and return a refresh-token payload.  Raises on expiry / tamper / wrong type."""
+    return _decode_token(token, REFRESH_TOKEN_TYPE)
@@ -1,9 +1,34 @@
 """SQLAlchemy declarative base shared by all ORM models."""
 
-from sqlalchemy.orm import DeclarativeBase
+from typing import Any
+
+from sqlalchemy import Integer
+from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, mapped_column
 
 
 class Base(DeclarativeBase):
-    """Project-wide declarative base class."""
+    """Project-wide declarative base class.
+
+    ``eager_defaults`` makes flushes fetch server-generated column values
+    through ``INSERT/UPDATE ... RETURNING``, so a committed instance is
+    complete and handlers return it without a ``refresh()`` round-trip.
+    Models that set their own ``__mapper_args__`` must repeat the flag.
+    """
+
+    @declared_attr.directive
+    def __mapper_args__(cls) -> dict[str, Any]:
+        return {"eager_defaults": True}
+
+
+class Versioned:
+    """Mixin for models guarded by optimistic concurrency (see ``app.db.concurrency``).
+
+    ``version`` is the mapper's ``version_id_col``: every ORM ``UPDATE``
+    checks and bumps it.  List the mixin before :class:`Base`.
+    """
+
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
 
-    pass
+    @declared_attr.directive
+    def __mapper_args__(cls) -> dict[str, Any]:
+        return {"version_id_col": cls.__table__.c.version, "eager_defaults": True}
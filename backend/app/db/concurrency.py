@@ -0,0 +1,55 @@
+"""Optimistic concurrency helpers.
+
+Versioned models (``version_id_col``) turn every ORM ``UPDATE`` into a
+compare-and-swap on ``version``; a writer that loses the race gets
+``StaleDataError`` at flush instead of silently overwriting the winner.
+Service operations that can simply be recomputed from fresh state are run
+through :func:`run_optimistic`; user edits are not retried and surface as
+409 Conflict.
+"""
+
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+async def run_optimistic(db: AsyncSession, operation: Callable[[], Awaitable[T]]) -> T:
+    """Run *operation* (which commits on *db*), starting over on a version conflict.
+
+    The session is rolled back between attempts, which expires every loaded
+    instance, so the next attempt re-reads current rows and re-validates.
+    After ``OPTIMISTIC_RETRY_ATTEMPTS`` conflicts the ``StaleDataError``
+    propagates.
+    """
+    attempts = max(1, settings.OPTIMISTIC_RETRY_ATTEMPTS)
+    for attempt in range(1, attempts + 1):
+        try:
+            return await operation()
+        except StaleDataError:
+            await db.rollback()
+            if attempt == attempts:
+                raise
+            # Jitter so that writers racing for the same row do not collide again in lock-step.
+            await asyncio.sleep(random.uniform(0, 0.005 * attempt))
+    raise AssertionError("unreachable")
+
+
+def ensure_version(instance: object, expected: int) -> None:
+    """Reject an edit made against an out-of-date copy of *instance*.
+
+    Raises:
+        StaleDataError: If *expected* differs from the stored version.
+    """
+    if expected != instance.version:
+        raise StaleDataError(
+            f"{type(instance).__name__} was modified by someone else "
+            f"(expected version {expected}, current {instance.version})"
+        )
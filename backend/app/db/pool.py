@@ -0,0 +1,68 @@
+"""Connection-pool sizing and instrumentation."""
+
+import time
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import Settings
+from app.core.metrics import Histogram
+
+
+def compute_pool_limits(settings: Settings) -> tuple[int, int]:
+    """Return ``(pool_size, max_overflow)`` for one worker process.
+
+    With ``DB_POOL_AUTO_SIZE`` the connections Postgres will accept
+    (``DB_MAX_CONNECTIONS`` minus ``DB_RESERVED_CONNECTIONS`` for admin
+    sessions, migrations and replicas) are split evenly across
+    ``WEB_CONCURRENCY`` workers.  Two thirds of each share are kept open;
+    the rest is burst overflow.  Otherwise the explicit ``DB_POOL_SIZE`` /
+    ``DB_MAX_OVERFLOW`` values are used as-is.
+    """
+    if not settings.DB_POOL_AUTO_SIZE:
+        return settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+
+    available = settings.DB_MAX_CONNECTIONS - settings.DB_RESERVED_CONNECTIONS
+    per_worker = max(1, available // max(1, settings.WEB_CONCURRENCY))
+    pool_size = max(1, per_worker * 2 // 3)
+    return pool_size, per_worker - pool_size
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that records checkout wait time and waiters."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_histogram = Histogram()
+        self.waiters = 0
+        self.timeouts = 0
+
+    def _do_get(self):
+        # A checkout can only block when no idle connection is left and the
+        # overflow allowance is exhausted.
+        saturated = self.checkedin() == 0 and self._max_overflow > -1 and self.overflow() >= self._max_overflow
+        started = time.perf_counter()
+        if saturated:
+            self.waiters += 1
+        try:
+            return super()._do_get()
+        except Exception:
+            if saturated:
+                self.timeouts += 1
+            raise
+        finally:
+            if saturated:
+                self.waiters -= 1
+            self.wait_histogram.observe(time.perf_counter() - started)
+
+    def stats(self) -> dict:
+        """Return a snapshot of pool occupancy and checkout latency."""
+        return {
+            "size": self.size(),
+            "maxOverflow": self._max_overflow,
+            "checkedIn": self.checkedin(),
+            "checkedOut": self.checkedout(),
+            "overflow": self.overflow(),
+            "waiters": self.waiters,
+            "timeouts": self.timeouts,
+            "checkoutWaitSeconds": self.wait_histogram.snapshot(),
+        }
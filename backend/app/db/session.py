@@ -1,18 +1,43 @@
-"""Async SQLAlchemy engine and session factory."""
+"""Async SQLAlchemy engines and session factories.
+
+Writes go to ``DATABASE_URL``.  When ``READ_DATABASE_URL`` points at a
+streaming replica, read-only endpoints (declared with :func:`get_read_db`)
+are served from it instead, so reporting and tracking traffic does not
+compete with dispatch transactions for primary connections and row locks.
+Without it both dependencies share the primary engine.
+"""
 
 from collections.abc import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import settings
+from app.core.metrics import render_metric
+from app.core.observability import instrument_engine
+from app.db.pool import InstrumentedQueuePool, compute_pool_limits
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-)
+_pool_size, _max_overflow = compute_pool_limits(settings)
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        echo=settings.DEBUG if settings.DB_ECHO is None else settings.DB_ECHO,
+        poolclass=InstrumentedQueuePool,
+        pool_size=_pool_size,
+        max_overflow=_max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+
+engine = _create_engine(settings.DATABASE_URL)
+read_engine = _create_engine(settings.READ_DATABASE_URL) if settings.READ_DATABASE_URL else engine
+if settings.METRICS_ENABLED:
+    instrument_engine(engine)
+    if read_engine is not engine:
+        instrument_engine(read_engine)
 
 async_session_factory = async_sessionmaker(
     bind=engine,
@@ -20,6 +45,12 @@ async_session_factory = async_sessionmaker(
     expire_on_commit=False,
 )
 
+read_session_factory = (
+    async_sessionmaker(bind=read_engine, class_=AsyncSession, expire_on_commit=False)
+    if read_engine is not engine
+    else async_session_factory
+)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Yield an async database session; auto-close on exit."""
@@ -28,3 +59,61 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             yield session
         finally:
             await session.close()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Yield a session for read-only endpoints, bound to the replica if one is configured.
+
+    Replicas apply changes asynchronously, so a read may briefly trail a
+    write made through :func:`get_db`.  Anything that must observe its own
+    writes, or that locks rows, belongs on the primary.
+    """
+    async with read_session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+def get_read_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Return the read session factory, for responses that stream after the request's dependencies have exited.
+
+    FastAPI closes ``yield`` dependencies before a ``StreamingResponse`` body
+    runs, so a streaming generator opens (and closes) its own session.
+    """
+    return read_session_factory
+
+
+def pool_stats() -> dict:
+    """Return occupancy and checkout-latency statistics for each engine's pool."""
+    stats = {"primary": engine.pool.stats()}
+    if read_engine is not engine:
+        stats["replica"] = read_engine.pool.stats()
+    return stats
+
+
+def pool_metrics() -> str:
+    """Render :func:`pool_stats` in the Prometheus text format, labelled by engine."""
+    pools = [("primary", engine.pool)]
+    if read_engine is not engine:
+        pools.append(("replica", read_engine.pool))
+    gauges = [
+        ("db_pool_size", "gauge", "Connections kept open.", lambda pool: pool.size()),
+        ("db_pool_checked_out", "gauge", "Connections in use.", lambda pool: pool.checkedout()),
+        ("db_pool_overflow", "gauge", "Connections open beyond the pool size.", lambda pool: pool.overflow()),
+        ("db_pool_waiters", "gauge", "Checkouts waiting for a connection.", lambda pool: pool.waiters),
+        ("db_pool_timeouts_total", "counter", "Checkouts that timed out.", lambda pool: pool.timeouts),
+    ]
+    families = [
+        render_metric(name, kind, help_text, (({"engine": label}, value(pool)) for label, pool in pools))
+        for name, kind, help_text, value in gauges
+    ]
+    families.append(
+        render_metric(
+            "db_pool_checkout_wait_seconds",
+            "histogram",
+            "Time to check out a connection.",
+            (({"engine": label}, pool.wait_histogram) for label, pool in pools),
+        )
+    )
+    return "".join(families)
@@ -1,16 +1,28 @@
 """FleetFlow — application entry point."""
 
+import asyncio
+import contextlib
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from slowapi import Limiter, _rate_limit_exceeded_handler
+from fastapi.responses import JSONResponse, PlainTextResponse
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
+from sqlalchemy.orm.exc import StaleDataError
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 
 from app.api.v1.routers import analytics, auth, drivers, expenses, maintenance, tracking, trips, vehicles
 from app.core.config import settings
+from app.core.observability import RequestMetricsMiddleware, request_metrics
+from app.core.rate_limit import limiter
+from app.core.responses import json_response_class
+from app.core.security import password_pool
+from app.db.session import engine, pool_metrics, pool_stats
+from app.services import token_revocation, trip_events
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
 logging.basicConfig(
     level=logging.DEBUG if settings.DEBUG else logging.INFO,
@@ -19,13 +31,28 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-# --- Rate limiter ---
-limiter = Limiter(key_func=get_remote_address, default_limits=["60/minute"])
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Start-up / shut-down hooks for process-wide resources."""
+    tasks = [asyncio.create_task(token_revocation.run_sync_loop(settings.TOKEN_REVOCATION_SYNC_SECONDS))]
+    if engine.dialect.name == "postgresql":
+        tasks.append(asyncio.create_task(trip_events.run_listener(engine, settings.TRACKING_STREAM_HEARTBEAT_SECONDS)))
+    yield
+    trip_events.broker.close_all()
+    for task in tasks:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    password_pool.shutdown()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
     version="1.0.0",
     description="Modular Fleet & Logistics Management System API",
+    lifespan=lifespan,
+    default_response_class=json_response_class(),
 )
 
 app.state.limiter = limiter
@@ -38,8 +65,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# --- Client address from the load balancer's X-Forwarded-For ---
+app.add_middleware(ProxyHeadersMiddleware, trusted_hosts=settings.FORWARDED_ALLOW_IPS)
+
+# --- Request metrics (outermost, so the timing includes every other middleware) ---
+if settings.METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
+
 
 # --- Global exception handlers ---
 @app.exception_handler(ValueError)
@@ -48,6 +83,13 @@ async def value_error_handler(_request: Request, exc: ValueError) -> JSONRespons
     return JSONResponse(status_code=400, content={"detail": str(exc)})
 
 
+@app.exception_handler(StaleDataError)
+async def stale_data_handler(_request: Request, exc: StaleDataError) -> JSONResponse:
+    """A versioned row changed underneath the request — the client should reload and retry."""
+    logger.info("Version conflict: %s", exc)
+    return JSONResponse(status_code=409, content={"detail": "Resource was modified concurrently; reload and retry"})
+
+
 @app.exception_handler(Exception)
 async def generic_exception_handler(_request: Request, exc: Exception) -> JSONResponse:
     """Catch-all for unexpected errors — log and return 500."""
@@ -70,3 +112,24 @@ app.include_router(tracking.router, prefix="/api/v1/tracking")
 async def health_check():
     """Liveness probe."""
     return {"status": "ok"}
+
+
+@app.get("/health/db-pool", tags=["system"])
+async def db_pool_stats():
+    """Connection-pool occupancy, waiters and checkout wait-time histogram."""
+    return pool_stats()
+
+
+@app.get("/health/password-pool", tags=["system"])
+async def password_pool_stats():
+    """Queue depth and timing counters for the bcrypt worker pool."""
+    return password_pool.stats()
+
+
+@app.get("/metrics", tags=["system"], response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Per-route latency, SQL statement and DB-time histograms plus pool counters, for Prometheus."""
+    return PlainTextResponse(
+        request_metrics.render() + pool_metrics() + password_pool.metrics(),
+        media_type="text/plain; version=0.0.4",
+    )
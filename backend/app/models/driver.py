@@ -7,7 +7,7 @@ from datetime import date
 from sqlalchemy import Date, Enum, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.db.base_class import Base
+from app.db.base_class import Base, Versioned
 
 
 class DriverStatus(str, enum.Enum):
@@ -19,7 +19,7 @@ class DriverStatus(str, enum.Enum):
     ON_TRIP = "On Trip"
 
 
-class Driver(Base):
+class Driver(Versioned, Base):
     __tablename__ = "drivers"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -31,4 +31,4 @@ class Driver(Base):
         Enum(DriverStatus), nullable=False, default=DriverStatus.OFF_DUTY, index=True
     )
 
-    trips: Mapped[list["Trip"]] = relationship(back_populates="driver", lazy="selectin")  # noqa: F821
+    trips: Mapped[list["Trip"]] = relationship(back_populates="driver", lazy="raise")  # noqa: F821
@@ -3,7 +3,7 @@
 import uuid
 from datetime import date
 
-from sqlalchemy import Date, ForeignKey, Numeric, String
+from sqlalchemy import Date, ForeignKey, Index, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base_class import Base
@@ -11,6 +11,10 @@ from app.db.base_class import Base
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (
+        # Covers time-bucketed fuel analytics over a date range (index-only on PostgreSQL).
+        Index("ix_expenses_date", "date", postgresql_include=["vehicle_id", "fuel_liters", "fuel_cost"]),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     vehicle_id: Mapped[str] = mapped_column(ForeignKey("vehicles.id", ondelete="RESTRICT"), nullable=False, index=True)
@@ -19,5 +23,5 @@ class Expense(Base):
     fuel_cost: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
     date: Mapped[date] = mapped_column(Date, nullable=False)
 
-    vehicle: Mapped["Vehicle"] = relationship(back_populates="expenses", lazy="selectin")  # noqa: F821
-    trip: Mapped["Trip"] = relationship(back_populates="expenses", lazy="selectin")  # noqa: F821
+    vehicle: Mapped["Vehicle"] = relationship(back_populates="expenses", lazy="raise")  # noqa: F821
+    trip: Mapped["Trip"] = relationship(back_populates="expenses", lazy="raise")  # noqa: F821
@@ -4,10 +4,10 @@ import enum
 import uuid
 from datetime import date
 
-from sqlalchemy import Date, Enum, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import Date, Enum, ForeignKey, Index, Integer, Numeric, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.db.base_class import Base
+from app.db.base_class import Base, Versioned
 
 
 class MaintenanceType(str, enum.Enum):
@@ -20,8 +20,12 @@ class MaintenanceStatus(str, enum.Enum):
     COMPLETED = "Completed"
 
 
-class MaintenanceLog(Base):
+class MaintenanceLog(Versioned, Base):
     __tablename__ = "maintenance_logs"
+    __table_args__ = (
+        # Covers time-bucketed maintenance analytics over a date range (index-only on PostgreSQL).
+        Index("ix_maintenance_logs_date", "date", postgresql_include=["vehicle_id", "cost"]),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     vehicle_id: Mapped[str] = mapped_column(ForeignKey("vehicles.id", ondelete="RESTRICT"), nullable=False, index=True)
@@ -31,7 +35,7 @@ class MaintenanceLog(Base):
     date: Mapped[date] = mapped_column(Date, nullable=False)
     odometer_km: Mapped[int] = mapped_column(Integer, nullable=True)
     status: Mapped[MaintenanceStatus] = mapped_column(
-        Enum(MaintenanceStatus), nullable=False, default=MaintenanceStatus.OPEN
+        Enum(MaintenanceStatus), nullable=False, default=MaintenanceStatus.OPEN, index=True
     )
 
-    vehicle: Mapped["Vehicle"] = relationship(back_populates="maintenance_logs", lazy="selectin")  # noqa: F821
+    vehicle: Mapped["Vehicle"] = relationship(back_populates="maintenance_logs", lazy="raise")  # noqa: F821
@@ -0,0 +1,54 @@
+"""Analytics rollup ORM models.
+
+Rollups hold running totals maintained in the same transaction as the
+writes they summarise (see ``RollupService``), so analytics endpoints read
+pre-aggregated rows instead of rescanning trips, expenses and maintenance
+logs: rankings and the ROI report read ``vehicle_rollups``, time series
+read ``daily_rollups``.
+"""
+
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Index, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base
+
+
+class VehicleRollup(Base):
+    """All-time totals per vehicle."""
+
+    __tablename__ = "vehicle_rollups"
+
+    vehicle_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("vehicles.id", ondelete="CASCADE"), primary_key=True
+    )
+    trip_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    revenue: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    distance_km: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    fuel_liters: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    fuel_cost: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    maintenance_cost: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+
+
+class DailyRollup(Base):
+    """One vehicle's totals for one calendar day (UTC), keyed by ``(vehicle_id, day)``.
+
+    The analytics time series sums these rows into day, week or month
+    buckets, for one vehicle or the whole fleet.  Keying by vehicle keeps
+    concurrent writes for different vehicles off each other's rows.
+    """
+
+    __tablename__ = "daily_rollups"
+    __table_args__ = (Index("ix_daily_rollups_day", "day"),)
+
+    vehicle_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("vehicles.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    trip_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    revenue: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    distance_km: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    fuel_liters: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    fuel_cost: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    maintenance_cost: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
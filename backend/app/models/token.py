@@ -0,0 +1,21 @@
+"""Token revocation ORM model."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base
+
+
+class TokenRevocation(Base):
+    """A revoked token (``jti`` set) or all of a user's tokens issued before ``revoked_at`` (``jti`` null)."""
+
+    __tablename__ = "token_revocations"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    jti: Mapped[str | None] = mapped_column(String(36), nullable=True, unique=True)
+    user_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
+    revoked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
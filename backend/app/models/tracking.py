@@ -0,0 +1,35 @@
+"""Customer tracking read model.
+
+``tracking_views`` holds one denormalised row per trip with everything the
+public tracking endpoints return, so a lookup is a primary-key read instead
+of a join across trips, vehicles and drivers.  Rows are written by
+``TrackingService`` in the same transaction as the trip change they mirror.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base
+from app.models.trip import TripStatus
+
+
+class TrackingView(Base):
+    __tablename__ = "tracking_views"
+    __table_args__ = (Index("ix_tracking_views_customer_start", "customer_id", "start_time"),)
+
+    tracking_id: Mapped[str] = mapped_column(String(20), primary_key=True)
+    trip_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("trips.id", ondelete="CASCADE"), unique=True, nullable=False
+    )
+    customer_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    status: Mapped[TripStatus] = mapped_column(Enum(TripStatus), nullable=False)
+    origin: Mapped[str] = mapped_column(String(255), nullable=False)
+    destination: Mapped[str] = mapped_column(String(255), nullable=False)
+    vehicle_plate: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    driver_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    cargo_weight: Mapped[int] = mapped_column(Integer, nullable=False)
+    distance_km: Mapped[float | None] = mapped_column(Numeric(10, 2), nullable=True)
+    start_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    end_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
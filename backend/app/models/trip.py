@@ -4,10 +4,10 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import CheckConstraint, DateTime, Enum, ForeignKey, Integer, Numeric, String
+from sqlalchemy import CheckConstraint, DateTime, Enum, ForeignKey, Index, Integer, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.db.base_class import Base
+from app.db.base_class import Base, Versioned
 
 
 class TripStatus(str, enum.Enum):
@@ -22,10 +22,12 @@ class TripStatus(str, enum.Enum):
     CANCELLED = "Cancelled"
 
 
-class Trip(Base):
+class Trip(Versioned, Base):
     __tablename__ = "trips"
     __table_args__ = (
         CheckConstraint("cargo_weight > 0", name="ck_trips_positive_cargo"),
+        # Time-bucketed analytics scan a start_time range reading only these columns (index-only on PostgreSQL).
+        Index("ix_trips_start_time", "start_time", postgresql_include=["vehicle_id", "revenue", "distance_km"]),
     )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -53,7 +55,7 @@ class Trip(Base):
     start_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     end_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
-    vehicle: Mapped["Vehicle"] = relationship(back_populates="trips", lazy="selectin")  # noqa: F821
-    driver: Mapped["Driver"] = relationship(back_populates="trips", lazy="selectin")  # noqa: F821
-    customer: Mapped["User"] = relationship(lazy="selectin")  # noqa: F821
-    expenses: Mapped[list["Expense"]] = relationship(back_populates="trip", lazy="selectin")  # noqa: F821
+    vehicle: Mapped["Vehicle"] = relationship(back_populates="trips", lazy="raise")  # noqa: F821
+    driver: Mapped["Driver"] = relationship(back_populates="trips", lazy="raise")  # noqa: F821
+    customer: Mapped["User"] = relationship(lazy="raise")  # noqa: F821
+    expenses: Mapped[list["Expense"]] = relationship(back_populates="trip", lazy="raise")  # noqa: F821
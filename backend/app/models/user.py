@@ -25,7 +25,7 @@ class Role(Base):
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name: Mapped[str] = mapped_column(Enum(RoleEnum), unique=True, nullable=False)
 
-    users: Mapped[list["User"]] = relationship(back_populates="role_rel", lazy="selectin")
+    users: Mapped[list["User"]] = relationship(back_populates="role_rel", lazy="raise")
 
 
 class User(Base):
@@ -36,4 +36,4 @@ class User(Base):
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     role_id: Mapped[str] = mapped_column(ForeignKey("roles.id"), nullable=False)
 
-    role_rel: Mapped[Role] = relationship(back_populates="users", lazy="selectin")
+    role_rel: Mapped[Role] = relationship(back_populates="users", lazy="raise")
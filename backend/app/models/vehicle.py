@@ -3,10 +3,10 @@
 import enum
 import uuid
 
-from sqlalchemy import CheckConstraint, Enum, Integer, Numeric, String
+from sqlalchemy import CheckConstraint, Enum, Index, Integer, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.db.base_class import Base
+from app.db.base_class import Base, Versioned
 
 
 class VehicleStatus(str, enum.Enum):
@@ -18,11 +18,13 @@ class VehicleStatus(str, enum.Enum):
     RETIRED = "Retired"
 
 
-class Vehicle(Base):
+class Vehicle(Versioned, Base):
     __tablename__ = "vehicles"
     __table_args__ = (
         CheckConstraint("max_capacity_kg > 0", name="ck_vehicles_positive_capacity"),
         CheckConstraint("odometer_km >= 0", name="ck_vehicles_non_negative_odometer"),
+        # Assignment reads available vehicles in capacity order straight off this index.
+        Index("ix_vehicles_status_capacity", "status", "max_capacity_kg", "id"),
     )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -36,8 +38,8 @@ class Vehicle(Base):
         Enum(VehicleStatus), nullable=False, default=VehicleStatus.AVAILABLE, index=True
     )
 
-    trips: Mapped[list["Trip"]] = relationship(back_populates="vehicle", lazy="selectin")  # noqa: F821
+    trips: Mapped[list["Trip"]] = relationship(back_populates="vehicle", lazy="raise")  # noqa: F821
     maintenance_logs: Mapped[list["MaintenanceLog"]] = relationship(  # noqa: F821
-        back_populates="vehicle", lazy="selectin"
+        back_populates="vehicle", lazy="raise"
     )
-    expenses: Mapped[list["Expense"]] = relationship(back_populates="vehicle", lazy="selectin")  # noqa: F821
+    expenses: Mapped[list["Expense"]] = relationship(back_populates="vehicle", lazy="raise")  # noqa: F821
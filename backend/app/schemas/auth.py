@@ -10,9 +10,20 @@ class LoginRequest(BaseModel):
 
 class LoginResponse(BaseModel):
     access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int  # access-token lifetime in seconds
     role: str
 
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    refresh_token: str | None = None
+
+
 class TokenPayload(BaseModel):
     sub: str
     role: str
@@ -19,6 +19,11 @@ class DriverUpdate(BaseModel):
     license_expiry: date | None = None
     safety_score: float | None = Field(default=None, ge=0, le=100)
     status: DriverStatus | None = None
+    version: int = Field(
+        ...,
+        ge=1,
+        description="The version the edit was made against; 409 unless it is still the stored version.",
+    )
 
 
 class DriverResponse(BaseModel):
@@ -28,5 +33,6 @@ class DriverResponse(BaseModel):
     license_expiry: date
     safety_score: float | None
     status: DriverStatus
+    version: int
 
     model_config = {"from_attributes": True}
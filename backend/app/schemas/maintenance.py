@@ -28,5 +28,6 @@ class MaintenanceLogUpdate(BaseModel):
 class MaintenanceLogResponse(MaintenanceLogBase):
     id: str
     status: MaintenanceStatus
+    version: int
 
     model_config = ConfigDict(from_attributes=True)
@@ -4,12 +4,13 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+from app.core.config import settings
 from app.models.trip import TripStatus
 
 
-class TripCreate(BaseModel):
-    vehicle_id: str
-    driver_id: str
+class PendingTrip(BaseModel):
+    """A trip awaiting vehicle and driver assignment."""
+
     origin: str = Field(..., min_length=1, max_length=255)
     destination: str = Field(..., min_length=1, max_length=255)
     cargo_weight: int = Field(..., gt=0)
@@ -18,6 +19,11 @@ class TripCreate(BaseModel):
     customer_id: str | None = None
 
 
+class TripCreate(PendingTrip):
+    vehicle_id: str
+    driver_id: str
+
+
 class TripStatusUpdate(BaseModel):
     status: TripStatus
     odometer_km: int | None = Field(default=None, ge=0, description="Final odometer on completion")
@@ -37,5 +43,30 @@ class TripResponse(BaseModel):
     status: TripStatus
     start_time: datetime | None
     end_time: datetime | None
+    version: int
 
     model_config = {"from_attributes": True}
+
+
+class BulkTripCreate(BaseModel):
+    trips: list[TripCreate] = Field(..., min_length=1, max_length=settings.BULK_DISPATCH_MAX_TRIPS)
+
+
+class BulkTripResult(BaseModel):
+    index: int
+    trip: TripResponse | None = None
+    error: str | None = None
+
+
+class TripAssignRequest(BaseModel):
+    trips: list[PendingTrip] = Field(..., min_length=1, max_length=settings.BULK_DISPATCH_MAX_TRIPS)
+    dispatch: bool = Field(default=False, description="Dispatch the assigned trips instead of only proposing a plan")
+
+
+class TripAssignment(BaseModel):
+    index: int
+    vehicle_id: str | None = None
+    driver_id: str | None = None
+    unused_capacity_kg: int | None = None
+    trip: TripResponse | None = None
+    error: str | None = None
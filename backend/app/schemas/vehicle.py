@@ -19,6 +19,11 @@ class VehicleUpdate(BaseModel):
     model: str | None = Field(default=None, min_length=1, max_length=255)
     odometer_km: int | None = Field(default=None, ge=0)
     status: VehicleStatus | None = None
+    version: int = Field(
+        ...,
+        ge=1,
+        description="The version the edit was made against; 409 unless it is still the stored version.",
+    )
 
 
 class VehicleResponse(BaseModel):
@@ -30,5 +35,6 @@ class VehicleResponse(BaseModel):
     odometer_km: int
     acquisition_cost: float
     status: VehicleStatus
+    version: int
 
     model_config = {"from_attributes": True}
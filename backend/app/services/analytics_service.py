@@ -0,0 +1,207 @@
+"""Time-bucketed fleet analytics.
+
+Series are summed from ``daily_rollups``, which already hold each
+vehicle's trips (by ``start_time``), fuel and maintenance per UTC day, so a
+chart costs one statement over at most vehicles × days in range rows,
+however much raw history lies behind them.
+
+Vehicle rankings read the all-time totals in ``vehicle_rollups`` instead,
+one row per vehicle, and sort and limit in the same statement.
+"""
+
+import enum
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from sqlalchemy import ColumnElement, Date, DateTime, Integer, Row, String, cast, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.rollup import DailyRollup, VehicleRollup
+from app.models.vehicle import Vehicle, VehicleStatus
+
+
+class VehicleSort(str, enum.Enum):
+    ROI = "roi"
+    NET_PROFIT = "net_profit"
+    REVENUE = "revenue"
+    TOTAL_COST = "total_cost"
+    COST_PER_KM = "cost_per_km"
+    FUEL_EFFICIENCY = "fuel_efficiency"
+
+
+class Bucket(str, enum.Enum):
+    DAY = "day"
+    WEEK = "week"  # ISO weeks, starting Monday
+    MONTH = "month"
+
+    def start_of(self, day: date) -> date:
+        if self is Bucket.WEEK:
+            return day - timedelta(days=day.weekday())
+        if self is Bucket.MONTH:
+            return day.replace(day=1)
+        return day
+
+    def after(self, start: date) -> date:
+        """Return the first day of the bucket following the one starting at *start*."""
+        if self is Bucket.WEEK:
+            return start + timedelta(days=7)
+        if self is Bucket.MONTH:
+            return (start + timedelta(days=32)).replace(day=1)
+        return start + timedelta(days=1)
+
+    def count(self, first: date, last: date) -> int:
+        """Return how many buckets the inclusive range *first*..*last* touches."""
+        if self is Bucket.MONTH:
+            return (last.year - first.year) * 12 + last.month - first.month + 1
+        step = 7 if self is Bucket.WEEK else 1
+        return (self.start_of(last) - self.start_of(first)).days // step + 1
+
+
+@dataclass(slots=True)
+class SeriesPoint:
+    """Totals for one bucket (and vehicle, for per-vehicle series)."""
+
+    bucket_start: date
+    vehicle_id: str | None = None
+    trip_count: int = 0
+    active_days: int = 0
+    revenue: float = 0.0
+    distance_km: float = 0.0
+    fuel_liters: float = 0.0
+    fuel_cost: float = 0.0
+    maintenance_cost: float = 0.0
+
+
+def bucket_start(column: ColumnElement[date], bucket: Bucket, dialect: str) -> ColumnElement[date]:
+    """Return an expression for the first day of the *bucket* containing the date *column*."""
+    if dialect == "postgresql":
+        # As a plain timestamp, so the session time zone plays no part.
+        return cast(func.date_trunc(literal_column(f"'{bucket.value}'"), cast(column, DateTime)), Date)
+    # SQLite stores dates as ISO strings.
+    if bucket is Bucket.MONTH:
+        return func.date(column, literal_column("'start of month'"), type_=Date)
+    if bucket is Bucket.WEEK:
+        back = literal_column("'-'") + cast((cast(func.strftime("%w", column), Integer) + 6) % 7, String)
+        return func.date(column, back + literal_column("' days'"), type_=Date)
+    return func.date(column, type_=Date)
+
+
+_AMOUNTS = ("revenue", "distance_km", "fuel_liters", "fuel_cost", "maintenance_cost")
+
+
+class AnalyticsService:
+    """Aggregations behind the analytics endpoints."""
+
+    @staticmethod
+    async def time_series(
+        db: AsyncSession,
+        bucket: Bucket,
+        date_from: date,
+        date_to: date,
+        *,
+        vehicle_id: str | None = None,
+        per_vehicle: bool = False,
+    ) -> tuple[list[SeriesPoint], int]:
+        """Return per-bucket totals between two inclusive UTC days, and the fleet size.
+
+        Points are ordered by bucket (then vehicle).  Unless *per_vehicle* is
+        set, every bucket in the range is present, with zeros where nothing
+        happened.  The fleet size is the current number of non-retired
+        vehicles (0 when the range has no activity), the denominator for
+        fleet-wide utilization.
+        """
+        day_bucket = bucket_start(DailyRollup.day, bucket, db.get_bind().dialect.name).label("bucket")
+        keys = [day_bucket, DailyRollup.vehicle_id] if per_vehicle else [day_bucket]
+        active_fleet = (
+            select(func.count()).select_from(Vehicle).where(Vehicle.status != VehicleStatus.RETIRED).scalar_subquery()
+        )
+        stmt = (
+            select(
+                *keys,
+                func.sum(DailyRollup.trip_count).label("trip_count"),
+                # Vehicle-days with at least one trip started.
+                func.count().filter(DailyRollup.trip_count > 0).label("active_days"),
+                *(func.sum(getattr(DailyRollup, name)).label(name) for name in _AMOUNTS),
+                active_fleet.label("fleet_size"),
+            )
+            .where(DailyRollup.day >= date_from, DailyRollup.day <= date_to)
+            .group_by(*keys)
+            .order_by(*keys)
+        )
+        if vehicle_id is not None:
+            stmt = stmt.where(DailyRollup.vehicle_id == vehicle_id)
+        rows = (await db.execute(stmt)).all()
+
+        points = [
+            SeriesPoint(
+                bucket_start=row.bucket,
+                vehicle_id=row.vehicle_id if per_vehicle else vehicle_id,
+                trip_count=int(row.trip_count),
+                active_days=int(row.active_days),
+                revenue=float(row.revenue),
+                distance_km=float(row.distance_km),
+                fuel_liters=float(row.fuel_liters),
+                fuel_cost=float(row.fuel_cost),
+                maintenance_cost=float(row.maintenance_cost),
+            )
+            for row in rows
+        ]
+        # Without any activity utilization is zero whatever the fleet size.
+        fleet_size = rows[0].fleet_size if rows else 0
+        if not per_vehicle:
+            by_start = {point.bucket_start: point for point in points}
+            points = []
+            start = bucket.start_of(date_from)
+            while start <= date_to:
+                points.append(by_start.get(start) or SeriesPoint(bucket_start=start, vehicle_id=vehicle_id))
+                start = bucket.after(start)
+        return points, int(fleet_size)
+
+    @staticmethod
+    async def vehicle_ranking(
+        db: AsyncSession,
+        sort: VehicleSort,
+        *,
+        descending: bool = False,
+        limit: int,
+        include_retired: bool = False,
+    ) -> list[Row]:
+        """Return the top *limit* vehicles by *sort*, with their all-time financials.
+
+        One statement: ``vehicles`` left-joined to the per-vehicle totals in
+        ``vehicle_rollups``, every ratio computed in SQL so sorting and the
+        limit happen in the database.  Ratios with a zero denominator are
+        ``NULL`` and sort last in either direction.
+        """
+        revenue = func.coalesce(VehicleRollup.revenue, 0)
+        fuel_cost = func.coalesce(VehicleRollup.fuel_cost, 0)
+        maintenance_cost = func.coalesce(VehicleRollup.maintenance_cost, 0)
+        distance = func.coalesce(VehicleRollup.distance_km, 0)
+        liters = func.coalesce(VehicleRollup.fuel_liters, 0)
+        total_cost = fuel_cost + maintenance_cost
+        net_profit = revenue - total_cost
+        metrics = {
+            VehicleSort.ROI: (net_profit * 100 / func.nullif(Vehicle.acquisition_cost, 0)).label("roi"),
+            VehicleSort.NET_PROFIT: net_profit.label("net_profit"),
+            VehicleSort.REVENUE: revenue.label("revenue"),
+            VehicleSort.TOTAL_COST: total_cost.label("total_cost"),
+            VehicleSort.COST_PER_KM: (total_cost / func.nullif(distance, 0)).label("cost_per_km"),
+            VehicleSort.FUEL_EFFICIENCY: (distance / func.nullif(liters, 0)).label("fuel_efficiency"),
+        }
+
+        stmt = select(
+            Vehicle.id,
+            Vehicle.name,
+            Vehicle.license_plate,
+            Vehicle.status,
+            func.coalesce(VehicleRollup.trip_count, 0).label("trip_count"),
+            distance.label("distance_km"),
+            fuel_cost.label("fuel_cost"),
+            maintenance_cost.label("maintenance_cost"),
+            *metrics.values(),
+        ).outerjoin(VehicleRollup, VehicleRollup.vehicle_id == Vehicle.id)
+        if not include_retired:
+            stmt = stmt.where(Vehicle.status != VehicleStatus.RETIRED)
+        order = metrics[sort].desc() if descending else metrics[sort].asc()
+        stmt = stmt.order_by(order.nulls_last(), Vehicle.id).limit(limit)
+        return list((await db.execute(stmt)).all())
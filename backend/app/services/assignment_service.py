@@ -0,0 +1,132 @@
+"""Automatic vehicle and driver assignment for pending trips."""
+
+from bisect import bisect_left
+from collections.abc import Sequence
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.driver import Driver, DriverStatus
+from app.models.vehicle import Vehicle, VehicleStatus
+from app.schemas.trip import PendingTrip, TripCreate
+from app.services.trip_service import TripService
+
+NO_VEHICLE = "No available vehicle with enough capacity"
+NO_DRIVER = "No on-duty driver available"
+
+
+def best_fit(
+    cargo_weights: Sequence[int], vehicles: Sequence[tuple[str, int]], drivers: Sequence[str]
+) -> list[tuple[str, str] | str]:
+    """Match trips to vehicles and drivers.
+
+    Any vehicle whose capacity covers a trip's cargo can carry it, so the
+    vehicles usable by a heavier trip are a subset of those usable by a
+    lighter one.  With that nesting, taking trips heaviest first and giving
+    each the smallest vehicle that fits is optimal: it assigns as many trips
+    as any matching can and, among such matchings, leaves the least capacity
+    unused.  A general min-cost-flow solver would reach the same answer far
+    more slowly.
+
+    The next free vehicle at or above a capacity is found with a bisect and
+    a path-compressed "next unused slot" table, so the whole pass is
+    O((trips + vehicles) log vehicles).  When drivers are scarcer than
+    vehicles, the heaviest trips are served first because they have the
+    fewest vehicle options.  Drivers are handed out in the given order.
+
+    Args:
+        cargo_weights: Cargo per trip, in request order.
+        vehicles: ``(id, capacity_kg)`` for each candidate vehicle, sorted by capacity.
+        drivers: Candidate driver ids in preference order.
+
+    Returns:
+        Per trip, in request order, ``(vehicle_id, driver_id)`` or the reason it stayed unassigned.
+    """
+    capacities = [capacity for _, capacity in vehicles]
+    next_free = list(range(len(vehicles) + 1))  # last slot is the "none left" sentinel
+
+    def _find(slot: int) -> int:
+        while next_free[slot] != slot:
+            next_free[slot] = next_free[next_free[slot]]
+            slot = next_free[slot]
+        return slot
+
+    results: list[tuple[str, str] | str] = [NO_VEHICLE] * len(cargo_weights)
+    remaining_drivers = iter(drivers)
+    for index in sorted(range(len(cargo_weights)), key=lambda i: (-cargo_weights[i], i)):
+        slot = _find(bisect_left(capacities, cargo_weights[index]))
+        if slot == len(vehicles):
+            continue
+        driver_id = next(remaining_drivers, None)
+        if driver_id is None:
+            results[index] = NO_DRIVER
+            continue
+        next_free[slot] = slot + 1
+        results[index] = (vehicles[slot][0], driver_id)
+    return results
+
+
+class AssignmentService:
+    """Plans (and optionally dispatches) assignments for batches of pending trips."""
+
+    @staticmethod
+    async def assign_trips(db: AsyncSession, trips_in: list[PendingTrip], *, dispatch: bool = False) -> list[dict]:
+        """Assign vehicles and drivers to *trips_in* and, if *dispatch*, dispatch them.
+
+        Candidates are read once: available vehicles in capacity order and
+        on-duty drivers with a valid licence, safest first.  Planning takes
+        no locks.  Dispatching goes through :meth:`TripService.dispatch_trips`,
+        which locks and re-validates every pair, so a vehicle or driver taken
+        concurrently is reported as that item's error.
+
+        Returns:
+            One dict per input, in order, with ``vehicle_id``, ``driver_id``,
+            ``unused_capacity_kg``, ``trip`` (when dispatched) and ``error``.
+        """
+        vehicle_rows = await db.execute(
+            select(Vehicle.id, Vehicle.max_capacity_kg)
+            .where(Vehicle.status == VehicleStatus.AVAILABLE)
+            .order_by(Vehicle.max_capacity_kg, Vehicle.id)
+        )
+        vehicles = [(row.id, row.max_capacity_kg) for row in vehicle_rows]
+        driver_ids = (
+            await db.execute(
+                select(Driver.id)
+                .where(
+                    Driver.status == DriverStatus.ON_DUTY,
+                    Driver.license_expiry >= datetime.now(timezone.utc).date(),
+                )
+                .order_by(Driver.safety_score.desc(), Driver.id)
+            )
+        ).scalars().all()
+
+        capacity = dict(vehicles)
+        plan = best_fit([t.cargo_weight for t in trips_in], vehicles, driver_ids)
+        results: list[dict] = []
+        for trip_in, match in zip(trips_in, plan):
+            if isinstance(match, str):
+                results.append({"error": match})
+                continue
+            vehicle_id, driver_id = match
+            results.append(
+                {
+                    "vehicle_id": vehicle_id,
+                    "driver_id": driver_id,
+                    "unused_capacity_kg": capacity[vehicle_id] - trip_in.cargo_weight,
+                }
+            )
+
+        if not dispatch:
+            return results
+
+        assigned = [i for i, result in enumerate(results) if "vehicle_id" in result]
+        if not assigned:
+            return results
+        creates = [
+            TripCreate(**trips_in[i].model_dump(), **{key: results[i][key] for key in ("vehicle_id", "driver_id")})
+            for i in assigned
+        ]
+        for i, (trip, error) in zip(assigned, await TripService.dispatch_trips(db, creates)):
+            results[i] |= {"trip": trip, "error": error}
+        return results
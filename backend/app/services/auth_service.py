@@ -1,29 +1,119 @@
 """Authentication service — login verification and token issuance."""
 
+import logging
+
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
-from app.core.security import create_access_token, verify_password
+from app.core.security import (
+    PasswordPoolBusy,
+    create_access_token,
+    create_refresh_token,
+    decode_refresh_token,
+    hash_password_async,
+    password_needs_rehash,
+    verify_password_async,
+)
 from app.models.user import User
+from app.services.token_revocation import denylist, revoke_token
+
+logger = logging.getLogger(__name__)
 
 
 class AuthService:
     """Stateless authentication operations."""
 
     @staticmethod
-    async def authenticate(db: AsyncSession, email: str, password: str) -> tuple[str, str]:
-        """Verify credentials and return ``(access_token, role_name)``.
+    def issue_tokens(user: User) -> tuple[str, str, str]:
+        """Return ``(access_token, refresh_token, role_name)`` for *user* (``role_rel`` loaded)."""
+        role_name = user.role_rel.name.value
+        access_token = create_access_token(subject=user.id, role=role_name, email=user.email)
+        return access_token, create_refresh_token(subject=user.id), role_name
+
+    @staticmethod
+    async def authenticate(db: AsyncSession, email: str, password: str) -> tuple[str, str, str]:
+        """Verify credentials and return ``(access_token, refresh_token, role_name)``.
+
+        A hash created with outdated parameters (e.g. an older
+        ``BCRYPT_ROUNDS``) is transparently replaced on successful login.
 
         Raises:
             ValueError: If credentials are invalid.
+            PasswordPoolBusy: If the password pool is saturated.
         """
-        stmt = select(User).where(User.email == email)
+        stmt = select(User).options(joinedload(User.role_rel)).where(User.email == email)
         result = await db.execute(stmt)
         user = result.scalar_one_or_none()
 
-        if user is None or not verify_password(password, user.password_hash):
+        if user is None or not await verify_password_async(password, user.password_hash):
             raise ValueError("Invalid credentials")
 
-        role_name = user.role_rel.name.value
-        token = create_access_token(subject=user.id, role=role_name)
-        return token, role_name
+        # Issued first: a failed rehash rolls back and expires *user*.
+        tokens = AuthService.issue_tokens(user)
+        if password_needs_rehash(user.password_hash):
+            await AuthService._rehash(db, user, password)
+        return tokens
+
+    @staticmethod
+    async def refresh(db: AsyncSession, refresh_token: str) -> tuple[str, str, str]:
+        """Exchange a refresh token for a new token pair, rotating the refresh token.
+
+        The user row is re-read so the new access token carries the current role.
+
+        Raises:
+            ValueError: If the refresh token is invalid, expired, revoked, already
+                used (possibly on another worker) or its user is gone.
+        """
+        try:
+            payload = decode_refresh_token(refresh_token)
+        except Exception:
+            raise ValueError("Invalid refresh token")
+        if denylist.is_revoked(payload):
+            raise ValueError("Refresh token has been revoked")
+
+        stmt = select(User).options(joinedload(User.role_rel)).where(User.id == payload["sub"])
+        user = (await db.execute(stmt)).scalar_one_or_none()
+        if user is None:
+            raise ValueError("Invalid refresh token")
+
+        await revoke_token(db, payload)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Another worker rotated this token first; its jti row already exists.
+            await db.rollback()
+            raise ValueError("Refresh token already used")
+        return AuthService.issue_tokens(user)
+
+    @staticmethod
+    async def logout(db: AsyncSession, access_claims: dict, refresh_token: str | None) -> None:
+        """Revoke the presented access token and, if supplied, the caller's refresh token."""
+        await revoke_token(db, access_claims)
+        if refresh_token is not None:
+            try:
+                refresh_claims = decode_refresh_token(refresh_token)
+            except Exception:
+                refresh_claims = None
+            if refresh_claims is not None and refresh_claims["sub"] == access_claims["sub"]:
+                await revoke_token(db, refresh_claims)
+        await db.commit()
+
+    @staticmethod
+    async def _rehash(db: AsyncSession, user: User, password: str) -> None:
+        """Store a fresh hash of *password*; best effort, never fails the login."""
+        user_id = user.id  # a rollback expires *user*
+        try:
+            user.password_hash = await hash_password_async(password)
+        except PasswordPoolBusy:
+            logger.info("Skipping rehash for user %s: password pool busy.", user_id)
+            return
+        try:
+            await db.commit()
+        except SQLAlchemyError:
+            # The old hash still verifies; the next login tries again.
+            await db.rollback()
+            logger.warning("Could not store rehashed password for user %s.", user_id, exc_info=True)
+            return
+        logger.info("Rehashed password for user %s with current parameters.", user_id)
@@ -0,0 +1,239 @@
+"""Incremental Parquet export of fleet history for analytical tools.
+
+Files are laid out Hive-style under the export directory, so pyarrow,
+pandas, DuckDB or Spark can read each table as one partitioned dataset::
+
+    trips/month=2024-05/part-0.parquet             (by start_time)
+    expenses/month=2024-05/part-0.parquet          (by date)
+    maintenance_logs/month=2024-05/part-0.parquet  (by date)
+    vehicles/part-0.parquet                        (whole table)
+
+Monthly tables are exported from a watermark: the latest month already on
+disk, or ``since`` when given.  That month and every later one are
+rewritten; earlier months are left alone, so a routine run only touches
+the open month.  A row in a closed month that changes afterwards (a trip
+completed weeks after it started) is picked up by re-running with an
+earlier ``since`` or with ``full``.  Trips that have not started are not
+exported.
+
+Rows are read through a server-side cursor in batches of
+``EXPORT_BATCH_SIZE`` and appended to the current partition's file, so
+memory use stays bounded.  Each file is written under a unique temporary
+name and renamed into place when complete.  Runs against the same
+directory take turns on an ``flock`` of ``.export.lock`` in it, so API
+workers and the CLI never interleave; readers skip dot-files.
+
+pyarrow is an optional dependency: install the ``analytics`` extra.
+"""
+
+import asyncio
+import contextlib
+import enum
+import fcntl
+import itertools
+import os
+import shutil
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import Column, Date, DateTime, Integer, Numeric, Row, Table, select
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.models.expense import Expense
+from app.models.maintenance import MaintenanceLog
+from app.models.trip import Trip
+from app.models.vehicle import Vehicle
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # the "analytics" extra is not installed
+    pa = pq = None
+
+_WHOLE_TABLE = "all"
+_LOCK_FILE = ".export.lock"
+
+# Runs in this process queue here rather than each parking a thread on the file lock.
+_export_lock = asyncio.Lock()
+
+
+@dataclass(frozen=True, slots=True)
+class _Dataset:
+    name: str
+    table: Table
+    month_column: Column | None
+
+
+_DATASETS = (
+    _Dataset("trips", Trip.__table__, Trip.__table__.c.start_time),
+    _Dataset("expenses", Expense.__table__, Expense.__table__.c.date),
+    _Dataset("maintenance_logs", MaintenanceLog.__table__, MaintenanceLog.__table__.c.date),
+    _Dataset("vehicles", Vehicle.__table__, None),
+)
+
+
+def _arrow_field(column: Column) -> tuple["pa.Field", Any]:
+    """Return the Arrow field for *column* and a converter for its Python values."""
+    column_type = column.type
+    if isinstance(column_type, SAEnum):  # before String, which Enum subclasses
+        return pa.field(column.name, pa.string()), lambda v: v.value if isinstance(v, enum.Enum) else v
+    if isinstance(column_type, DateTime):
+        return pa.field(column.name, pa.timestamp("us", tz="UTC" if column_type.timezone else None)), None
+    if isinstance(column_type, Date):
+        return pa.field(column.name, pa.date32()), None
+    if isinstance(column_type, Numeric):  # includes Float; API responses expose these as floats too
+        return pa.field(column.name, pa.float64()), lambda v: None if v is None else float(v)
+    if isinstance(column_type, Integer):
+        return pa.field(column.name, pa.int64()), None
+    return pa.field(column.name, pa.string()), None
+
+
+def _month_key(value: date) -> str:
+    return f"{value.year:04d}-{value.month:02d}"
+
+
+def _month_start(month: date, column: Column) -> date:
+    if isinstance(column.type, DateTime):
+        return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+    return date(month.year, month.month, 1)
+
+
+def _existing_months(directory: Path) -> list[str]:
+    return sorted(p.name.removeprefix("month=") for p in directory.glob("month=*") if p.is_dir())
+
+
+class _PartitionWriter:
+    """Writes one partition file under a temporary name and renames it into place on close."""
+
+    def __init__(self, directory: Path, partition: str, schema: "pa.Schema") -> None:
+        folder = directory if partition == _WHOLE_TABLE else directory / f"month={partition}"
+        folder.mkdir(parents=True, exist_ok=True)
+        self.path = folder / "part-0.parquet"
+        self._tmp = folder / f"part-0.parquet.{uuid.uuid4().hex}.tmp"
+        self._writer = pq.ParquetWriter(self._tmp, schema, compression="zstd")
+
+    def write(self, batch: "pa.RecordBatch") -> None:
+        self._writer.write_batch(batch)
+
+    def close(self) -> None:
+        self._writer.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self) -> None:
+        self._writer.close()
+        self._tmp.unlink(missing_ok=True)
+
+
+@contextlib.asynccontextmanager
+async def _exclusive(root: Path) -> AsyncIterator[None]:
+    """Hold the export lock on *root* against this and every other process."""
+    root.mkdir(parents=True, exist_ok=True)
+    async with _export_lock:
+        with open(root / _LOCK_FILE, "a") as handle:
+            # Closing the file releases the lock, even if the wait is cancelled.
+            await asyncio.to_thread(fcntl.flock, handle.fileno(), fcntl.LOCK_EX)
+            yield
+
+
+async def _export_dataset(
+    session: AsyncSession, directory: Path, dataset: _Dataset, start: date | None
+) -> dict[str, int]:
+    fields, converters = zip(*(_arrow_field(column) for column in dataset.table.columns))
+    schema = pa.schema(fields)
+
+    stmt = select(dataset.table)
+    month_column = dataset.month_column
+    if month_column is not None:
+        stmt = stmt.where(month_column.is_not(None)).order_by(month_column)
+        if start is not None:
+            stmt = stmt.where(month_column >= _month_start(start, month_column))
+
+    month_index = None if month_column is None else list(dataset.table.columns).index(month_column)
+
+    def partition_of(row: Row) -> str:
+        return _WHOLE_TABLE if month_index is None else _month_key(row[month_index])
+
+    def to_batch(rows: list[Row]) -> "pa.RecordBatch":
+        arrays = [
+            pa.array([row[i] if convert is None else convert(row[i]) for row in rows], type=field.type)
+            for i, (field, convert) in enumerate(zip(fields, converters))
+        ]
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    written: dict[str, int] = {}
+    writer: _PartitionWriter | None = None
+    try:
+        result = await session.stream(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            # Rows arrive in month order, so each partition is opened exactly once.
+            for partition, group in itertools.groupby(rows, key=partition_of):
+                if partition not in written:
+                    if writer is not None:
+                        await asyncio.to_thread(writer.close)
+                        writer = None
+                    writer = _PartitionWriter(directory, partition, schema)
+                    written[partition] = 0
+                batch = to_batch(list(group))
+                await asyncio.to_thread(writer.write, batch)
+                written[partition] += batch.num_rows
+        if writer is not None:
+            await asyncio.to_thread(writer.close)
+            writer = None
+    finally:
+        if writer is not None:
+            writer.abort()
+
+    if month_column is not None:
+        # Months inside the rewritten range that no longer have rows.
+        floor = _month_key(start) if start is not None else ""
+        for month in _existing_months(directory):
+            if month >= floor and month not in written:
+                shutil.rmtree(directory / f"month={month}")
+    return written
+
+
+class ParquetExportService:
+    """Writes trips, expenses, maintenance logs and vehicles as partitioned Parquet."""
+
+    @staticmethod
+    def available() -> bool:
+        """Whether pyarrow is installed."""
+        return pq is not None
+
+    @staticmethod
+    def watermark(directory: Path) -> date | None:
+        """Return the first day of the latest month already exported to *directory*, if any."""
+        months = _existing_months(directory)
+        return date.fromisoformat(f"{months[-1]}-01") if months else None
+
+    @staticmethod
+    async def export(
+        session_factory: async_sessionmaker[AsyncSession],
+        root: Path,
+        *,
+        since: date | None = None,
+        full: bool = False,
+    ) -> dict[str, dict[str, int]]:
+        """Export every dataset under *root* and return rows written per dataset and partition.
+
+        Monthly datasets are rewritten from the month of *since*, from their
+        watermark when *since* is omitted, or entirely when *full* is set.
+
+        Raises:
+            RuntimeError: If pyarrow is not installed.
+        """
+        if not ParquetExportService.available():
+            raise RuntimeError("Parquet export requires pyarrow; install the 'analytics' extra")
+        summary: dict[str, dict[str, int]] = {}
+        async with _exclusive(root), session_factory() as session:
+            for dataset in _DATASETS:
+                directory = root / dataset.name
+                start = None if full else since or ParquetExportService.watermark(directory)
+                summary[dataset.name] = await _export_dataset(session, directory, dataset, start)
+        return summary
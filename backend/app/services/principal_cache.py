@@ -0,0 +1,68 @@
+"""Authenticated-principal cache.
+
+``get_current_user`` used to load the ``User`` row (plus its role) on every
+request.  The resolved identity is now kept as an immutable ``Principal`` in
+a per-process LRU+TTL cache keyed by user id.  ORM writes to ``User`` or
+``Role`` invalidate affected entries through mapper events; changes made
+with Core ``UPDATE`` statements or by other processes are picked up when the
+entry expires (``PRINCIPAL_CACHE_TTL_SECONDS``).
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy import event
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import Role, RoleEnum, User
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """The identity a request runs as."""
+
+    id: str
+    role: RoleEnum
+    email: str | None = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        """Build a principal from a ``User`` whose ``role_rel`` is loaded."""
+        return cls(id=user.id, role=RoleEnum(user.role_rel.name), email=user.email)
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> "Principal":
+        """Build a principal from verified access-token claims.
+
+        Raises:
+            KeyError, ValueError: If the claims are incomplete or name an unknown role.
+        """
+        return cls(id=payload["sub"], role=RoleEnum(payload["role"]), email=payload.get("email"))
+
+
+principal_cache: TTLCache[str, Principal] = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_principal(user_id: str) -> None:
+    """Forget the cached principal for *user_id*."""
+    principal_cache.pop(user_id)
+
+
+def invalidate_all_principals() -> None:
+    """Forget every cached principal (e.g. after a role is renamed or removed)."""
+    principal_cache.clear()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _on_user_change(_mapper, _connection, target: User) -> None:
+    invalidate_principal(target.id)
+
+
+@event.listens_for(Role, "after_update")
+@event.listens_for(Role, "after_delete")
+def _on_role_change(_mapper, _connection, _target: Role) -> None:
+    invalidate_all_principals()
@@ -0,0 +1,160 @@
+"""Analytics rollup maintenance — incremental updates and full rebuild."""
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.expense import Expense
+from app.models.maintenance import MaintenanceLog
+from app.models.rollup import DailyRollup, VehicleRollup
+from app.models.trip import Trip
+
+METRICS = ("trip_count", "revenue", "distance_km", "fuel_liters", "fuel_cost", "maintenance_cost")
+
+_UPSERT_DIALECTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _as_day(value: date | str) -> date:
+    # ``date()`` comes back as text on SQLite and as a date on PostgreSQL.
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+class RollupService:
+    """Keeps ``vehicle_rollups`` (per vehicle) and ``daily_rollups`` (per vehicle and UTC day) in step.
+
+    The ``record_*`` methods issue upserts on the caller's session and never
+    commit, so the rollup delta lands in the same transaction as the write it
+    describes.
+    """
+
+    @staticmethod
+    async def _upsert(db: AsyncSession, model: type, keys: list[str], rows: list[dict]) -> None:
+        """Add each row's metrics onto the rollup row with the same *keys*, creating it if missing."""
+        if not rows:
+            return
+        table = model.__table__
+        stmt = _UPSERT_DIALECTS[db.get_bind().dialect.name](table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={name: table.c[name] + stmt.excluded[name] for name in METRICS},
+        )
+        await db.execute(stmt, rows)
+
+    @staticmethod
+    async def _apply(db: AsyncSession, vehicle_id: str, day: date | None, **deltas) -> None:
+        """Add *deltas* to the vehicle's row and, when *day* is known, to its row for that day."""
+        totals = {name: deltas.get(name) or 0 for name in METRICS}
+        await RollupService._upsert(db, VehicleRollup, ["vehicle_id"], [{"vehicle_id": vehicle_id, **totals}])
+        if day is not None:
+            await RollupService._upsert(
+                db, DailyRollup, ["vehicle_id", "day"], [{"vehicle_id": vehicle_id, "day": day, **totals}]
+            )
+
+    @staticmethod
+    async def record_trip(db: AsyncSession, trip: Trip) -> None:
+        """Account for a newly dispatched trip."""
+        await RollupService.record_trips(db, [trip])
+
+    @staticmethod
+    async def record_trips(db: AsyncSession, trips: list[Trip]) -> None:
+        """Account for a batch of newly dispatched trips with one upsert per rollup table."""
+        by_vehicle: dict[str, dict] = defaultdict(lambda: dict.fromkeys(METRICS, 0))
+        by_day: dict[tuple[str, date], dict] = defaultdict(lambda: dict.fromkeys(METRICS, 0))
+        for trip in trips:
+            targets = [by_vehicle[trip.vehicle_id]]
+            if trip.start_time is not None:
+                targets.append(by_day[trip.vehicle_id, trip.start_time.date()])
+            for totals in targets:
+                totals["trip_count"] += 1
+                totals["revenue"] += trip.revenue or 0
+                totals["distance_km"] += trip.distance_km or 0
+        await RollupService._upsert(
+            db, VehicleRollup, ["vehicle_id"], [{"vehicle_id": key, **totals} for key, totals in by_vehicle.items()]
+        )
+        await RollupService._upsert(
+            db,
+            DailyRollup,
+            ["vehicle_id", "day"],
+            [{"vehicle_id": vehicle_id, "day": day, **totals} for (vehicle_id, day), totals in by_day.items()],
+        )
+
+    @staticmethod
+    async def record_expense(db: AsyncSession, expense: Expense) -> None:
+        """Account for a newly logged fuel expense."""
+        await RollupService._apply(
+            db, expense.vehicle_id, expense.date, fuel_liters=expense.fuel_liters, fuel_cost=expense.fuel_cost
+        )
+
+    @staticmethod
+    async def record_maintenance(db: AsyncSession, log: MaintenanceLog) -> None:
+        """Account for a newly created maintenance log."""
+        await RollupService._apply(db, log.vehicle_id, log.date, maintenance_cost=log.cost)
+
+    @staticmethod
+    async def rebuild(db: AsyncSession) -> tuple[int, int]:
+        """Recompute every rollup row from the source tables and commit.
+
+        Used for backfill and to repair drift.  Each source table is grouped
+        once by ``(vehicle_id, day)``, the grain of ``daily_rollups``; the
+        partial sums are merged in memory, which is bounded by vehicles ×
+        active days rather than history size.
+
+        Returns:
+            ``(vehicle_rows, daily_rows)`` written.
+        """
+        by_vehicle: dict[str, dict[str, Decimal | int]] = defaultdict(lambda: dict.fromkeys(METRICS, 0))
+        by_day: dict[tuple[str, date], dict[str, Decimal | int]] = defaultdict(lambda: dict.fromkeys(METRICS, 0))
+
+        start_time = Trip.start_time
+        if db.get_bind().dialect.name == "postgresql":
+            # The UTC day, as record_trips uses, whatever the session time zone.
+            start_time = func.timezone("UTC", start_time)
+        trip_day = func.date(start_time)
+        sources = [
+            select(
+                Trip.vehicle_id,
+                trip_day.label("day"),
+                func.count().label("trip_count"),
+                func.coalesce(func.sum(Trip.revenue), 0).label("revenue"),
+                func.coalesce(func.sum(Trip.distance_km), 0).label("distance_km"),
+            ).group_by(Trip.vehicle_id, trip_day),
+            select(
+                Expense.vehicle_id,
+                Expense.date.label("day"),
+                func.sum(Expense.fuel_liters).label("fuel_liters"),
+                func.sum(Expense.fuel_cost).label("fuel_cost"),
+            ).group_by(Expense.vehicle_id, Expense.date),
+            select(
+                MaintenanceLog.vehicle_id,
+                MaintenanceLog.date.label("day"),
+                func.sum(MaintenanceLog.cost).label("maintenance_cost"),
+            ).group_by(MaintenanceLog.vehicle_id, MaintenanceLog.date),
+        ]
+        for stmt in sources:
+            for row in (await db.execute(stmt)).mappings():
+                for name in METRICS:
+                    if name in row:
+                        by_vehicle[row["vehicle_id"]][name] += row[name]
+                        if row["day"] is not None:
+                            by_day[row["vehicle_id"], _as_day(row["day"])][name] += row[name]
+
+        await db.execute(delete(VehicleRollup))
+        await db.execute(delete(DailyRollup))
+        if by_vehicle:
+            await db.execute(
+                insert(VehicleRollup), [{"vehicle_id": key, **totals} for key, totals in by_vehicle.items()]
+            )
+        if by_day:
+            await db.execute(
+                insert(DailyRollup),
+                [{"vehicle_id": vehicle_id, "day": day, **totals} for (vehicle_id, day), totals in by_day.items()],
+            )
+        await db.commit()
+        return len(by_vehicle), len(by_day)
@@ -0,0 +1,150 @@
+"""Access/refresh token revocation.
+
+Tokens are validated cryptographically; revocation is the only state.  Each
+worker keeps an in-memory denylist of revoked token ids (``jti``) and of
+per-user cut-offs ("every token issued before T"), so checking a request
+costs a dict lookup.  Revocations are persisted in ``token_revocations`` and
+every worker pulls rows newer than its watermark every
+``TOKEN_REVOCATION_SYNC_SECONDS``, which bounds how long a token revoked on
+one worker stays usable on another.
+
+Revocations made through a session reach this worker's denylist only once
+that session commits, so a rolled-back transaction revokes nothing.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, insert, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.db.session import async_session_factory
+from app.models.token import TokenRevocation
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Rows are stamped when inserted but become visible at commit; re-reading a
+# short overlap keeps late commits from slipping under the watermark.
+_SYNC_OVERLAP = timedelta(seconds=30)
+_PENDING = "pending_revocations"
+
+
+class TokenDenylist:
+    """In-memory view of the ``token_revocations`` table."""
+
+    def __init__(self) -> None:
+        self._tokens: dict[str, float] = {}  # jti -> token expiry (epoch seconds)
+        self._users: dict[str, tuple[float, float]] = {}  # user id -> (cut-off, entry expiry)
+        self._watermark: datetime | None = None
+
+    def revoke_token(self, jti: str, expires_at: float) -> None:
+        self._tokens[jti] = expires_at
+
+    def revoke_user(self, user_id: str, revoked_at: float, expires_at: float) -> None:
+        current = self._users.get(user_id)
+        if current is None or current[0] < revoked_at:
+            self._users[user_id] = (revoked_at, expires_at)
+
+    def is_revoked(self, payload: dict) -> bool:
+        """Return ``True`` if the token described by *payload* has been revoked."""
+        jti = payload.get("jti")
+        if jti is not None and jti in self._tokens:
+            return True
+        cutoff = self._users.get(payload.get("sub", ""))
+        return cutoff is not None and float(payload.get("iat", 0)) < cutoff[0]
+
+    def prune(self, now: float) -> None:
+        """Drop entries for tokens that have expired anyway."""
+        self._tokens = {jti: exp for jti, exp in self._tokens.items() if exp > now}
+        self._users = {uid: entry for uid, entry in self._users.items() if entry[1] > now}
+
+    def clear(self) -> None:
+        self._tokens.clear()
+        self._users.clear()
+        self._watermark = None
+
+    def __len__(self) -> int:
+        return len(self._tokens) + len(self._users)
+
+    async def sync(self, db: AsyncSession) -> int:
+        """Load revocations recorded since the last sync; return how many rows were read."""
+        now = datetime.now(timezone.utc)
+        stmt = select(TokenRevocation).where(TokenRevocation.expires_at > now)
+        if self._watermark is not None:
+            stmt = stmt.where(TokenRevocation.revoked_at > self._watermark - _SYNC_OVERLAP)
+        rows = (await db.execute(stmt)).scalars().all()
+        for row in rows:
+            if row.jti is not None:
+                self.revoke_token(row.jti, row.expires_at.timestamp())
+            else:
+                self.revoke_user(row.user_id, row.revoked_at.timestamp(), row.expires_at.timestamp())
+        self._watermark = now
+        self.prune(now.timestamp())
+        return len(rows)
+
+
+denylist = TokenDenylist()
+
+
+def _deny_on_commit(session: Session, apply: Callable[[], None]) -> None:
+    session.info.setdefault(_PENDING, []).append(apply)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    for apply in session.info.pop(_PENDING, ()):
+        apply()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+async def revoke_token(db: AsyncSession, payload: dict) -> None:
+    """Revoke the single token described by *payload*; the caller commits."""
+    jti = payload.get("jti")
+    if jti is None or denylist.is_revoked({"jti": jti}):
+        return
+    expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+    db.add(
+        TokenRevocation(jti=jti, user_id=payload["sub"], revoked_at=datetime.now(timezone.utc), expires_at=expires_at)
+    )
+    _deny_on_commit(db.sync_session, lambda: denylist.revoke_token(jti, expires_at.timestamp()))
+
+
+def _revoke_user_on_commit(session: Session, user_id: str) -> dict:
+    """Return the ``token_revocations`` row revoking *user_id*'s tokens, denied locally on commit."""
+    now = datetime.now(timezone.utc)
+    # After the refresh lifetime every token issued before ``now`` is expired.
+    expires_at = now + timedelta(minutes=settings.JWT_REFRESH_EXPIRATION_MINUTES)
+    _deny_on_commit(session, lambda: denylist.revoke_user(user_id, now.timestamp(), expires_at.timestamp()))
+    return {"user_id": user_id, "revoked_at": now, "expires_at": expires_at}
+
+
+async def revoke_user_tokens(db: AsyncSession, user_id: str) -> None:
+    """Revoke every token already issued to *user_id*; the caller commits."""
+    db.add(TokenRevocation(**_revoke_user_on_commit(db.sync_session, user_id)))
+
+
+@event.listens_for(User, "after_update")
+def _on_role_change(_mapper, connection, target: User) -> None:
+    # A role change must not be outlived by tokens that still carry the old role.
+    if inspect(target).attrs.role_id.history.has_changes():
+        connection.execute(insert(TokenRevocation), _revoke_user_on_commit(object_session(target), target.id))
+
+
+async def run_sync_loop(interval: float) -> None:
+    """Keep :data:`denylist` in step with the database until cancelled."""
+    while True:
+        try:
+            async with async_session_factory() as db:
+                await denylist.sync(db)
+        except Exception:
+            logger.exception("Token revocation sync failed; retrying in %.0fs.", interval)
+        await asyncio.sleep(interval)
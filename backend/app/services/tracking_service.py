@@ -0,0 +1,179 @@
+"""Tracking read-model maintenance and the tracking response cache.
+
+``TripService`` (and the driver router, for renames) calls the ``record_*``
+methods on its own session before committing, so ``tracking_views`` never
+disagrees with ``trips`` and ``drivers``.  Lookups
+go through a per-process LRU+TTL cache of rendered responses and their
+ETags.  The writing worker drops its entry after commit; other workers drop
+theirs when the trip event reaches them (see ``trip_events``) or, at the
+latest, when it expires (``TRACKING_CACHE_TTL_SECONDS``).
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+
+from sqlalchemy import Update, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.driver import Driver
+from app.models.tracking import TrackingView
+from app.models.trip import Trip
+from app.models.vehicle import Vehicle
+
+
+@dataclass(frozen=True, slots=True)
+class TrackingEntry:
+    """A rendered tracking response together with its owner and validator."""
+
+    customer_id: str | None
+    body: dict
+    etag: str
+
+
+tracking_cache: TTLCache[str, TrackingEntry] = TTLCache(
+    maxsize=settings.TRACKING_CACHE_MAX_SIZE,
+    ttl=settings.TRACKING_CACHE_TTL_SECONDS,
+)
+
+
+def _render(view: TrackingView) -> TrackingEntry:
+    body = {
+        "tracking_id": view.tracking_id,
+        "status": view.status.value,
+        "origin": view.origin,
+        "destination": view.destination,
+        "vehicle_plate": view.vehicle_plate or "N/A",
+        "driver_name": view.driver_name or "N/A",
+        "cargo_weight": view.cargo_weight,
+        "distance_km": float(view.distance_km) if view.distance_km else None,
+        "start_time": view.start_time.isoformat() if view.start_time else None,
+        "end_time": view.end_time.isoformat() if view.end_time else None,
+    }
+    digest = hashlib.blake2b(json.dumps(body, sort_keys=True).encode(), digest_size=12).hexdigest()
+    return TrackingEntry(customer_id=view.customer_id, body=body, etag=f'"{digest}"')
+
+
+class TrackingService:
+    """Keeps ``tracking_views`` in step with ``trips`` and serves lookups from it."""
+
+    @staticmethod
+    async def record_dispatch(db: AsyncSession, trip: Trip, vehicle: Vehicle, driver: Driver) -> None:
+        """Insert the view row for a newly dispatched (already flushed) trip."""
+        await TrackingService.record_dispatches(db, [(trip, vehicle, driver)])
+
+    @staticmethod
+    async def record_dispatches(db: AsyncSession, dispatched: list[tuple[Trip, Vehicle, Driver]]) -> None:
+        """Insert view rows for a batch of newly dispatched (already flushed) trips."""
+        if not dispatched:
+            return
+        rows = [
+            {
+                "tracking_id": trip.tracking_id,
+                "trip_id": trip.id,
+                "customer_id": trip.customer_id,
+                "status": trip.status,
+                "origin": trip.origin,
+                "destination": trip.destination,
+                "vehicle_plate": vehicle.license_plate,
+                "driver_name": driver.name,
+                "cargo_weight": trip.cargo_weight,
+                "distance_km": trip.distance_km,
+                "start_time": trip.start_time,
+                "end_time": trip.end_time,
+            }
+            for trip, vehicle, driver in dispatched
+        ]
+        await db.execute(insert(TrackingView), rows)
+
+    @staticmethod
+    def status_update(trip_id, status, end_time) -> Update:
+        """Return the ``UPDATE`` copying a trip's status and end time onto its view row.
+
+        The arguments may be plain values or column expressions, so the
+        statement can also be embedded in a trip transition CTE.
+        """
+        return update(TrackingView).where(TrackingView.trip_id == trip_id).values(status=status, end_time=end_time)
+
+    @staticmethod
+    async def record_status(db: AsyncSession, trip: Trip) -> None:
+        """Copy the trip's status and end time onto its view row."""
+        await db.execute(TrackingService.status_update(trip.id, trip.status, trip.end_time))
+
+    @staticmethod
+    async def record_driver_name(db: AsyncSession, driver: Driver) -> list[str]:
+        """Copy a renamed driver's name onto the view rows of their trips.
+
+        Returns:
+            The affected tracking ids, to :meth:`invalidate` after commit.
+        """
+        stmt = (
+            update(TrackingView)
+            .where(TrackingView.trip_id.in_(select(Trip.id).where(Trip.driver_id == driver.id)))
+            .values(driver_name=driver.name)
+            .returning(TrackingView.tracking_id)
+        )
+        return list((await db.execute(stmt)).scalars())
+
+    @staticmethod
+    def invalidate(tracking_id: str) -> None:
+        """Drop the cached response for *tracking_id*; call after the write commits."""
+        tracking_cache.pop(tracking_id)
+
+    @staticmethod
+    async def lookup(db: AsyncSession, tracking_id: str) -> TrackingEntry | None:
+        """Return the rendered tracking response, from cache when possible."""
+        entry = tracking_cache.get(tracking_id)
+        if entry is not None:
+            return entry
+        view = await db.get(TrackingView, tracking_id)
+        if view is None:
+            return None
+        entry = _render(view)
+        tracking_cache.set(tracking_id, entry)
+        return entry
+
+    @staticmethod
+    async def list_for_customer(db: AsyncSession, customer_id: str) -> list[TrackingView]:
+        """Return the customer's shipments, newest first."""
+        stmt = (
+            select(TrackingView)
+            .where(TrackingView.customer_id == customer_id)
+            .order_by(TrackingView.start_time.desc())
+        )
+        return list((await db.execute(stmt)).scalars().all())
+
+    @staticmethod
+    async def rebuild(db: AsyncSession) -> int:
+        """Repopulate ``tracking_views`` from trips, vehicles and drivers and commit.
+
+        Returns:
+            The number of rows written.
+        """
+        source = (
+            select(
+                Trip.tracking_id,
+                Trip.id,
+                Trip.customer_id,
+                Trip.status,
+                Trip.origin,
+                Trip.destination,
+                Vehicle.license_plate,
+                Driver.name,
+                Trip.cargo_weight,
+                Trip.distance_km,
+                Trip.start_time,
+                Trip.end_time,
+            )
+            .join(Vehicle, Vehicle.id == Trip.vehicle_id)
+            .join(Driver, Driver.id == Trip.driver_id)
+        )
+        # The select list follows the table's column order.
+        columns = [column.name for column in TrackingView.__table__.columns]
+        await db.execute(delete(TrackingView))
+        result = await db.execute(insert(TrackingView).from_select(columns, source))
+        await db.commit()
+        tracking_cache.clear()
+        return result.rowcount
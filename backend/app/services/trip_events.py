@@ -0,0 +1,193 @@
+"""Trip status push notifications.
+
+Trip writes stage a ``TripEvent`` on their session.  On PostgreSQL the event
+is sent with ``pg_notify`` inside the same transaction, so every worker's
+``LISTEN`` connection receives it when, and only if, the transaction
+commits.  On other databases it goes to this process's broker after commit.
+
+Each worker fans events out to its stream subscribers through bounded
+queues.  A subscriber that falls behind is disconnected instead of buffered
+without limit; the client reconnects and re-reads current state.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import Text, bindparam, event, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.trip import Trip
+from app.services.tracking_service import TrackingService
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "trip_events"
+_PENDING_KEY = "trip_events.pending"
+
+
+@dataclass(frozen=True, slots=True)
+class TripEvent:
+    """A trip status change as published to subscribers."""
+
+    trip_id: str
+    tracking_id: str
+    status: str
+    customer_id: str | None
+    vehicle_id: str
+    driver_id: str
+    start_time: str | None
+    end_time: str | None
+
+    @classmethod
+    def from_trip(cls, trip: Trip) -> "TripEvent":
+        return cls(
+            trip_id=trip.id,
+            tracking_id=trip.tracking_id,
+            status=trip.status.value,
+            customer_id=trip.customer_id,
+            vehicle_id=trip.vehicle_id,
+            driver_id=trip.driver_id,
+            start_time=trip.start_time.isoformat() if trip.start_time else None,
+            end_time=trip.end_time.isoformat() if trip.end_time else None,
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "TripEvent":
+        return cls(**json.loads(raw))
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    def to_sse(self) -> str:
+        """Render as a server-sent event; the customer id is used for routing only."""
+        body = {key: value for key, value in asdict(self).items() if key != "customer_id"}
+        return f"event: trip_status\ndata: {json.dumps(body)}\n\n"
+
+
+class Subscription:
+    """One stream consumer's bounded queue.  ``None`` marks the end of the stream."""
+
+    def __init__(self, maxsize: int, predicate: Callable[[TripEvent], bool] | None) -> None:
+        self._queue: asyncio.Queue[TripEvent | None] = asyncio.Queue(maxsize)
+        self._predicate = predicate
+        self.closed = False
+
+    def offer(self, trip_event: TripEvent) -> None:
+        if self.closed or (self._predicate is not None and not self._predicate(trip_event)):
+            return
+        try:
+            self._queue.put_nowait(trip_event)
+        except asyncio.QueueFull:
+            logger.warning("Dropping slow trip-event subscriber (%d events queued).", self._queue.qsize())
+            self.close()
+
+    def close(self) -> None:
+        """End the stream; anything still queued is discarded."""
+        if self.closed:
+            return
+        self.closed = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self) -> TripEvent | None:
+        return await self._queue.get()
+
+
+class EventBroker:
+    """In-process fan-out of trip events to subscribers."""
+
+    def __init__(self) -> None:
+        self._subscribers: set[Subscription] = set()
+
+    def subscribe(self, predicate: Callable[[TripEvent], bool] | None = None) -> Subscription:
+        subscription = Subscription(settings.TRACKING_STREAM_QUEUE_SIZE, predicate)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def publish(self, trip_event: TripEvent) -> None:
+        # Every worker sees every event, so this is also where the tracking
+        # response cache learns about changes made by other workers.
+        TrackingService.invalidate(trip_event.tracking_id)
+        for subscription in list(self._subscribers):
+            subscription.offer(trip_event)
+            if subscription.closed:
+                self._subscribers.discard(subscription)
+
+    def close_all(self) -> None:
+        """End every open stream (used at shutdown so workers can exit)."""
+        for subscription in self._subscribers:
+            subscription.close()
+        self._subscribers.clear()
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+
+broker = EventBroker()
+
+
+_NOTIFY_MANY = text("SELECT pg_notify(:channel, payload) FROM unnest(:payloads) AS payload").bindparams(
+    bindparam("payloads", type_=ARRAY(Text))
+)
+
+
+async def stage(db: AsyncSession, *trips: Trip) -> None:
+    """Arrange for each trip's current state to be published when *db* commits; the caller commits."""
+    staged = [TripEvent.from_trip(trip) for trip in trips]
+    if not staged:
+        return
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(_NOTIFY_MANY, {"channel": CHANNEL, "payloads": [e.to_json() for e in staged]})
+    else:
+        db.sync_session.info.setdefault(_PENDING_KEY, []).extend(staged)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    for trip_event in session.info.pop(_PENDING_KEY, ()):
+        broker.publish(trip_event)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _on_notify(_connection, _pid: int, _channel: str, payload: str) -> None:
+    try:
+        broker.publish(TripEvent.from_json(payload))
+    except (TypeError, ValueError):
+        logger.warning("Ignoring malformed %s notification: %r", CHANNEL, payload)
+
+
+async def run_listener(engine: AsyncEngine, interval: float) -> None:
+    """Relay ``NOTIFY`` messages into :data:`broker` until cancelled (PostgreSQL only).
+
+    Holds one pooled connection of the primary engine for the worker's
+    lifetime; notifications are not delivered to replicas.  The connection
+    is health-checked every *interval* seconds and re-established on failure.
+    """
+    while True:
+        try:
+            async with engine.connect() as conn:
+                raw = (await conn.get_raw_connection()).driver_connection
+                await raw.add_listener(CHANNEL, _on_notify)
+                try:
+                    while True:
+                        await asyncio.sleep(interval)
+                        await raw.execute("SELECT 1")
+                finally:
+                    await raw.remove_listener(CHANNEL, _on_notify)
+        except Exception:
+            logger.exception("Trip event listener failed; reconnecting in %.0fs.", interval)
+        await asyncio.sleep(interval)
@@ -1,14 +1,172 @@
 """Trip dispatching service — core business logic and state machine."""
 
-from datetime import datetime, timezone
+from datetime import date, datetime, time, timedelta, timezone
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, Row, Select, Update, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.core.responses import response_columns
+from app.db.concurrency import run_optimistic
 from app.models.driver import Driver, DriverStatus
+from app.models.tracking import TrackingView
 from app.models.trip import Trip, TripStatus
 from app.models.vehicle import Vehicle, VehicleStatus
-from app.schemas.trip import TripCreate, TripStatusUpdate
+from app.schemas.trip import TripCreate, TripResponse, TripStatusUpdate
+from app.services import trip_events
+from app.services.rollup_service import RollupService
+from app.services.tracking_service import TrackingService
+from app.utils.pagination import PageParams, keyset_paginate
+
+
+def _check_vehicle(vehicle: Vehicle | None, trip_in: TripCreate) -> None:
+    if vehicle is None:
+        raise ValueError("Vehicle not found")
+    if vehicle.status != VehicleStatus.AVAILABLE:
+        raise ValueError(f"Vehicle is not available (current: {vehicle.status.value})")
+    if trip_in.cargo_weight > vehicle.max_capacity_kg:
+        raise ValueError("Cargo exceeds vehicle capacity")
+
+
+def _check_driver(driver: Driver | None, today: date) -> None:
+    if driver is None:
+        raise ValueError("Driver not found")
+    if driver.status != DriverStatus.ON_DUTY:
+        raise ValueError(f"Driver is not on duty (current: {driver.status.value})")
+    if driver.license_expiry < today:
+        raise ValueError("Driver license has expired")
+
+
+def _new_trip(trip_in: TripCreate) -> Trip:
+    return Trip(
+        vehicle_id=trip_in.vehicle_id,
+        driver_id=trip_in.driver_id,
+        customer_id=trip_in.customer_id,
+        origin=trip_in.origin,
+        destination=trip_in.destination,
+        cargo_weight=trip_in.cargo_weight,
+        distance_km=trip_in.distance_km,
+        revenue=trip_in.revenue,
+        status=TripStatus.DISPATCHED,
+        start_time=datetime.now(timezone.utc),
+    )
+
+
+# Lifecycle state machine: current status → statuses it may move to.
+TRANSITIONS: dict[TripStatus, frozenset[TripStatus]] = {
+    TripStatus.DRAFT: frozenset({TripStatus.DISPATCHED, TripStatus.CANCELLED}),
+    TripStatus.DISPATCHED: frozenset({TripStatus.IN_TRANSIT, TripStatus.COMPLETED, TripStatus.CANCELLED}),
+    TripStatus.IN_TRANSIT: frozenset({TripStatus.OUT_FOR_DELIVERY, TripStatus.COMPLETED, TripStatus.CANCELLED}),
+    TripStatus.OUT_FOR_DELIVERY: frozenset({TripStatus.DELIVERED, TripStatus.COMPLETED, TripStatus.CANCELLED}),
+    TripStatus.DELIVERED: frozenset({TripStatus.COMPLETED}),
+}
+
+# Inverted once so a transition can be guarded by ``status IN (<sources>)``.
+_SOURCES: dict[TripStatus, list[TripStatus]] = {
+    target: sorted((source for source, targets in TRANSITIONS.items() if target in targets), key=lambda s: s.value)
+    for target in TripStatus
+}
+
+_RESPONSE_COLUMNS = response_columns(Trip, TripResponse)
+
+# Transitions into these statuses end the trip and release its vehicle and driver.
+_RELEASING = frozenset({TripStatus.COMPLETED, TripStatus.DELIVERED, TripStatus.CANCELLED})
+
+# Statuses in which a trip holds its vehicle and driver.
+_ACTIVE = frozenset({TripStatus.DISPATCHED, TripStatus.IN_TRANSIT, TripStatus.OUT_FOR_DELIVERY})
+
+
+def _no_other_active_trip(column, asset_id, trip_id) -> ColumnElement[bool]:
+    """True unless a trip other than *trip_id* still holds the asset *column* points at.
+
+    A Delivered trip has already released its assets, which may since have
+    been dispatched again; completing it, or cancelling a draft, must not
+    free them from that newer trip.
+    """
+    return ~select(Trip.id).where(column == asset_id, Trip.id != trip_id, Trip.status.in_(_ACTIVE)).exists()
+
+
+def _release_vehicle(vehicle_id, trip_id, odometer_km: int | None) -> Update:
+    values: dict = {"status": VehicleStatus.AVAILABLE, "version": Vehicle.version + 1}
+    if odometer_km is not None:
+        values["odometer_km"] = odometer_km
+    return (
+        update(Vehicle)
+        .where(
+            Vehicle.id == vehicle_id,
+            Vehicle.status == VehicleStatus.ON_TRIP,
+            _no_other_active_trip(Trip.vehicle_id, vehicle_id, trip_id),
+        )
+        .values(values)
+    )
+
+
+def _release_driver(driver_id, trip_id) -> Update:
+    return (
+        update(Driver)
+        .where(
+            Driver.id == driver_id,
+            Driver.status == DriverStatus.ON_TRIP,
+            _no_other_active_trip(Trip.driver_id, driver_id, trip_id),
+        )
+        .values(status=DriverStatus.ON_DUTY, version=Driver.version + 1)
+    )
+
+
+def _started_between(stmt: Select, date_from: date | None, date_to: date | None) -> Select:
+    """Restrict *stmt* to trips started on the inclusive UTC calendar days given."""
+    if date_from is not None:
+        stmt = stmt.where(Trip.start_time >= datetime.combine(date_from, time.min, tzinfo=timezone.utc))
+    if date_to is not None:
+        day_after = date_to + timedelta(days=1)
+        stmt = stmt.where(Trip.start_time < datetime.combine(day_after, time.min, tzinfo=timezone.utc))
+    return stmt
+
+
+def _one_statement(moved: Update, releasing: bool, odometer_km: int | None) -> Select:
+    """Return *moved* with its side effects attached as data-modifying CTEs (PostgreSQL)."""
+    trip_cte = moved.returning(*Trip.__table__.c).cte("moved")
+    stmt = select(trip_cte).add_cte(
+        TrackingService.status_update(trip_cte.c.id, trip_cte.c.status, trip_cte.c.end_time)
+        .returning(TrackingView.trip_id)
+        .cte("moved_view")
+    )
+    if releasing:
+        # The CTEs share one snapshot, in which the moved trip still has its old status.
+        stmt = stmt.add_cte(
+            _release_vehicle(trip_cte.c.vehicle_id, trip_cte.c.id, odometer_km)
+            .returning(Vehicle.id)
+            .cte("released_vehicle"),
+            _release_driver(trip_cte.c.driver_id, trip_cte.c.id).returning(Driver.id).cte("released_driver"),
+        )
+    return stmt
+
+
+async def _transition_in_one_statement(
+    db: AsyncSession, moved: Update, releasing: bool, odometer_km: int | None
+) -> Trip | None:
+    """Apply a guarded trip update and its side effects as one statement (PostgreSQL)."""
+    stmt = _one_statement(moved, releasing, odometer_km)
+    result = await db.execute(select(Trip).from_statement(stmt), execution_options={"populate_existing": True})
+    return result.scalar_one_or_none()
+
+
+async def _transition_in_sequence(
+    db: AsyncSession, moved: Update, releasing: bool, odometer_km: int | None
+) -> Trip | None:
+    """Apply a guarded trip update, then its side effects, statement by statement."""
+    result = await db.execute(
+        moved.returning(Trip),
+        execution_options={"synchronize_session": False, "populate_existing": True},
+    )
+    trip = result.scalar_one_or_none()
+    if trip is None:
+        return None
+    if releasing:
+        await db.execute(_release_vehicle(trip.vehicle_id, trip.id, odometer_km))
+        await db.execute(_release_driver(trip.driver_id, trip.id))
+    await TrackingService.record_status(db, trip)
+    return trip
 
 
 class TripService:
@@ -29,53 +187,124 @@ class TripService:
           - Vehicle.status → On Trip
           - Driver.status → On Trip
 
+        Concurrent dispatches of the same vehicle or driver are resolved by
+        the version check on flush rather than row locks: the loser re-reads
+        and re-validates, and normally fails with "not available".
+
         Raises:
             ValueError: On any validation failure.
+            StaleDataError: If the version race is lost on every attempt.
         """
-        # --- Lock vehicle and driver rows to prevent concurrent dispatch ---
-        vehicle = await db.get(Vehicle, trip_in.vehicle_id, with_for_update=True)
-        if vehicle is None:
-            raise ValueError("Vehicle not found")
-        if vehicle.status != VehicleStatus.AVAILABLE:
-            raise ValueError(f"Vehicle is not available (current: {vehicle.status.value})")
-        if trip_in.cargo_weight > vehicle.max_capacity_kg:
-            raise ValueError("Cargo exceeds vehicle capacity")
-
-        driver = await db.get(Driver, trip_in.driver_id, with_for_update=True)
-        if driver is None:
-            raise ValueError("Driver not found")
-        if driver.status != DriverStatus.ON_DUTY:
-            raise ValueError(f"Driver is not on duty (current: {driver.status.value})")
-        if driver.license_expiry < datetime.now(timezone.utc).date():
-            raise ValueError("Driver license has expired")
-
-        # --- Create trip ---
-        trip = Trip(
-            vehicle_id=trip_in.vehicle_id,
-            driver_id=trip_in.driver_id,
-            origin=trip_in.origin,
-            destination=trip_in.destination,
-            cargo_weight=trip_in.cargo_weight,
-            distance_km=trip_in.distance_km,
-            revenue=trip_in.revenue,
-            status=TripStatus.DISPATCHED,
-            start_time=datetime.now(timezone.utc),
-        )
-        db.add(trip)
 
-        # --- Transition states ---
-        vehicle.status = VehicleStatus.ON_TRIP
-        driver.status = DriverStatus.ON_TRIP
+        async def _attempt() -> Trip:
+            vehicle = await db.get(Vehicle, trip_in.vehicle_id)
+            _check_vehicle(vehicle, trip_in)
+            driver = await db.get(Driver, trip_in.driver_id)
+            _check_driver(driver, datetime.now(timezone.utc).date())
+
+            # --- Create trip ---
+            trip = _new_trip(trip_in)
+            db.add(trip)
+
+            # --- Transition states ---
+            vehicle.status = VehicleStatus.ON_TRIP
+            driver.status = DriverStatus.ON_TRIP
+
+            await db.flush()
+            await RollupService.record_trip(db, trip)
+            await TrackingService.record_dispatch(db, trip, vehicle, driver)
+            await trip_events.stage(db, trip)
+            await db.commit()
+            return trip
+
+        return await run_optimistic(db, _attempt)
+
+    @staticmethod
+    async def dispatch_trips(db: AsyncSession, trips_in: list[TripCreate]) -> list[tuple[Trip | None, str | None]]:
+        """Validate and dispatch a batch of trips in one transaction.
+
+        Applies the same rules as :meth:`dispatch_trip`, item by item in
+        request order, so a vehicle or driver claimed by an earlier item is
+        unavailable to later ones.  Every referenced vehicle, then every
+        driver, is locked with one ``SELECT ... FOR UPDATE`` each, ordered by
+        id; concurrent batches therefore acquire locks in the same order and
+        cannot deadlock.  Unlike single dispatch, a batch keeps these locks
+        instead of retrying on version conflicts, since one lost race would
+        otherwise re-run thousands of items.  Valid items are inserted
+        together; invalid ones are reported without affecting the rest.
 
+        Returns:
+            One ``(trip, None)`` or ``(None, error)`` pair per input, in order.
+        """
+        vehicle_ids = sorted({t.vehicle_id for t in trips_in})
+        driver_ids = sorted({t.driver_id for t in trips_in})
+        vehicles = {
+            v.id: v
+            for v in (
+                await db.execute(
+                    select(Vehicle).where(Vehicle.id.in_(vehicle_ids)).order_by(Vehicle.id).with_for_update()
+                )
+            ).scalars()
+        }
+        drivers = {
+            d.id: d
+            for d in (
+                await db.execute(select(Driver).where(Driver.id.in_(driver_ids)).order_by(Driver.id).with_for_update())
+            ).scalars()
+        }
+
+        today = datetime.now(timezone.utc).date()
+        results: list[tuple[Trip | None, str | None]] = []
+        dispatched: list[tuple[Trip, Vehicle, Driver]] = []
+        for trip_in in trips_in:
+            vehicle = vehicles.get(trip_in.vehicle_id)
+            driver = drivers.get(trip_in.driver_id)
+            try:
+                _check_vehicle(vehicle, trip_in)
+                _check_driver(driver, today)
+            except ValueError as exc:
+                results.append((None, str(exc)))
+                continue
+            trip = _new_trip(trip_in)
+            # Claimed in memory only; written below as one UPDATE per table.
+            set_committed_value(vehicle, "status", VehicleStatus.ON_TRIP)
+            set_committed_value(driver, "status", DriverStatus.ON_TRIP)
+            dispatched.append((trip, vehicle, driver))
+            results.append((trip, None))
+
+        if not dispatched:
+            await db.rollback()
+            return results
+
+        trips = [trip for trip, _, _ in dispatched]
+        db.add_all(trips)
+        # Client-side keys let the unit of work send the trips as one multi-row INSERT.
+        await db.flush()
+        for model, status, claimed in (
+            (Vehicle, VehicleStatus.ON_TRIP, [vehicle for _, vehicle, _ in dispatched]),
+            (Driver, DriverStatus.ON_TRIP, [driver for _, _, driver in dispatched]),
+        ):
+            # Rows are locked, so the version is bumped for optimistic writers
+            # rather than checked row by row.
+            await db.execute(
+                update(model)
+                .where(model.id.in_([row.id for row in claimed]))
+                .values(status=status, version=model.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+            for row in claimed:
+                set_committed_value(row, "version", row.version + 1)
+        await RollupService.record_trips(db, trips)
+        await TrackingService.record_dispatches(db, dispatched)
+        await trip_events.stage(db, *trips)
         await db.commit()
-        await db.refresh(trip)
-        return trip
+        return results
 
     @staticmethod
     async def update_trip_status(db: AsyncSession, trip_id: str, payload: TripStatusUpdate) -> Trip:
         """Progress a trip through its lifecycle.
 
-        Valid transitions:
+        Valid transitions are listed in ``TRANSITIONS``, e.g.:
           - Draft → Dispatched (handled by dispatch_trip)
           - Dispatched → Completed
           - Draft → Cancelled
@@ -85,49 +314,81 @@ class TripService:
           - Driver.status → On Duty
           - Update final odometer if provided
 
+        The transition is a guarded ``UPDATE ... WHERE status IN (<sources>)
+        RETURNING``, so of two concurrent transitions exactly one matches and
+        no row is read beforehand.  On PostgreSQL the vehicle, driver and
+        tracking-view updates ride along as data-modifying CTEs and the whole
+        change is one statement; other dialects issue them in sequence within
+        the same transaction.
+
         Raises:
-            ValueError: On invalid transition.
+            ValueError: If the trip does not exist or the transition is invalid.
         """
-        trip = await db.get(Trip, trip_id, with_for_update=True)
-        if trip is None:
-            raise ValueError("Trip not found")
-
         target = payload.status
+        values: dict = {"status": target, "version": Trip.version + 1}
+        releasing = target in _RELEASING
+        if releasing:
+            values["end_time"] = datetime.now(timezone.utc)
+        moved = update(Trip).where(Trip.id == trip_id, Trip.status.in_(_SOURCES[target])).values(values)
 
-        # --- Validate transition ---
-        valid_transitions: dict[TripStatus, list[TripStatus]] = {
-            TripStatus.DRAFT: [TripStatus.DISPATCHED, TripStatus.CANCELLED],
-            TripStatus.DISPATCHED: [TripStatus.IN_TRANSIT, TripStatus.COMPLETED, TripStatus.CANCELLED],
-            TripStatus.IN_TRANSIT: [TripStatus.OUT_FOR_DELIVERY, TripStatus.COMPLETED, TripStatus.CANCELLED],
-            TripStatus.OUT_FOR_DELIVERY: [TripStatus.DELIVERED, TripStatus.COMPLETED, TripStatus.CANCELLED],
-            TripStatus.DELIVERED: [TripStatus.COMPLETED],
-        }
-        allowed = valid_transitions.get(trip.status, [])
-        if target not in allowed:
-            raise ValueError(f"Cannot transition from {trip.status.value} to {target.value}")
+        if db.get_bind().dialect.name == "postgresql":
+            trip = await _transition_in_one_statement(db, moved, releasing, payload.odometer_km)
+        else:
+            trip = await _transition_in_sequence(db, moved, releasing, payload.odometer_km)
 
-        trip.status = target
+        if trip is None:
+            current = await db.scalar(select(Trip.status).where(Trip.id == trip_id))
+            if current is None:
+                raise ValueError("Trip not found")
+            raise ValueError(f"Cannot transition from {current.value} to {target.value}")
 
-        # Release vehicle and driver on terminal completion states
-        if target in (TripStatus.COMPLETED, TripStatus.DELIVERED, TripStatus.CANCELLED):
-            trip.end_time = datetime.now(timezone.utc)
+        await trip_events.stage(db, trip)
+        await db.commit()
+        TrackingService.invalidate(trip.tracking_id)
+        return trip
 
-            vehicle = await db.get(Vehicle, trip.vehicle_id, with_for_update=True)
-            driver = await db.get(Driver, trip.driver_id, with_for_update=True)
+    @staticmethod
+    async def list_trips(
+        db: AsyncSession,
+        page: PageParams,
+        *,
+        status: TripStatus | None = None,
+        vehicle_id: str | None = None,
+        driver_id: str | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> list[Row]:
+        """Return one page of trips, newest first, filtered on indexed columns.
 
-            if vehicle:
-                vehicle.status = VehicleStatus.AVAILABLE
-                if payload.odometer_km is not None:
-                    vehicle.odometer_km = payload.odometer_km
-            if driver:
-                driver.status = DriverStatus.ON_DUTY
+        Rows carry exactly the ``TripResponse`` columns, for direct
+        serialization without ORM instances.
 
-        await db.commit()
-        await db.refresh(trip)
-        return trip
+        ``date_from`` / ``date_to`` are inclusive calendar days (UTC) matched
+        against ``start_time``.  The result holds up to ``page.limit + 1``
+        rows; the caller trims the look-ahead row.
+
+        Raises:
+            ValueError: If ``page.cursor`` is malformed.
+        """
+        stmt = select(*_RESPONSE_COLUMNS)
+        if status is not None:
+            stmt = stmt.where(Trip.status == status)
+        if vehicle_id is not None:
+            stmt = stmt.where(Trip.vehicle_id == vehicle_id)
+        if driver_id is not None:
+            stmt = stmt.where(Trip.driver_id == driver_id)
+        stmt = _started_between(stmt, date_from, date_to)
+
+        stmt = keyset_paginate(stmt, Trip.start_time, Trip.id, page, descending=True)
+        result = await db.execute(stmt)
+        return list(result.all())
 
     @staticmethod
-    async def list_trips(db: AsyncSession) -> list[Trip]:
-        """Return all trips."""
-        result = await db.execute(select(Trip))
-        return list(result.scalars().all())
+    def export_query(date_from: date | None = None, date_to: date | None = None) -> Select:
+        """Return the statement for a full trip export, oldest first.
+
+        Selects the ``TripResponse`` columns; the date bounds match
+        :meth:`list_trips`.
+        """
+        stmt = _started_between(select(*_RESPONSE_COLUMNS), date_from, date_to)
+        return stmt.order_by(Trip.start_time.asc().nulls_last(), Trip.id.asc())
@@ -0,0 +1,124 @@
+"""Keyset (cursor) pagination helpers shared by the list endpoints.
+
+A page is ordered by ``(sort_key, id)``.  The cursor handed back to the
+client is an opaque, URL-safe encoding of the last row's sort key and id;
+the next page resumes strictly after that pair, so each page costs one
+index range scan no matter how deep the client has paged.
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from fastapi import Query, Response
+from sqlalchemy import Select, and_, or_, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass(frozen=True)
+class PageParams:
+    """Validated ``cursor`` / ``limit`` query parameters."""
+
+    cursor: str | None
+    limit: int
+
+
+def page_params(
+    cursor: str | None = Query(default=None, description="Opaque cursor from the previous page's X-Next-Cursor"),
+    limit: int = Query(default=settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+) -> PageParams:
+    """FastAPI dependency collecting pagination parameters."""
+    return PageParams(cursor=cursor, limit=limit)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if hasattr(value, "value"):  # str-based enums
+        return value.value
+    return value
+
+
+def _decode_value(raw: Any, column: InstrumentedAttribute) -> Any:
+    if raw is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    if python_type is date:
+        return date.fromisoformat(raw)
+    if python_type is Decimal:
+        return Decimal(raw)
+    return raw
+
+
+def encode_cursor(sort_value: Any, row_id: str) -> str:
+    """Encode ``(sort_value, row_id)`` as an opaque URL-safe token."""
+    payload = json.dumps([_encode_value(sort_value), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_col: InstrumentedAttribute) -> tuple[Any, str]:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return _decode_value(raw_value, sort_col), str(row_id)
+    except Exception as exc:
+        raise ValueError("Invalid pagination cursor") from exc
+
+
+def keyset_paginate(
+    stmt: Select,
+    sort_col: InstrumentedAttribute,
+    id_col: InstrumentedAttribute,
+    page: PageParams,
+    *,
+    descending: bool = False,
+) -> Select:
+    """Apply ordering, the resume-after-cursor predicate and ``LIMIT`` to *stmt*.
+
+    One extra row is fetched so :func:`finish_page` can tell whether another
+    page exists.  ``NULL`` sort keys are ordered last in both directions.
+    """
+    nullable = bool(getattr(sort_col.expression, "nullable", False))
+
+    if page.cursor is not None:
+        last_value, last_id = decode_cursor(page.cursor, sort_col)
+        if last_value is None:
+            after = and_(sort_col.is_(None), id_col < last_id if descending else id_col > last_id)
+        else:
+            pair, bound = tuple_(sort_col, id_col), tuple_(last_value, last_id)
+            after = pair < bound if descending else pair > bound
+            if nullable:
+                after = or_(after, sort_col.is_(None))
+        stmt = stmt.where(after)
+
+    if descending:
+        order = (sort_col.desc().nulls_last(), id_col.desc())
+    else:
+        order = (sort_col.asc().nulls_last(), id_col.asc())
+    return stmt.order_by(*order).limit(page.limit + 1)
+
+
+def finish_page(rows: list, sort_attr: str, page: PageParams, response: Response) -> list:
+    """Trim the look-ahead row and publish the next cursor as a response header."""
+    if len(rows) <= page.limit:
+        return rows
+    rows = rows[: page.limit]
+    last = rows[-1]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(getattr(last, sort_attr), last.id)
+    return rows
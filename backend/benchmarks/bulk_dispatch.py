@@ -0,0 +1,136 @@
+"""Compare dispatch throughput: one ``POST /trips`` per trip vs. ``POST /trips/bulk``.
+
+Usage::
+
+    python -m benchmarks.bulk_dispatch --trips 3000 --batch-size 500
+    python -m benchmarks.bulk_dispatch --database-url postgresql+asyncpg://.../fleetflow_bench
+
+The app runs in-process behind ``httpx.ASGITransport``, so the numbers are
+application + database cost without network overhead.  The schema is
+created on the target database and every table is emptied first: point
+``--database-url`` at a scratch database, never a real one.  The default is
+an in-memory SQLite database, which shows the statement-count difference but
+understates the round-trip savings against a networked PostgreSQL.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.core.security import create_access_token  # noqa: E402
+from app.db.base_class import Base  # noqa: E402
+from app.db.session import get_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import driver, expense, maintenance, rollup, token, tracking, trip, user, vehicle  # noqa: E402, F401
+from app.models.driver import Driver, DriverStatus  # noqa: E402
+from app.models.user import RoleEnum  # noqa: E402
+from app.models.vehicle import Vehicle  # noqa: E402
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+async def _seed(factory, count: int, prefix: str) -> list[dict]:
+    async with factory() as session:
+        vehicles = [
+            Vehicle(
+                name=f"Bench {i}",
+                model="2024",
+                license_plate=f"{prefix}{i:06d}",
+                max_capacity_kg=10000,
+                acquisition_cost=1.0,
+            )
+            for i in range(count)
+        ]
+        drivers = [
+            Driver(
+                name=f"Bench {i}",
+                license_number=f"{prefix}{i:06d}",
+                license_expiry=date.today() + timedelta(days=365),
+                status=DriverStatus.ON_DUTY,
+            )
+            for i in range(count)
+        ]
+        session.add_all(vehicles + drivers)
+        await session.commit()
+    return [
+        {"vehicle_id": v.id, "driver_id": d.id, "origin": "A", "destination": "B", "cargo_weight": 100}
+        for v, d in zip(vehicles, drivers)
+    ]
+
+
+def _report(label: str, trips: int, seconds: float, statements: int) -> None:
+    rate = trips / seconds
+    logger.info("%-8s %6d trips in %7.2fs  %8.1f trips/s  %6d SQL statements", label, trips, seconds, rate, statements)
+
+
+async def run(database_url: str, trips: int, batch_size: int) -> None:
+    kwargs = {"poolclass": StaticPool} if database_url.startswith("sqlite") else {}
+    engine = create_async_engine(database_url, **kwargs)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for table in reversed(Base.metadata.sorted_tables):
+            await conn.execute(table.delete())
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    statements = 0
+
+    def _count(*_args) -> None:
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _count)
+
+    async def _get_bench_db():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = _get_bench_db
+    access_token = create_access_token(subject="benchmark", role=RoleEnum.DISPATCHER.value)
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    single_items = await _seed(factory, trips, "S")
+    bulk_items = await _seed(factory, trips, "B")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        statements, started = 0, time.perf_counter()
+        for item in single_items:
+            response = await client.post("/api/v1/trips/", json=item, headers=headers)
+            response.raise_for_status()
+        _report("single", trips, time.perf_counter() - started, statements)
+
+        statements, started = 0, time.perf_counter()
+        for offset in range(0, trips, batch_size):
+            batch = bulk_items[offset : offset + batch_size]
+            response = await client.post("/api/v1/trips/bulk", json={"trips": batch}, headers=headers)
+            response.raise_for_status()
+            assert all(result["error"] is None for result in response.json())
+        _report("bulk", trips, time.perf_counter() - started, statements)
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite+aiosqlite://", help="scratch database (will be emptied)")
+    parser.add_argument("--trips", type=int, default=3000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.database_url, args.trips, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,536 @@
+"""Load test of the API hot paths against a large, reproducible dataset.
+
+Usage::
+
+    # Seed a scratch database once (every table is emptied first), then run.
+    python -m benchmarks.load --database-url postgresql+asyncpg://.../fleetflow_bench \\
+        --seed --yes-wipe-database
+    python -m benchmarks.load --database-url postgresql+asyncpg://.../fleetflow_bench \\
+        --requests 2000 --concurrency 32 --output benchmarks/results/1.1.0.json \\
+        --baseline benchmarks/results/1.0.0.json
+
+``--seed`` writes ``--vehicles`` vehicles, as many drivers, ``--trips``
+completed trips over the past year (each fifth with a fuel expense), two
+maintenance logs per vehicle, one user per role, and rebuilds the rollups
+and tracking views.  The data is derived from ``--rng-seed``, so the same
+arguments produce the same dataset (dated relative to the seeding day).
+
+``--database-url`` is required and never taken from ``DATABASE_URL``, so
+the app's own database cannot be picked up by accident; point it at a
+scratch database.  Because seeding deletes every row first, ``--seed``
+also requires ``--yes-wipe-database``.
+
+Each scenario then sends ``--requests`` requests from ``--concurrency``
+concurrent clients, one scenario at a time:
+
+* ``login``: ``POST /auth/login`` (bcrypt-bound by design)
+* ``list_vehicles``, ``list_drivers``, ``list_trips``: first page of 100
+* ``dispatch``: ``POST /trips`` with an idle vehicle and driver
+* ``complete``: ``PATCH /trips/{id}/status`` to Completed for those trips,
+  which releases the vehicle and driver again
+* ``tracking_lookup``: ``GET /tracking/{tracking_id}`` for seeded trips
+* ``analytics_dashboard``, ``analytics_roi``, ``analytics_timeseries``
+  (monthly, past year), ``analytics_vehicles`` (bottom 20 by ROI)
+
+Throughput and p50/p95/p99/max latency are reported per scenario and
+written as JSON together with the app version, git commit, database and
+dataset size.  With ``--baseline`` each scenario's p95 is compared with an
+earlier result file, and the exit status is 1 if any regressed by more
+than ``--tolerance``.
+
+By default the app runs in-process behind ``httpx.ASGITransport`` (no
+network, rate limiting disabled).  With ``--base-url`` requests go to a
+running server instead, which must use the same database and run with
+``RATE_LIMIT_ENABLED=false``.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./benchmark.db")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+import httpx  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import func, insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.core.rate_limit import limiter  # noqa: E402
+from app.core.security import hash_password  # noqa: E402
+from app.db.base_class import Base  # noqa: E402
+from app.db.session import get_db, get_read_db, get_read_session_factory  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import driver, expense, maintenance, rollup, token, tracking, trip, user, vehicle  # noqa: E402, F401
+from app.models.driver import Driver, DriverStatus  # noqa: E402
+from app.models.expense import Expense  # noqa: E402
+from app.models.maintenance import MaintenanceLog, MaintenanceStatus, MaintenanceType  # noqa: E402
+from app.models.tracking import TrackingView  # noqa: E402
+from app.models.trip import Trip, TripStatus  # noqa: E402
+from app.models.user import Role, RoleEnum, User  # noqa: E402
+from app.models.vehicle import Vehicle, VehicleStatus  # noqa: E402
+from app.services.rollup_service import RollupService  # noqa: E402
+from app.services.tracking_service import TrackingService  # noqa: E402
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+PASSWORD = "bench-password"
+INSERT_BATCH = 10_000
+TRACKING_SAMPLE = 5_000
+
+
+def _email(role: RoleEnum) -> str:
+    return f"{role.name.lower()}@fleetflow.bench"
+
+
+# --- Dataset ---------------------------------------------------------------
+
+
+async def _insert_batched(session: AsyncSession, model: type, rows) -> int:
+    """Insert the *rows* iterable through executemany batches; return how many were written."""
+    written, batch = 0, []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == INSERT_BATCH:
+            await session.execute(insert(model), batch)
+            written, batch = written + len(batch), []
+    if batch:
+        await session.execute(insert(model), batch)
+        written += len(batch)
+    return written
+
+
+async def seed(factory: async_sessionmaker[AsyncSession], vehicles: int, trips: int, rng_seed: int) -> None:
+    """Empty every table and write the benchmark dataset."""
+    rng = random.Random(rng_seed)
+
+    def new_id() -> str:
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    started = time.perf_counter()
+    async with factory() as session:
+        for table in reversed(Base.metadata.sorted_tables):
+            await session.execute(table.delete())
+
+        password_hash = hash_password(PASSWORD)
+        for role in RoleEnum:
+            role_row = Role(name=role)
+            session.add(role_row)
+            await session.flush()
+            session.add(User(email=_email(role), password_hash=password_hash, role_id=role_row.id))
+
+        vehicle_ids = [new_id() for _ in range(vehicles)]
+        driver_ids = [new_id() for _ in range(vehicles)]
+        await _insert_batched(
+            session,
+            Vehicle,
+            (
+                {
+                    "id": vehicle_id,
+                    "name": f"Bench {i}",
+                    "model": "2024",
+                    "license_plate": f"BV{i:07d}",
+                    "max_capacity_kg": rng.randint(1000, 25000),
+                    "odometer_km": 0,
+                    "acquisition_cost": rng.randint(500_000, 5_000_000),
+                    "status": VehicleStatus.AVAILABLE,
+                }
+                for i, vehicle_id in enumerate(vehicle_ids)
+            ),
+        )
+        await _insert_batched(
+            session,
+            Driver,
+            (
+                {
+                    "id": driver_id,
+                    "name": f"Bench Driver {i}",
+                    "license_number": f"BD{i:07d}",
+                    "license_expiry": date.today() + timedelta(days=365),
+                    "safety_score": 100,
+                    "status": DriverStatus.ON_DUTY,
+                }
+                for i, driver_id in enumerate(driver_ids)
+            ),
+        )
+
+        expense_rows = []
+
+        def trip_rows():
+            for i in range(trips):
+                start = now - timedelta(seconds=rng.randint(3600, 365 * 86400))
+                distance = rng.randint(20, 1500)
+                trip_id = new_id()
+                vehicle_id = rng.choice(vehicle_ids)
+                if i % 5 == 0:
+                    liters = round(distance / rng.uniform(3, 12), 2)
+                    expense_rows.append(
+                        {
+                            "id": new_id(),
+                            "vehicle_id": vehicle_id,
+                            "trip_id": trip_id,
+                            "fuel_liters": liters,
+                            "fuel_cost": round(liters * 92, 2),
+                            "date": start.date(),
+                        }
+                    )
+                yield {
+                    "id": trip_id,
+                    "vehicle_id": vehicle_id,
+                    "driver_id": rng.choice(driver_ids),
+                    "tracking_id": f"BTK-{i:010d}",  # disjoint from the TRK- ids dispatch generates
+                    "origin": "Ahmedabad",
+                    "destination": "Mumbai",
+                    "cargo_weight": rng.randint(100, 20000),
+                    "distance_km": distance,
+                    "revenue": distance * rng.randint(40, 120),
+                    "status": TripStatus.COMPLETED,
+                    "start_time": start,
+                    "end_time": start + timedelta(hours=distance / 50),
+                    "version": 1,
+                }
+
+        await _insert_batched(session, Trip, trip_rows())
+        await _insert_batched(session, Expense, iter(expense_rows))
+        await _insert_batched(
+            session,
+            MaintenanceLog,
+            (
+                {
+                    "id": new_id(),
+                    "vehicle_id": vehicle_id,
+                    "type": MaintenanceType.PREVENTATIVE,
+                    "description": "Scheduled service",
+                    "cost": rng.randint(2000, 40000),
+                    "date": (now - timedelta(days=rng.randint(1, 365))).date(),
+                    "status": MaintenanceStatus.COMPLETED,
+                }
+                for vehicle_id in vehicle_ids
+                for _ in range(2)
+            ),
+        )
+        await session.commit()
+
+        await RollupService.rebuild(session)
+        await TrackingService.rebuild(session)
+    logger.info(
+        "Seeded %d vehicles, %d drivers, %d trips, %d expenses in %.1fs",
+        vehicles,
+        vehicles,
+        trips,
+        len(expense_rows),
+        time.perf_counter() - started,
+    )
+
+
+async def dataset_size(factory: async_sessionmaker[AsyncSession]) -> dict[str, int]:
+    async with factory() as session:
+        return {
+            name: await session.scalar(select(func.count()).select_from(model))
+            for name, model in (("vehicles", Vehicle), ("drivers", Driver), ("trips", Trip), ("expenses", Expense))
+        }
+
+
+async def idle_pairs(factory: async_sessionmaker[AsyncSession], count: int) -> list[tuple[str, str]]:
+    """Return up to *count* (vehicle, driver) pairs that can be dispatched."""
+    async with factory() as session:
+        vehicle_ids = await session.scalars(
+            select(Vehicle.id).where(Vehicle.status == VehicleStatus.AVAILABLE).order_by(Vehicle.id).limit(count)
+        )
+        driver_ids = await session.scalars(
+            select(Driver.id)
+            .where(Driver.status == DriverStatus.ON_DUTY, Driver.license_expiry >= date.today())
+            .order_by(Driver.id)
+            .limit(count)
+        )
+        return list(zip(vehicle_ids, driver_ids))
+
+
+async def tracking_ids(factory: async_sessionmaker[AsyncSession]) -> list[str]:
+    async with factory() as session:
+        return list(await session.scalars(select(TrackingView.tracking_id).limit(TRACKING_SAMPLE)))
+
+
+# --- Measurement -----------------------------------------------------------
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, min(len(ordered), round(q / 100 * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class ScenarioResult:
+    requests: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    status_codes: dict[str, int] = field(default_factory=dict)
+
+    def summary(self) -> dict:
+        ordered = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 3),
+            "throughput_rps": round(self.requests / self.seconds, 1) if self.seconds else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(ordered, 50) * 1000, 2),
+                "p95": round(percentile(ordered, 95) * 1000, 2),
+                "p99": round(percentile(ordered, 99) * 1000, 2),
+                "max": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+            },
+            "status_codes": self.status_codes,
+        }
+
+
+RequestFactory = Callable[[AsyncClient, int], Awaitable[httpx.Response]]
+
+
+async def run_scenario(client: AsyncClient, send: RequestFactory, requests: int, concurrency: int) -> ScenarioResult:
+    """Send *requests* requests built by *send* from *concurrency* workers."""
+    result = ScenarioResult()
+    next_index = iter(range(requests))
+
+    async def worker() -> None:
+        for index in next_index:
+            started = time.perf_counter()
+            try:
+                response = await send(client, index)
+                code = str(response.status_code)
+                failed = response.is_error
+            except httpx.HTTPError as exc:
+                code, failed = type(exc).__name__, True
+            result.latencies.append(time.perf_counter() - started)
+            result.status_codes[code] = result.status_codes.get(code, 0) + 1
+            result.requests += 1
+            result.errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+async def _token(client: AsyncClient, role: RoleEnum) -> dict[str, str]:
+    response = await client.post("/api/v1/auth/login", json={"email": _email(role), "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run_scenarios(
+    client: AsyncClient, factory: async_sessionmaker[AsyncSession], requests: int, concurrency: int, rng_seed: int
+) -> dict[str, dict]:
+    rng = random.Random(rng_seed)
+    manager = await _token(client, RoleEnum.FLEET_MANAGER)
+    dispatcher = await _token(client, RoleEnum.DISPATCHER)
+    analyst = await _token(client, RoleEnum.FINANCIAL_ANALYST)
+
+    pairs = await idle_pairs(factory, requests)
+    if len(pairs) < requests:
+        logger.warning("Only %d idle vehicle/driver pairs; dispatch runs %d requests", len(pairs), len(pairs))
+    lookups = await tracking_ids(factory)
+    dispatched: list[str] = []
+    year_ago = (date.today() - timedelta(days=365)).isoformat()
+
+    async def dispatch(c: AsyncClient, i: int) -> httpx.Response:
+        vehicle_id, driver_id = pairs[i]
+        body = {
+            "vehicle_id": vehicle_id,
+            "driver_id": driver_id,
+            "origin": "Ahmedabad",
+            "destination": "Mumbai",
+            "cargo_weight": 100,
+            "distance_km": 500,
+            "revenue": 40000,
+        }
+        response = await c.post("/api/v1/trips/", json=body, headers=dispatcher)
+        if response.status_code == 201:
+            dispatched.append(response.json()["id"])
+        return response
+
+    def complete(c: AsyncClient, i: int) -> Awaitable[httpx.Response]:
+        body = {"status": TripStatus.COMPLETED.value, "odometer_km": 500}
+        return c.patch(f"/api/v1/trips/{dispatched[i]}/status", json=body, headers=dispatcher)
+
+    def get(path: str, headers: dict[str, str], params: dict | None = None) -> RequestFactory:
+        return lambda c, _i: c.get(path, params=params, headers=headers)
+
+    scenarios: list[tuple[str, RequestFactory, Callable[[], int]]] = [
+        (
+            "login",
+            lambda c, _i: c.post(
+                "/api/v1/auth/login", json={"email": _email(RoleEnum.DISPATCHER), "password": PASSWORD}
+            ),
+            lambda: requests,
+        ),
+        ("list_vehicles", get("/api/v1/vehicles/", manager, {"limit": 100}), lambda: requests),
+        ("list_drivers", get("/api/v1/drivers/", manager, {"limit": 100}), lambda: requests),
+        ("list_trips", get("/api/v1/trips/", manager, {"limit": 100}), lambda: requests),
+        ("dispatch", dispatch, lambda: len(pairs)),
+        ("complete", complete, lambda: len(dispatched)),
+        (
+            "tracking_lookup",
+            lambda c, _i: c.get(f"/api/v1/tracking/{rng.choice(lookups)}", headers=manager),
+            lambda: requests if lookups else 0,
+        ),
+        ("analytics_dashboard", get("/api/v1/analytics/dashboard", manager), lambda: requests),
+        ("analytics_roi", get("/api/v1/analytics/roi", analyst), lambda: requests),
+        (
+            "analytics_timeseries",
+            get("/api/v1/analytics/timeseries", analyst, {"bucket": "month", "from": year_ago}),
+            lambda: requests,
+        ),
+        ("analytics_vehicles", get("/api/v1/analytics/vehicles", analyst, {"limit": 20}), lambda: requests),
+    ]
+
+    results = {}
+    for name, send, count in scenarios:
+        result = await run_scenario(client, send, count(), concurrency)
+        summary = results[name] = result.summary()
+        latency = summary["latency_ms"]
+        logger.info(
+            "%-21s %6d req %8.1f req/s  p50 %8.2f  p95 %8.2f  p99 %8.2f ms  %d errors",
+            name,
+            summary["requests"],
+            summary["throughput_rps"],
+            latency["p50"],
+            latency["p95"],
+            latency["p99"],
+            summary["errors"],
+        )
+    return results
+
+
+# --- Reporting -------------------------------------------------------------
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """Log each scenario's p95 and throughput change against *baseline*; return the regressed names."""
+    regressed = []
+    for name, summary in results.items():
+        previous = baseline.get(name)
+        if previous is None or not previous["latency_ms"]["p95"]:
+            continue
+        p95_change = summary["latency_ms"]["p95"] / previous["latency_ms"]["p95"] - 1
+        rps_change = summary["throughput_rps"] / previous["throughput_rps"] - 1 if previous["throughput_rps"] else 0.0
+        flag = ""
+        if p95_change > tolerance:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        logger.info("%-21s p95 %+7.1f%%  throughput %+7.1f%%%s", name, p95_change * 100, rps_change * 100, flag)
+    return regressed
+
+
+async def run(args: argparse.Namespace) -> int:
+    engine = create_async_engine(args.database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    if args.seed:
+        await seed(factory, args.vehicles, args.trips, args.rng_seed)
+    dataset = await dataset_size(factory)
+    if not dataset["vehicles"]:
+        logger.error("The database is empty; run once with --seed")
+        return 2
+
+    if args.base_url:
+        client = AsyncClient(base_url=args.base_url, timeout=60)
+    else:
+
+        async def _bench_db():
+            async with factory() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = _bench_db
+        app.dependency_overrides[get_read_db] = _bench_db
+        app.dependency_overrides[get_read_session_factory] = lambda: factory
+        limiter.enabled = False
+        client = AsyncClient(transport=ASGITransport(app=app), base_url="http://bench", timeout=60)
+
+    started_at = datetime.now(timezone.utc)
+    async with client:
+        results = await run_scenarios(client, factory, args.requests, args.concurrency, args.rng_seed)
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+    report = {
+        "meta": {
+            "started_at": started_at.isoformat(),
+            "app_version": app.version,
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "database": engine.dialect.name,
+            "target": args.base_url or "in-process",
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "dataset": dataset,
+        },
+        "scenarios": results,
+    }
+    output = Path(args.output or f"benchmarks/results/load-{started_at:%Y%m%dT%H%M%SZ}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    logger.info("Results written to %s", output)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())["scenarios"]
+        regressed = compare(results, baseline, args.tolerance)
+        if regressed:
+            logger.error("p95 regressed by more than %.0f%%: %s", args.tolerance * 100, ", ".join(regressed))
+            return 1
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", required=True, help="scratch database; its tables are emptied by --seed")
+    parser.add_argument("--base-url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--seed", action="store_true", help="empty the database and write the dataset first")
+    parser.add_argument(
+        "--yes-wipe-database", action="store_true", help="confirm that --seed may delete every row in --database-url"
+    )
+    parser.add_argument("--vehicles", type=int, default=20_000, help="vehicles, and drivers, to seed")
+    parser.add_argument("--trips", type=int, default=1_000_000, help="completed trips to seed")
+    parser.add_argument("--rng-seed", type=int, default=0)
+    parser.add_argument("--requests", type=int, default=1000, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/load-<timestamp>.json)")
+    parser.add_argument("--baseline", help="earlier result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 increase before failing")
+    args = parser.parse_args()
+    if args.seed and not args.yes_wipe_database:
+        parser.error(f"--seed deletes every row in {args.database_url}; pass --yes-wipe-database to confirm")
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
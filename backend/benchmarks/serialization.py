@@ -0,0 +1,138 @@
+"""Per-row cost of building a trips list response: ORM + response model vs. rows + orjson.
+
+Usage::
+
+    python -m benchmarks.serialization --trips 10000 --repeat 5
+
+Both paths read the same trips from an in-memory SQLite database:
+
+* ``orm+pydantic`` loads ``Trip`` instances, validates them into
+  ``list[TripResponse]`` with ``from_attributes`` and renders with the
+  stdlib encoder, the way FastAPI handles a ``response_model`` route.
+* ``rows+orjson`` selects only the ``TripResponse`` columns and renders the
+  ``Row`` mappings with :class:`~app.core.responses.ORJSONResponse`, as the
+  list endpoints now do.
+
+Fetch and encode are timed separately; the median of ``--repeat`` runs is
+reported per row.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import time
+from datetime import date, datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.core.responses import ORJSONResponse, response_columns  # noqa: E402
+from app.db.base_class import Base  # noqa: E402
+from app.models import driver, expense, maintenance, rollup, token, tracking, trip, user, vehicle  # noqa: E402, F401
+from app.models.driver import Driver, DriverStatus  # noqa: E402
+from app.models.trip import Trip, TripStatus  # noqa: E402
+from app.models.vehicle import Vehicle  # noqa: E402
+from app.schemas.trip import TripResponse  # noqa: E402
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+_ADAPTER = TypeAdapter(list[TripResponse])
+_COLUMNS = response_columns(Trip, TripResponse)
+
+
+async def _seed(factory, count: int) -> None:
+    async with factory() as session:
+        vehicle_row = Vehicle(
+            name="Bench", model="2024", license_plate="BENCH", max_capacity_kg=10000, acquisition_cost=1.0
+        )
+        driver_row = Driver(
+            name="Bench",
+            license_number="BENCH",
+            license_expiry=date.today() + timedelta(days=365),
+            status=DriverStatus.ON_DUTY,
+        )
+        session.add_all([vehicle_row, driver_row])
+        await session.flush()
+        started = datetime.now(timezone.utc)
+        session.add_all(
+            Trip(
+                vehicle_id=vehicle_row.id,
+                driver_id=driver_row.id,
+                origin="Ahmedabad",
+                destination="Mumbai",
+                cargo_weight=500 + i % 5000,
+                distance_km=500.25,
+                revenue=50000.5,
+                status=TripStatus.COMPLETED,
+                start_time=started - timedelta(minutes=i),
+                end_time=started,
+            )
+            for i in range(count)
+        )
+        await session.commit()
+
+
+async def _orm_pydantic(session: AsyncSession) -> tuple[float, float, int]:
+    started = time.perf_counter()
+    trips = (await session.execute(select(Trip))).scalars().all()
+    fetched = time.perf_counter()
+    content = _ADAPTER.dump_python(_ADAPTER.validate_python(trips, from_attributes=True), mode="json")
+    body = json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    return fetched - started, time.perf_counter() - fetched, len(body)
+
+
+async def _rows_orjson(session: AsyncSession) -> tuple[float, float, int]:
+    started = time.perf_counter()
+    rows = (await session.execute(select(*_COLUMNS))).all()
+    fetched = time.perf_counter()
+    body = ORJSONResponse([row._asdict() for row in rows]).body
+    return fetched - started, time.perf_counter() - fetched, len(body)
+
+
+async def _run(count: int, repeat: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    await _seed(factory, count)
+
+    for label, path in (("orm+pydantic", _orm_pydantic), ("rows+orjson", _rows_orjson)):
+        fetch_times, encode_times = [], []
+        for _ in range(repeat):
+            # A fresh session per run so the identity map never short-cuts hydration.
+            async with factory() as session:
+                fetch, encode, size = await path(session)
+            fetch_times.append(fetch)
+            encode_times.append(encode)
+        fetch, encode = statistics.median(fetch_times), statistics.median(encode_times)
+        logger.info(
+            "%-13s %d rows, %d bytes: fetch %.2f us/row, encode %.2f us/row, total %.1f ms",
+            label,
+            count,
+            size,
+            fetch / count * 1e6,
+            encode / count * 1e6,
+            (fetch + encode) * 1000,
+        )
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trips", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(_run(args.trips, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
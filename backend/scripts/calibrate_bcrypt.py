@@ -0,0 +1,89 @@
+"""Measure bcrypt verify time on this host and recommend a BCRYPT_ROUNDS value.
+
+Usage::
+
+    python -m scripts.calibrate_bcrypt --target-ms 250 --workers 2
+
+The recommendation is the highest cost whose median verify time fits the
+target latency budget; if not even ``--min-rounds`` fits, the script exits
+with status 1 instead of recommending it.  The printed throughput is what a
+password pool of ``--workers`` threads can sustain at each cost, which
+bounds login bursts.
+Changing ``BCRYPT_ROUNDS`` is safe at any time: existing hashes keep
+verifying and are rehashed on the user's next successful login.
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+
+import bcrypt
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+
+def measure_verify_seconds(rounds: int, samples: int) -> float:
+    """Return the median ``bcrypt.checkpw`` time for a hash of cost *rounds*."""
+    password = b"calibration-password"
+    hashed = bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        bcrypt.checkpw(password, hashed)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, min_rounds: int, max_rounds: int, samples: int, workers: int) -> int | None:
+    """Print a cost table and return the recommended cost factor.
+
+    Returns ``None`` when even *min_rounds* is over the latency target.
+    """
+    recommended = None
+    logger.info("%6s %12s %16s", "rounds", "verify (ms)", "logins/s/worker")
+    for rounds in range(min_rounds, max_rounds + 1):
+        seconds = measure_verify_seconds(rounds, samples)
+        logger.info("%6d %12.1f %16.1f", rounds, seconds * 1000, 1 / seconds)
+        if seconds * 1000 <= target_ms:
+            recommended = rounds
+        else:
+            break  # each step doubles the cost; nothing higher can fit
+
+    if recommended is None:
+        logger.error(
+            "\nNo cost from %d to %d fits %.0f ms per verify on this host; "
+            "raise --target-ms, lower --min-rounds or provision faster CPUs.",
+            min_rounds,
+            max_rounds,
+            target_ms,
+        )
+        return None
+
+    seconds = measure_verify_seconds(recommended, samples)
+    logger.info(
+        "\nRecommended BCRYPT_ROUNDS=%d (~%.0f ms per verify, ~%.0f logins/s with %d worker(s)).",
+        recommended,
+        seconds * 1000,
+        workers / seconds,
+        workers,
+    )
+    return recommended
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=250.0, help="latency budget for one verify")
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=15)
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=2, help="PASSWORD_HASH_WORKERS planned for production")
+    args = parser.parse_args()
+    if calibrate(args.target_ms, args.min_rounds, args.max_rounds, args.samples, args.workers) is None:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
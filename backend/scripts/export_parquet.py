@@ -0,0 +1,54 @@
+"""Export trips, expenses, maintenance logs and vehicles to month-partitioned Parquet.
+
+Usage::
+
+    python -m scripts.export_parquet                      # incremental, from each table's watermark
+    python -m scripts.export_parquet --since 2024-01-01   # rewrite from January 2024 onwards
+    python -m scripts.export_parquet --full --output /data/fleetflow
+
+Requires the ``analytics`` extra (``pip install -e ".[analytics]"``).  Reads
+go to the replica when ``READ_DATABASE_URL`` is set.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import date
+from pathlib import Path
+
+from app.core.config import settings
+from app.db.session import read_session_factory
+from app.services.parquet_export_service import ParquetExportService
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+
+async def export_parquet(output: Path, since: date | None, full: bool) -> None:
+    summary = await ParquetExportService.export(read_session_factory, output, since=since, full=full)
+    for dataset, partitions in summary.items():
+        logger.info(
+            "%-17s %8d rows in %d partition(s) %s",
+            dataset,
+            sum(partitions.values()),
+            len(partitions),
+            ", ".join(sorted(partitions)),
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, default=Path(settings.PARQUET_EXPORT_DIR))
+    parser.add_argument("--since", type=date.fromisoformat, help="rewrite monthly partitions from this date's month")
+    parser.add_argument("--full", action="store_true", help="rewrite every partition")
+    args = parser.parse_args()
+
+    if not ParquetExportService.available():
+        logger.error("pyarrow is not installed; install the 'analytics' extra.")
+        sys.exit(1)
+    asyncio.run(export_parquet(args.output, args.since, args.full))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""Rebuild analytics rollups and the tracking read model from the source tables (backfill / drift repair)."""
+
+import asyncio
+import logging
+
+from app.db.session import async_session_factory
+from app.services.rollup_service import RollupService
+from app.services.tracking_service import TrackingService
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+async def rebuild_rollups() -> None:
+    async with async_session_factory() as db:
+        vehicle_rows, daily_rows = await RollupService.rebuild(db)
+        logger.info("Rollups rebuilt: %d vehicle rows, %d daily rows.", vehicle_rows, daily_rows)
+        tracking_rows = await TrackingService.rebuild(db)
+        logger.info("Tracking views rebuilt: %d rows.", tracking_rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_rollups())
@@ -14,6 +14,8 @@ from app.models.maintenance import MaintenanceLog, MaintenanceStatus, Maintenanc
 from app.models.trip import Trip, TripStatus
 from app.models.user import Role, RoleEnum, User
 from app.models.vehicle import Vehicle, VehicleStatus
+from app.services.rollup_service import RollupService
+from app.services.tracking_service import TrackingService
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -286,6 +288,8 @@ async def seed_data() -> None:
         db.add_all(expenses)
 
         await db.commit()
+        await RollupService.rebuild(db)
+        await TrackingService.rebuild(db)
         logger.info("Database successfully seeded with Indian-context data.")
 
 
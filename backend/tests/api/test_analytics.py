@@ -1,8 +1,18 @@
 """Test the analytics endpoints."""
 
+from datetime import date, datetime, timezone
+
 import pytest
 from httpx import AsyncClient
 
+from app.models.driver import Driver, DriverStatus
+from app.models.rollup import VehicleRollup
+from app.models.trip import Trip, TripStatus
+from app.models.user import RoleEnum
+from app.models.vehicle import Vehicle, VehicleStatus
+from app.services.rollup_service import RollupService
+from tests.factories import seed_fleet
+
 
 @pytest.mark.asyncio
 async def test_analytics_dashboard_unauthorized(client: AsyncClient):
@@ -13,3 +23,272 @@ async def test_analytics_dashboard_unauthorized(client: AsyncClient):
 
 # Note: Further tests require authenticated user mocks depending on how the
 # dependencies are overridden in conftest.py
+
+
+async def test_roi_is_a_single_round_trip(db_client: AsyncClient, session_factory, query_counter, auth_headers):
+    await seed_fleet(session_factory, size=4)
+    async with session_factory() as session:
+        await RollupService.rebuild(session)
+    headers = await auth_headers(RoleEnum.FINANCIAL_ANALYST)
+    query_counter.active = True
+
+    response = await db_client.get("/api/v1/analytics/roi", headers=headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["totalRevenue"] == 200000.0
+    assert body["totalFuelCost"] == 18400.0
+    assert body["totalMaintenanceCost"] == 4000.0
+    assert body["costPerKm"] == round(22400.0 / 2000.0, 2)
+    assert body["fuelEfficiencyKmPerL"] == 10.0
+    # One statement for the principal, one for the report.
+    assert query_counter.count <= 2, query_counter.statements
+
+
+async def test_dashboard_counts_in_one_query(db_client: AsyncClient, session_factory, query_counter, auth_headers):
+    await seed_fleet(session_factory, size=3)
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+    query_counter.active = True
+
+    response = await db_client.get("/api/v1/analytics/dashboard", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json() == {"activeFleet": 3, "maintenanceAlerts": 0, "utilizationRate": 1.0, "totalFleet": 3}
+    assert query_counter.count <= 2, query_counter.statements
+
+
+async def test_time_series_month_bucket_is_one_statement(
+    db_client: AsyncClient, session_factory, query_counter, auth_headers
+):
+    await seed_fleet(session_factory, size=4)
+    async with session_factory() as session:
+        await RollupService.rebuild(session)
+    headers = await auth_headers(RoleEnum.FINANCIAL_ANALYST)
+    today = datetime.now(timezone.utc).date()
+    month_start = today.replace(day=1)
+    query_counter.active = True
+
+    response = await db_client.get(
+        "/api/v1/analytics/timeseries",
+        params={"bucket": "month", "from": month_start.isoformat(), "to": today.isoformat()},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    [point] = response.json()["series"]
+    assert point["bucketStart"] == month_start.isoformat()
+    assert (point["tripCount"], point["revenue"], point["fuelCost"], point["maintenanceCost"]) == (
+        4,
+        200000.0,
+        18400.0,
+        4000.0,
+    )
+    assert point["costPerKm"] == round(22400.0 / 2000.0, 2)
+    assert point["fuelEfficiencyKmPerL"] == 10.0
+    # Four vehicles each active on one of the days elapsed this month.
+    assert point["utilizationRate"] == round(4 / (4 * today.day), 2)
+    assert query_counter.count <= 2, query_counter.statements
+
+
+async def test_time_series_weeks_start_on_monday_and_fill_gaps(db_client: AsyncClient, session_factory, auth_headers):
+    async with session_factory() as session:
+        vehicle = Vehicle(name="Van", model="2024", license_plate="WK1", max_capacity_kg=10, acquisition_cost=1)
+        driver = Driver(name="D", license_number="WK1", license_expiry=date(2030, 1, 1))
+        session.add_all([vehicle, driver])
+        await session.flush()
+        for start in (datetime(2024, 5, 12, 23, 30), datetime(2024, 5, 13, 0, 30)):  # Sunday, then Monday
+            session.add(
+                Trip(
+                    vehicle_id=vehicle.id,
+                    driver_id=driver.id,
+                    origin="A",
+                    destination="B",
+                    cargo_weight=1,
+                    revenue=100.0,
+                    status=TripStatus.COMPLETED,
+                    start_time=start.replace(tzinfo=timezone.utc),
+                )
+            )
+        await session.commit()
+        await RollupService.rebuild(session)
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+
+    response = await db_client.get(
+        "/api/v1/analytics/timeseries",
+        params={"bucket": "week", "from": "2024-05-01", "to": "2024-05-31", "vehicle_id": vehicle.id},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    series = response.json()["series"]
+    assert [p["bucketStart"] for p in series] == ["2024-04-29", "2024-05-06", "2024-05-13", "2024-05-20", "2024-05-27"]
+    assert [p["tripCount"] for p in series] == [0, 1, 1, 0, 0]
+    # One active vehicle-day out of a full seven-day week.
+    assert series[1]["utilizationRate"] == round(1 / 7, 2)
+
+
+async def test_time_series_per_vehicle(db_client: AsyncClient, session_factory, auth_headers):
+    await seed_fleet(session_factory, size=3)
+    async with session_factory() as session:
+        await RollupService.rebuild(session)
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+
+    response = await db_client.get("/api/v1/analytics/timeseries", params={"per_vehicle": True}, headers=headers)
+
+    assert response.status_code == 200
+    series = response.json()["series"]
+    assert len({point["vehicleId"] for point in series}) == 3
+    assert all(point["utilizationRate"] == 1.0 and point["revenue"] == 50000.0 for point in series)
+
+
+async def test_time_series_rejects_inverted_range(db_client: AsyncClient, auth_headers):
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+
+    response = await db_client.get(
+        "/api/v1/analytics/timeseries", params={"from": "2024-02-01", "to": "2024-01-01"}, headers=headers
+    )
+
+    assert response.status_code == 400
+
+
+async def _seed_ranked_fleet(session_factory) -> dict[str, str]:
+    """Four vehicles with hand-written rollups; returns vehicle ids by name."""
+    totals = {
+        # name: (revenue, distance_km, fuel_liters, fuel_cost, maintenance_cost)
+        "Loss": (1000, 100, 10, 900, 600),
+        "Flat": (1200, 100, 20, 1000, 300),
+        "Star": (9000, 1000, 50, 2000, 1000),
+        "Idle": None,
+    }
+    ids = {}
+    async with session_factory() as session:
+        for i, (name, rollup) in enumerate(totals.items()):
+            vehicle = Vehicle(
+                name=name, model="2024", license_plate=f"RK{i}", max_capacity_kg=10, acquisition_cost=10000
+            )
+            session.add(vehicle)
+            await session.flush()
+            ids[name] = vehicle.id
+            if rollup is not None:
+                revenue, distance, liters, fuel_cost, maintenance_cost = rollup
+                session.add(
+                    VehicleRollup(
+                        vehicle_id=vehicle.id,
+                        trip_count=1,
+                        revenue=revenue,
+                        distance_km=distance,
+                        fuel_liters=liters,
+                        fuel_cost=fuel_cost,
+                        maintenance_cost=maintenance_cost,
+                    )
+                )
+        session.add(
+            Vehicle(
+                name="Gone",
+                model="2024",
+                license_plate="RK9",
+                max_capacity_kg=10,
+                acquisition_cost=1,
+                status=VehicleStatus.RETIRED,
+            )
+        )
+        await session.commit()
+    return ids
+
+
+async def test_vehicle_ranking_worst_roi_first_in_one_statement(
+    db_client: AsyncClient, session_factory, query_counter, auth_headers
+):
+    ids = await _seed_ranked_fleet(session_factory)
+    headers = await auth_headers(RoleEnum.FINANCIAL_ANALYST)
+    query_counter.active = True
+
+    response = await db_client.get("/api/v1/analytics/vehicles", params={"limit": 2}, headers=headers)
+
+    assert response.status_code == 200
+    loss, flat = response.json()
+    assert loss["vehicleId"] == ids["Loss"]
+    assert (loss["netProfit"], loss["roiPercentage"], loss["costPerKm"], loss["fuelEfficiencyKmPerL"]) == (
+        -500.0,
+        -5.0,
+        15.0,
+        10.0,
+    )
+    assert (flat["vehicleId"], flat["roiPercentage"]) == (ids["Flat"], -1.0)
+    assert query_counter.count <= 2, query_counter.statements
+
+
+async def test_vehicle_ranking_sorts_descending_with_undefined_ratios_last(
+    db_client: AsyncClient, session_factory, auth_headers
+):
+    ids = await _seed_ranked_fleet(session_factory)
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+
+    response = await db_client.get(
+        "/api/v1/analytics/vehicles", params={"sort": "cost_per_km", "order": "desc"}, headers=headers
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [row["vehicleId"] for row in body] == [ids["Loss"], ids["Flat"], ids["Star"], ids["Idle"]]
+    assert body[-1]["costPerKm"] is None and body[-1]["revenue"] == 0.0
+
+
+async def test_vehicle_ranking_can_include_retired(db_client: AsyncClient, session_factory, auth_headers):
+    await _seed_ranked_fleet(session_factory)
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+
+    response = await db_client.get(
+        "/api/v1/analytics/vehicles", params={"include_retired": True, "sort": "revenue"}, headers=headers
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+
+
+async def test_vehicle_ranking_rejects_unknown_sort(db_client: AsyncClient, auth_headers):
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+
+    response = await db_client.get("/api/v1/analytics/vehicles", params={"sort": "name"}, headers=headers)
+
+    assert response.status_code == 422
+
+
+async def test_time_series_caps_the_number_of_buckets(db_client: AsyncClient, auth_headers):
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+    url = "/api/v1/analytics/timeseries"
+
+    too_many = await db_client.get(url, params={"from": "2020-01-01", "to": "2024-01-01"}, headers=headers)
+    coarser = await db_client.get(
+        url, params={"from": "2020-01-01", "to": "2024-01-01", "bucket": "month"}, headers=headers
+    )
+
+    assert too_many.status_code == 400
+    assert "400 day buckets" in too_many.json()["detail"]
+    assert coarser.status_code == 200
+    assert len(coarser.json()["series"]) <= 49
+
+
+async def test_time_series_follows_writes_without_a_rebuild(db_client: AsyncClient, session_factory, auth_headers):
+    async with session_factory() as session:
+        vehicle = Vehicle(name="Van", model="2024", license_plate="TS1", max_capacity_kg=10, acquisition_cost=1)
+        driver = Driver(name="D", license_number="TS1", license_expiry=date(2030, 1, 1), status=DriverStatus.ON_DUTY)
+        session.add_all([vehicle, driver])
+        await session.commit()
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+    dispatched = await db_client.post(
+        "/api/v1/trips/",
+        json={
+            "vehicle_id": vehicle.id, "driver_id": driver.id, "origin": "A", "destination": "B",
+            "cargo_weight": 1, "distance_km": 100.0, "revenue": 700.0,
+        },
+        headers=headers,
+    )
+    assert dispatched.status_code == 201, dispatched.text
+
+    response = await db_client.get("/api/v1/analytics/timeseries", params={"vehicle_id": vehicle.id}, headers=headers)
+
+    assert response.status_code == 200
+    today = response.json()["series"][-1]
+    assert (today["tripCount"], today["revenue"], today["distanceKm"]) == (1, 700.0, 100.0)
+    assert today["utilizationRate"] == 1.0
@@ -0,0 +1,119 @@
+"""Refresh-token rotation, logout and revocation."""
+
+import bcrypt
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.user import Role, RoleEnum, User
+from app.services.token_revocation import denylist
+
+EMAIL = "dispatcher@fleetflow.com"
+PASSWORD = "dispatch123"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_auth_state(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    denylist.clear()
+    yield
+    denylist.clear()
+
+
+async def _login(db_client: AsyncClient, session_factory) -> dict:
+    async with session_factory() as session:
+        session.add_all([Role(name=RoleEnum.DISPATCHER), Role(name=RoleEnum.FLEET_MANAGER)])
+        await session.flush()
+        dispatcher = (await session.execute(select(Role).where(Role.name == RoleEnum.DISPATCHER))).scalar_one()
+        hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=4)).decode()
+        session.add(User(email=EMAIL, password_hash=hashed, role_id=dispatcher.id))
+        await session.commit()
+    response = await db_client.post("/api/v1/auth/login", json={"email": EMAIL, "password": PASSWORD})
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_refresh_rotates_the_refresh_token(db_client: AsyncClient, session_factory):
+    tokens = await _login(db_client, session_factory)
+
+    refreshed = await db_client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["role"] == RoleEnum.DISPATCHER.value
+
+    replayed = await db_client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert replayed.status_code == 401
+
+
+async def test_access_token_is_not_a_refresh_token(db_client: AsyncClient, session_factory):
+    tokens = await _login(db_client, session_factory)
+
+    response = await db_client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["access_token"]})
+
+    assert response.status_code == 401
+
+
+async def test_logout_revokes_access_and_refresh_tokens(db_client: AsyncClient, session_factory, query_counter):
+    tokens = await _login(db_client, session_factory)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    query_counter.active = True
+    assert (await db_client.get("/api/v1/trips/", headers=headers)).status_code == 200
+    assert not any("users" in s for s in query_counter.statements)
+
+    logout = await db_client.post(
+        "/api/v1/auth/logout", headers=headers, json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert logout.status_code == 204
+    assert (await db_client.get("/api/v1/tracking/my-shipments", headers=headers)).status_code == 401
+    assert (
+        await db_client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    ).status_code == 401
+
+
+async def test_role_change_revokes_existing_tokens(db_client: AsyncClient, session_factory):
+    tokens = await _login(db_client, session_factory)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    async with session_factory() as session:
+        manager = (await session.execute(select(Role).where(Role.name == RoleEnum.FLEET_MANAGER))).scalar_one()
+        user = (await session.execute(select(User).where(User.email == EMAIL))).scalar_one()
+        user.role_id = manager.id
+        await session.commit()
+
+    assert (await db_client.get("/api/v1/tracking/my-shipments", headers=headers)).status_code == 401
+
+    # Another worker learns about the revocation from the table.
+    denylist.clear()
+    async with session_factory() as session:
+        assert await denylist.sync(session) == 1
+    assert (await db_client.get("/api/v1/tracking/my-shipments", headers=headers)).status_code == 401
+
+
+async def test_refresh_replayed_on_another_worker_is_rejected(db_client: AsyncClient, session_factory):
+    tokens = await _login(db_client, session_factory)
+    assert (
+        await db_client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    ).status_code == 200
+
+    # A worker that has not synced yet lets the token past its denylist; the jti row stops it.
+    denylist.clear()
+    replayed = await db_client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+    assert replayed.status_code == 401
+    assert replayed.json()["detail"] == "Refresh token already used"
+
+
+async def test_rolled_back_role_change_revokes_nothing(db_client: AsyncClient, session_factory):
+    tokens = await _login(db_client, session_factory)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    async with session_factory() as session:
+        manager = (await session.execute(select(Role).where(Role.name == RoleEnum.FLEET_MANAGER))).scalar_one()
+        user = (await session.execute(select(User).where(User.email == EMAIL))).scalar_one()
+        user.role_id = manager.id
+        await session.flush()
+        await session.rollback()
+
+    assert len(denylist) == 0
+    assert (await db_client.get("/api/v1/tracking/my-shipments", headers=headers)).status_code == 200
@@ -0,0 +1,113 @@
+"""Bulk trip dispatch: per-item results and set-based SQL."""
+
+from datetime import date, timedelta
+
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from app.models.driver import Driver, DriverStatus
+from app.models.rollup import VehicleRollup
+from app.models.tracking import TrackingView
+from app.models.user import RoleEnum
+from app.models.vehicle import Vehicle, VehicleStatus
+
+
+async def _seed(session_factory, count: int, prefix: str = "") -> tuple[list[str], list[str]]:
+    async with session_factory() as session:
+        vehicles = [
+            Vehicle(
+                name=f"Truck {i}",
+                model="2024",
+                license_plate=f"GJ01{prefix}{i:04d}",
+                max_capacity_kg=1000,
+                acquisition_cost=1.0,
+            )
+            for i in range(count)
+        ]
+        drivers = [
+            Driver(
+                name=f"Driver {i}",
+                license_number=f"LIC-{prefix}{i:04d}",
+                license_expiry=date.today() + timedelta(days=30),
+                status=DriverStatus.ON_DUTY,
+            )
+            for i in range(count)
+        ]
+        session.add_all(vehicles + drivers)
+        await session.commit()
+    return [v.id for v in vehicles], [d.id for d in drivers]
+
+
+def _item(vehicle_id: str, driver_id: str, cargo_weight: int = 100) -> dict:
+    return {
+        "vehicle_id": vehicle_id,
+        "driver_id": driver_id,
+        "origin": "Ahmedabad",
+        "destination": "Mumbai",
+        "cargo_weight": cargo_weight,
+        "revenue": 1000.0,
+    }
+
+
+async def test_bulk_dispatch_reports_each_item(db_client: AsyncClient, session_factory, auth_headers):
+    vehicles, drivers = await _seed(session_factory, 3)
+    headers = await auth_headers(RoleEnum.DISPATCHER)
+    batch = [
+        _item(vehicles[0], drivers[0]),
+        _item(vehicles[0], drivers[1]),  # vehicle already claimed by item 0
+        _item(vehicles[1], "missing"),
+        _item(vehicles[2], drivers[2], cargo_weight=5000),
+        _item(vehicles[1], drivers[1]),
+    ]
+
+    response = await db_client.post("/api/v1/trips/bulk", json={"trips": batch}, headers=headers)
+
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["index"] for r in results] == [0, 1, 2, 3, 4]
+    assert [r["error"] for r in results] == [
+        None,
+        "Vehicle is not available (current: On Trip)",
+        "Driver not found",
+        "Cargo exceeds vehicle capacity",
+        None,
+    ]
+    assert results[0]["trip"]["status"] == "Dispatched"
+    assert results[0]["trip"]["tracking_id"].startswith("TRK-")
+
+    async with session_factory() as session:
+        statuses = dict((await session.execute(select(Vehicle.id, Vehicle.status))).all())
+        assert statuses == {
+            vehicles[0]: VehicleStatus.ON_TRIP,
+            vehicles[1]: VehicleStatus.ON_TRIP,
+            vehicles[2]: VehicleStatus.AVAILABLE,
+        }
+        assert await session.scalar(select(func.sum(VehicleRollup.trip_count))) == 2
+        assert await session.scalar(select(func.count()).select_from(TrackingView)) == 2
+
+
+async def test_bulk_dispatch_statement_count_is_independent_of_batch_size(
+    db_client: AsyncClient, session_factory, query_counter, auth_headers
+):
+    headers = await auth_headers(RoleEnum.DISPATCHER)
+    counts = []
+    for size in (2, 25):
+        vehicles, drivers = await _seed(session_factory, size, prefix=f"B{size}")
+        query_counter.reset()
+        query_counter.active = True
+        response = await db_client.post(
+            "/api/v1/trips/bulk", json={"trips": [_item(v, d) for v, d in zip(vehicles, drivers)]}, headers=headers
+        )
+        query_counter.active = False
+        assert response.status_code == 200
+        assert all(r["error"] is None for r in response.json())
+        counts.append(query_counter.count)
+    assert counts[0] == counts[1], counts
+
+
+async def test_bulk_dispatch_rejects_empty_batch(db_client: AsyncClient, auth_headers):
+    headers = await auth_headers(RoleEnum.DISPATCHER)
+
+    response = await db_client.post("/api/v1/trips/bulk", json={"trips": []}, headers=headers)
+
+    assert response.status_code == 422
@@ -0,0 +1,74 @@
+"""Streaming CSV / NDJSON exports."""
+
+import csv
+import io
+import json
+from datetime import date, timedelta
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.models.user import RoleEnum
+from app.schemas.expense import ExpenseResponse
+from app.schemas.maintenance import MaintenanceLogResponse
+from app.schemas.trip import TripResponse
+from tests.factories import seed_fleet
+
+
+@pytest.fixture(autouse=True)
+def _small_batches(monkeypatch):
+    # Several cursor batches per export, so chunk boundaries are exercised.
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+
+
+async def test_trip_export_streams_ndjson(db_client: AsyncClient, session_factory, auth_headers):
+    await seed_fleet(session_factory, size=5)
+    headers = await auth_headers(RoleEnum.FINANCIAL_ANALYST)
+
+    response = await db_client.get("/api/v1/trips/export", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="trips.ndjson"'
+    trips = [json.loads(line) for line in response.text.splitlines()]
+    assert len(trips) == 5
+    assert all(sorted(trip) == sorted(TripResponse.model_fields) for trip in trips)
+    assert [trip["start_time"] for trip in trips] == sorted(trip["start_time"] for trip in trips)
+
+
+async def test_expense_export_csv_has_header_and_rows(db_client: AsyncClient, session_factory, auth_headers):
+    await seed_fleet(session_factory, size=3)
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+
+    response = await db_client.get("/api/v1/expenses/export", params={"format": "csv"}, headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 3
+    assert list(rows[0]) == list(ExpenseResponse.model_fields)
+    assert {row["date"] for row in rows} == {date.today().isoformat()}
+    assert {float(row["fuel_cost"]) for row in rows} == {4600.0}
+
+
+async def test_export_applies_date_range(db_client: AsyncClient, session_factory, auth_headers):
+    await seed_fleet(session_factory, size=2)
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+
+    empty = await db_client.get(
+        "/api/v1/maintenance/export", params={"format": "csv", "date_from": tomorrow}, headers=headers
+    )
+    trips = await db_client.get("/api/v1/trips/export", params={"date_to": tomorrow}, headers=headers)
+
+    assert empty.text.splitlines() == [",".join(MaintenanceLogResponse.model_fields)]
+    assert len(trips.text.splitlines()) == 2
+
+
+async def test_export_requires_finance_role(db_client: AsyncClient, auth_headers):
+    headers = await auth_headers(RoleEnum.DISPATCHER)
+
+    response = await db_client.get("/api/v1/expenses/export", headers=headers)
+
+    assert response.status_code == 403
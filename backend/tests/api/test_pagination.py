@@ -0,0 +1,84 @@
+"""Keyset pagination on the list endpoints."""
+
+from datetime import date, datetime, timedelta, timezone
+
+from httpx import AsyncClient
+
+from app.models.driver import Driver
+from app.models.trip import Trip, TripStatus
+from app.models.vehicle import Vehicle, VehicleStatus
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+
+async def _seed_trips(session_factory, count: int) -> None:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    async with session_factory() as session:
+        vehicle = Vehicle(
+            name="Truck", model="2024", license_plate="GJ01AB0001", max_capacity_kg=10000, acquisition_cost=1.0
+        )
+        driver = Driver(name="Driver", license_number="LIC-1", license_expiry=date(2030, 1, 1))
+        session.add_all([vehicle, driver])
+        await session.flush()
+        for i in range(count):
+            session.add(
+                Trip(
+                    vehicle_id=vehicle.id,
+                    driver_id=driver.id,
+                    origin="A",
+                    destination="B",
+                    cargo_weight=1,
+                    status=TripStatus.COMPLETED if i % 2 else TripStatus.DISPATCHED,
+                    # Pairs of trips share a start time to exercise the id tie-breaker.
+                    start_time=start + timedelta(hours=i // 2),
+                )
+            )
+        await session.commit()
+
+
+async def test_trips_pages_cover_every_row_once(db_client: AsyncClient, session_factory):
+    await _seed_trips(session_factory, 11)
+
+    seen: list[dict] = []
+    cursor = None
+    for _ in range(10):
+        params = {"limit": 4} | ({"cursor": cursor} if cursor else {})
+        response = await db_client.get("/api/v1/trips/", params=params)
+        assert response.status_code == 200
+        seen.extend(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+
+    assert len(seen) == 11
+    assert len({t["id"] for t in seen}) == 11
+    start_times = [t["start_time"] for t in seen]
+    assert start_times == sorted(start_times, reverse=True)
+
+
+async def test_trips_filter_by_status(db_client: AsyncClient, session_factory):
+    await _seed_trips(session_factory, 6)
+
+    response = await db_client.get("/api/v1/trips/", params={"status": "Completed"})
+
+    assert response.status_code == 200
+    assert {t["status"] for t in response.json()} == {"Completed"}
+    assert len(response.json()) == 3
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+async def test_vehicles_limit_is_capped(db_client: AsyncClient, session_factory):
+    async with session_factory() as session:
+        session.add(
+            Vehicle(
+                name="Truck",
+                model="2024",
+                license_plate="GJ01AB0001",
+                max_capacity_kg=10000,
+                acquisition_cost=1.0,
+                status=VehicleStatus.AVAILABLE,
+            )
+        )
+        await session.commit()
+
+    assert (await db_client.get("/api/v1/vehicles/", params={"limit": 100000})).status_code == 422
+    assert (await db_client.get("/api/v1/vehicles/", params={"cursor": "not-a-cursor"})).status_code == 400
@@ -0,0 +1,50 @@
+"""Principal caching in the auth dependencies."""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.user import RoleEnum, User
+from app.services.principal_cache import principal_cache
+
+
+@pytest.fixture(autouse=True)
+def _resolve_principals_from_db(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_TRUST_ROLE_CLAIM", False)
+
+
+async def test_repeat_requests_skip_the_users_table(db_client: AsyncClient, auth_headers, query_counter):
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+    await db_client.get("/api/v1/expenses/", headers=headers)
+
+    query_counter.active = True
+    response = await db_client.get("/api/v1/expenses/", headers=headers)
+
+    assert response.status_code == 200
+    assert not any("FROM users" in s for s in query_counter.statements), query_counter.statements
+
+
+async def test_user_update_invalidates_cached_principal(db_client: AsyncClient, auth_headers, session_factory):
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+    await db_client.get("/api/v1/expenses/", headers=headers)
+    assert len(principal_cache) > 0
+
+    async with session_factory() as session:
+        user = (await session.execute(select(User))).scalar_one()
+        user.email = "renamed@fleetflow.test"
+        await session.commit()
+
+    assert principal_cache.get(user.id) is None
+
+
+async def test_trusted_role_claim_needs_no_lookup(db_client: AsyncClient, auth_headers, query_counter, monkeypatch):
+    headers = await auth_headers(RoleEnum.DISPATCHER)
+    principal_cache.clear()
+    monkeypatch.setattr(settings, "AUTH_TRUST_ROLE_CLAIM", True)
+
+    query_counter.active = True
+    forbidden = await db_client.get("/api/v1/expenses/", headers=headers)
+
+    assert forbidden.status_code == 403
+    assert query_counter.count == 0
@@ -0,0 +1,76 @@
+"""SQL fan-out budgets per endpoint.
+
+Each test seeds a small graph (vehicles with trips, expenses and maintenance
+logs) and asserts how many statements an endpoint may issue.  A relationship
+that silently starts eager-loading again shows up here as a budget overrun.
+"""
+
+import pytest
+from httpx import AsyncClient
+
+from app.models.user import RoleEnum
+from tests.factories import seed_fleet
+
+
+@pytest.mark.parametrize(
+    ("path", "budget"),
+    [
+        ("/api/v1/vehicles/", 1),
+        ("/api/v1/drivers/", 1),
+        ("/api/v1/trips/", 1),
+    ],
+)
+async def test_public_list_endpoints_do_not_fan_out(
+    db_client: AsyncClient, session_factory, query_counter, path, budget
+):
+    await seed_fleet(session_factory)
+    query_counter.active = True
+
+    response = await db_client.get(path)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+    assert query_counter.count <= budget, query_counter.statements
+
+
+@pytest.mark.parametrize(
+    ("path", "budget"),
+    [
+        ("/api/v1/expenses/", 2),
+        ("/api/v1/maintenance/", 2),
+        ("/api/v1/analytics/active-trips", 2),
+    ],
+)
+async def test_authenticated_list_endpoints_do_not_fan_out(
+    db_client: AsyncClient, session_factory, query_counter, auth_headers, path, budget
+):
+    await seed_fleet(session_factory)
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+    query_counter.active = True
+
+    response = await db_client.get(path, headers=headers)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+    assert query_counter.count <= budget, query_counter.statements
+
+
+async def test_writes_answer_from_the_flushed_row(db_client: AsyncClient, query_counter, auth_headers):
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+    query_counter.active = True
+
+    created = await db_client.post(
+        "/api/v1/vehicles/",
+        json={"name": "Van", "model": "2024", "license_plate": "GJ01", "max_capacity_kg": 10, "acquisition_cost": 1},
+        headers=headers,
+    )
+    assert created.status_code == 201
+    # The INSERT alone; no re-SELECT of the row after commit.
+    assert query_counter.count == 1, query_counter.statements
+
+    query_counter.reset()
+    url = f"/api/v1/vehicles/{created.json()['id']}"
+    updated = await db_client.patch(url, json={"odometer_km": 5, "version": 1}, headers=headers)
+    assert updated.status_code == 200
+    assert updated.json()["version"] == 2
+    assert query_counter.count == 2, query_counter.statements
@@ -0,0 +1,95 @@
+"""Per-user, per-role rate limits on expensive endpoints."""
+
+import bcrypt
+from httpx import AsyncClient
+from starlette.requests import Request
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from app.core.config import settings
+from app.core.rate_limit import ANONYMOUS, analytics_limit, rate_limit_key
+from app.core.security import create_access_token
+from app.models.user import Role, RoleEnum, User
+
+PASSWORD = "dispatch123"
+
+
+async def test_analytics_budget_follows_the_role(db_client: AsyncClient, auth_headers, monkeypatch):
+    monkeypatch.setitem(settings.RATE_LIMIT_ANALYTICS, RoleEnum.FLEET_MANAGER.value, "2/minute")
+    monkeypatch.setitem(settings.RATE_LIMIT_ANALYTICS, RoleEnum.FINANCIAL_ANALYST.value, "3/minute")
+    manager = await auth_headers(RoleEnum.FLEET_MANAGER)
+    analyst = await auth_headers(RoleEnum.FINANCIAL_ANALYST)
+
+    manager_codes = [(await db_client.get("/api/v1/analytics/roi", headers=manager)).status_code for _ in range(3)]
+    analyst_codes = [(await db_client.get("/api/v1/analytics/roi", headers=analyst)).status_code for _ in range(3)]
+
+    assert manager_codes == [200, 200, 429]
+    # Counted per user, so the manager's exhausted budget does not affect the analyst.
+    assert analyst_codes == [200, 200, 200]
+
+
+async def test_dispatch_traffic_is_not_throttled(db_client: AsyncClient, auth_headers, monkeypatch):
+    monkeypatch.setitem(settings.RATE_LIMIT_ANALYTICS, "default", "1/minute")
+    headers = await auth_headers(RoleEnum.DISPATCHER)
+
+    codes = {(await db_client.get("/api/v1/trips/", headers=headers)).status_code for _ in range(5)}
+
+    assert codes == {200}
+
+
+def _request(authorization: str) -> Request:
+    return Request({"type": "http", "headers": [(b"authorization", authorization.encode())], "client": ("10.0.0.1", 0)})
+
+
+def test_key_uses_verified_token_subject_and_role():
+    token = create_access_token(subject="user-1", role=RoleEnum.DISPATCHER.value)
+
+    assert rate_limit_key(_request(f"Bearer {token}")) == "Dispatcher|user-1"
+    # A token that does not verify cannot choose its bucket.
+    assert rate_limit_key(_request(f"Bearer {token}x")) == f"{ANONYMOUS}|10.0.0.1"
+    assert analytics_limit(f"{ANONYMOUS}|10.0.0.1") == settings.RATE_LIMIT_ANALYTICS["default"]
+
+
+async def _create_users(session_factory, emails: list[str]) -> None:
+    async with session_factory() as session:
+        role = Role(name=RoleEnum.DISPATCHER)
+        session.add(role)
+        await session.flush()
+        hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=4)).decode()
+        session.add_all(User(email=email, password_hash=hashed, role_id=role.id) for email in emails)
+        await session.commit()
+
+
+async def test_logins_through_one_load_balancer_are_counted_per_account(
+    db_client: AsyncClient, session_factory, monkeypatch
+):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    emails = [f"driver{i}@fleetflow.com" for i in range(6)]
+    await _create_users(session_factory, emails)
+
+    # Every request arrives from the test client's single address, like the load balancer's.
+    codes = [
+        (await db_client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})).status_code
+        for email in emails
+    ]
+    retries = [
+        (await db_client.post("/api/v1/auth/login", json={"email": emails[0], "password": "wrong"})).status_code
+        for _ in range(5)
+    ]
+
+    assert codes == [200] * 6
+    # One account's budget is five attempts a minute, whoever sends them.
+    assert retries == [401] * 4 + [429]
+
+
+async def test_forwarded_client_address_is_trusted_only_from_the_proxy():
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(rate_limit_key(Request(scope)))
+
+    proxied = ProxyHeadersMiddleware(app, trusted_hosts=["10.0.0.1"])
+    for peer in ("10.0.0.1", "10.0.0.2"):
+        scope = {"type": "http", "headers": [(b"x-forwarded-for", b"203.0.113.7")], "client": (peer, 0)}
+        await proxied(scope, None, None)
+
+    assert seen == [f"{ANONYMOUS}|203.0.113.7", f"{ANONYMOUS}|10.0.0.2"]
@@ -0,0 +1,83 @@
+"""Read-only endpoints are served from the read session, writes from the primary."""
+
+from collections.abc import AsyncGenerator
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db.base_class import Base
+from app.db.session import get_db, get_read_db
+from app.main import app
+from app.models.user import RoleEnum
+from app.models.vehicle import Vehicle
+from tests.factories import seed_fleet
+
+
+@pytest.fixture
+async def replica_factory() -> AsyncGenerator[async_sessionmaker[AsyncSession], None]:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def split_client(session_factory, replica_factory) -> AsyncGenerator[AsyncClient, None]:
+    def _override(factory):
+        async def _get() -> AsyncGenerator[AsyncSession, None]:
+            async with factory() as session:
+                yield session
+
+        return _get
+
+    app.dependency_overrides[get_db] = _override(session_factory)
+    app.dependency_overrides[get_read_db] = _override(replica_factory)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["/api/v1/vehicles/", "/api/v1/drivers/", "/api/v1/trips/", "/api/v1/expenses/", "/api/v1/maintenance/"],
+)
+async def test_list_endpoints_read_from_replica(split_client: AsyncClient, replica_factory, auth_headers, path):
+    await seed_fleet(replica_factory, size=2)
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+
+    response = await split_client.get(path, headers=headers)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+
+async def test_analytics_reads_from_replica(split_client: AsyncClient, replica_factory, auth_headers):
+    await seed_fleet(replica_factory, size=3)
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+
+    response = await split_client.get("/api/v1/analytics/dashboard", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["activeFleet"] == 3
+
+
+async def test_writes_go_to_primary(split_client: AsyncClient, session_factory, replica_factory, auth_headers):
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+    body = {
+        "name": "Van",
+        "model": "2024",
+        "license_plate": "GJ01ZZ0001",
+        "max_capacity_kg": 1000,
+        "acquisition_cost": 1.0,
+    }
+
+    response = await split_client.post("/api/v1/vehicles/", json=body, headers=headers)
+
+    assert response.status_code == 201
+    async with session_factory() as primary, replica_factory() as replica:
+        assert (await primary.execute(select(Vehicle.id))).scalar_one() == response.json()["id"]
+        assert (await replica.execute(select(Vehicle.id))).first() is None
@@ -0,0 +1,63 @@
+"""List endpoints serialize rows directly; the output must match the response models."""
+
+from collections import namedtuple
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi import Response
+from httpx import AsyncClient
+
+from app.core import responses
+from app.core.config import settings
+from app.models.trip import TripStatus
+from app.models.user import RoleEnum
+from app.schemas.trip import TripResponse
+from tests.factories import seed_fleet
+
+
+async def test_list_rows_match_response_model(db_client: AsyncClient, auth_headers):
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+    created = await db_client.post(
+        "/api/v1/vehicles/",
+        json={"name": "Van", "model": "2024", "license_plate": "GJ01", "max_capacity_kg": 10, "acquisition_cost": 1.5},
+        headers=headers,
+    )
+
+    listed = await db_client.get("/api/v1/vehicles/")
+
+    assert listed.headers["content-type"] == "application/json"
+    assert listed.json() == [created.json()]
+
+
+@pytest.mark.parametrize("encoder", ["orjson", "stdlib"])
+async def test_trip_rows_validate_against_schema(db_client: AsyncClient, session_factory, monkeypatch, encoder):
+    monkeypatch.setattr(settings, "JSON_RESPONSE_ENCODER", encoder)
+    await seed_fleet(session_factory, size=3)
+
+    response = await db_client.get("/api/v1/trips/", params={"limit": 2})
+
+    assert response.status_code == 200
+    assert "X-Next-Cursor" in response.headers
+    trips = response.json()
+    assert [sorted(trip) for trip in trips] == [sorted(TripResponse.model_fields)] * 2
+    assert all(TripResponse.model_validate(trip).revenue == 50000.0 for trip in trips)
+    assert all(isinstance(trip["distance_km"], float) for trip in trips)
+
+
+def test_orjson_renders_decimal_and_enum():
+    body = responses.ORJSONResponse(
+        {"n": Decimal("1.50"), "s": TripStatus.IN_TRANSIT, "t": datetime(2024, 1, 1, tzinfo=timezone.utc)}
+    ).body
+
+    assert body == b'{"n":1.5,"s":"In Transit","t":"2024-01-01T00:00:00Z"}'
+
+
+@pytest.mark.parametrize("encoder", ["orjson", "stdlib"])
+def test_rows_response_renders_decimal_as_float(monkeypatch, encoder):
+    monkeypatch.setattr(settings, "JSON_RESPONSE_ENCODER", encoder)
+    row = namedtuple("Row", ["whole", "fraction"])(Decimal("50000"), Decimal("1.50"))
+
+    body = responses.rows_response([row], Response()).body
+
+    assert body.replace(b" ", b"") == b'[{"whole":50000.0,"fraction":1.5}]'
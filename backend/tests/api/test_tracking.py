@@ -0,0 +1,138 @@
+"""Customer tracking served from the ``tracking_views`` read model."""
+
+from datetime import date, timedelta
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.security import decode_access_token
+from app.models.driver import Driver, DriverStatus
+from app.models.tracking import TrackingView
+from app.models.user import RoleEnum
+from app.models.vehicle import Vehicle
+from app.services.tracking_service import TrackingService, tracking_cache
+from tests.factories import seed_fleet
+
+
+@pytest.fixture(autouse=True)
+def _fresh_tracking_cache():
+    tracking_cache.clear()
+    yield
+    tracking_cache.clear()
+
+
+async def _dispatch(db_client: AsyncClient, session_factory, headers: dict, customer_id: str | None) -> dict:
+    async with session_factory() as session:
+        vehicle = Vehicle(
+            name="Truck", model="2024", license_plate="GJ01AB0001", max_capacity_kg=10000, acquisition_cost=1.0
+        )
+        driver = Driver(
+            name="Ravi",
+            license_number="LIC-1",
+            license_expiry=date.today() + timedelta(days=365),
+            status=DriverStatus.ON_DUTY,
+        )
+        session.add_all([vehicle, driver])
+        await session.commit()
+    body = {
+        "vehicle_id": vehicle.id,
+        "driver_id": driver.id,
+        "origin": "Ahmedabad",
+        "destination": "Mumbai",
+        "cargo_weight": 500,
+        "customer_id": customer_id,
+    }
+    response = await db_client.post("/api/v1/trips/", json=body, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def _subject(headers: dict) -> str:
+    return decode_access_token(headers["Authorization"].removeprefix("Bearer "))["sub"]
+
+
+async def test_dispatch_populates_view_and_repeat_poll_is_not_modified(
+    db_client: AsyncClient, session_factory, query_counter, auth_headers
+):
+    dispatcher = await auth_headers(RoleEnum.DISPATCHER)
+    customer = await auth_headers(RoleEnum.CUSTOMER)
+    trip = await _dispatch(db_client, session_factory, dispatcher, _subject(customer))
+    url = f"/api/v1/tracking/{trip['tracking_id']}"
+
+    first = await db_client.get(url, headers=customer)
+    assert first.status_code == 200
+    assert first.json()["vehicle_plate"] == "GJ01AB0001"
+    assert first.json()["driver_name"] == "Ravi"
+    assert first.json()["status"] == "Dispatched"
+
+    query_counter.active = True
+    repeat = await db_client.get(url, headers=customer | {"If-None-Match": first.headers["ETag"]})
+    assert repeat.status_code == 304
+    assert repeat.headers["ETag"] == first.headers["ETag"]
+    assert query_counter.count == 0, query_counter.statements
+
+
+async def test_status_change_updates_view_and_etag(db_client: AsyncClient, session_factory, auth_headers):
+    dispatcher = await auth_headers(RoleEnum.DISPATCHER)
+    trip = await _dispatch(db_client, session_factory, dispatcher, None)
+    url = f"/api/v1/tracking/{trip['tracking_id']}"
+    before = await db_client.get(url, headers=dispatcher)
+
+    response = await db_client.patch(
+        f"/api/v1/trips/{trip['id']}/status", json={"status": "Completed"}, headers=dispatcher
+    )
+    assert response.status_code == 200
+
+    after = await db_client.get(url, headers=dispatcher | {"If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200
+    assert after.json()["status"] == "Completed"
+    assert after.json()["end_time"] is not None
+    assert after.headers["ETag"] != before.headers["ETag"]
+
+
+async def test_customer_cannot_track_someone_elses_shipment(db_client: AsyncClient, session_factory, auth_headers):
+    dispatcher = await auth_headers(RoleEnum.DISPATCHER)
+    customer = await auth_headers(RoleEnum.CUSTOMER)
+    trip = await _dispatch(db_client, session_factory, dispatcher, None)
+
+    response = await db_client.get(f"/api/v1/tracking/{trip['tracking_id']}", headers=customer)
+
+    assert response.status_code == 403
+
+
+async def test_my_shipments_lists_only_own_trips(db_client: AsyncClient, session_factory, auth_headers):
+    dispatcher = await auth_headers(RoleEnum.DISPATCHER)
+    customer = await auth_headers(RoleEnum.CUSTOMER)
+    trip = await _dispatch(db_client, session_factory, dispatcher, _subject(customer))
+
+    response = await db_client.get("/api/v1/tracking/my-shipments", headers=customer)
+
+    assert response.status_code == 200
+    assert [s["tracking_id"] for s in response.json()] == [trip["tracking_id"]]
+
+
+async def test_rebuild_backfills_trips_created_outside_the_service(session_factory):
+    await seed_fleet(session_factory, size=3)
+
+    async with session_factory() as session:
+        assert await TrackingService.rebuild(session) == 3
+        views = (await session.execute(TrackingView.__table__.select())).all()
+
+    assert {v.vehicle_plate for v in views} == {"GJ01AB0000", "GJ01AB0001", "GJ01AB0002"}
+
+
+async def test_driver_rename_reaches_the_tracking_view(db_client: AsyncClient, session_factory, auth_headers):
+    dispatcher = await auth_headers(RoleEnum.DISPATCHER)
+    customer = await auth_headers(RoleEnum.CUSTOMER)
+    trip = await _dispatch(db_client, session_factory, dispatcher, _subject(customer))
+    url = f"/api/v1/tracking/{trip['tracking_id']}"
+    assert (await db_client.get(url, headers=customer)).json()["driver_name"] == "Ravi"
+
+    renamed = await db_client.patch(
+        f"/api/v1/drivers/{trip['driver_id']}",
+        json={"name": "Ravi Patel", "version": 2},
+        headers=await auth_headers(RoleEnum.FLEET_MANAGER),
+    )
+
+    assert renamed.status_code == 200, renamed.text
+    assert (await db_client.get(url, headers=customer)).json()["driver_name"] == "Ravi Patel"
@@ -0,0 +1,217 @@
+"""Trip status transitions as guarded single-row updates."""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql
+
+from app.models.driver import Driver, DriverStatus
+from app.models.tracking import TrackingView
+from app.models.trip import Trip, TripStatus
+from app.models.user import RoleEnum
+from app.models.vehicle import Vehicle, VehicleStatus
+from app.schemas.trip import TripCreate, TripStatusUpdate
+from app.services.trip_service import _SOURCES, TripService, _one_statement
+from tests.factories import seed_fleet
+
+
+async def _first_trip(session_factory) -> Trip:
+    async with session_factory() as session:
+        return (await session.execute(select(Trip).order_by(Trip.id).limit(1))).scalar_one()
+
+
+async def test_completion_releases_vehicle_and_driver_without_reading_first(
+    db_client, session_factory, query_counter, auth_headers
+):
+    await seed_fleet(session_factory, size=1)
+    trip = await _first_trip(session_factory)
+    headers = await auth_headers(RoleEnum.DISPATCHER)
+    query_counter.active = True
+
+    response = await db_client.patch(
+        f"/api/v1/trips/{trip.id}/status", json={"status": "Completed", "odometer_km": 1200}, headers=headers
+    )
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["status"] == "Completed"
+    assert body["end_time"] is not None
+    assert body["version"] == trip.version + 1
+    # Guarded trip UPDATE ... RETURNING, vehicle, driver, tracking view; no SELECTs.
+    assert query_counter.count == 4, query_counter.statements
+    assert all(s.lstrip().startswith("UPDATE") for s in query_counter.statements), query_counter.statements
+    async with session_factory() as session:
+        vehicle = await session.get(Vehicle, trip.vehicle_id)
+        driver = await session.get(Driver, trip.driver_id)
+    assert vehicle.status == VehicleStatus.AVAILABLE
+    assert vehicle.odometer_km == 1200
+    assert driver.status == DriverStatus.ON_DUTY
+
+
+async def test_non_terminal_transition_keeps_assets_on_trip(db_client, session_factory, auth_headers):
+    await seed_fleet(session_factory, size=1)
+    trip = await _first_trip(session_factory)
+    headers = await auth_headers(RoleEnum.DISPATCHER)
+
+    response = await db_client.patch(f"/api/v1/trips/{trip.id}/status", json={"status": "In Transit"}, headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert response.json()["end_time"] is None
+    async with session_factory() as session:
+        assert (await session.get(Vehicle, trip.vehicle_id)).status == VehicleStatus.ON_TRIP
+        assert (await session.get(Driver, trip.driver_id)).status == DriverStatus.ON_TRIP
+
+
+async def test_invalid_transition_reports_current_status(db_client, session_factory, auth_headers):
+    await seed_fleet(session_factory, size=1)
+    trip = await _first_trip(session_factory)
+    headers = await auth_headers(RoleEnum.DISPATCHER)
+    url = f"/api/v1/trips/{trip.id}/status"
+
+    first = await db_client.patch(url, json={"status": "Cancelled"}, headers=headers)
+    # The guard no longer matches once the first transition has been applied.
+    second = await db_client.patch(url, json={"status": "Completed"}, headers=headers)
+    missing = await db_client.patch("/api/v1/trips/nope/status", json={"status": "Completed"}, headers=headers)
+
+    assert first.status_code == 200
+    assert second.status_code == 400
+    assert second.json()["detail"] == "Cannot transition from Cancelled to Completed"
+    assert missing.status_code == 400
+    assert missing.json()["detail"] == "Trip not found"
+
+
+async def _add_trip(session_factory, like: Trip, status: TripStatus) -> Trip:
+    async with session_factory() as session:
+        trip = Trip(
+            vehicle_id=like.vehicle_id,
+            driver_id=like.driver_id,
+            origin="A",
+            destination="B",
+            cargo_weight=1,
+            status=status,
+            start_time=datetime.now(timezone.utc),
+        )
+        session.add(trip)
+        await session.commit()
+        return trip
+
+
+async def _asset_statuses(session_factory, trip: Trip) -> tuple[VehicleStatus, DriverStatus]:
+    async with session_factory() as session:
+        vehicle = await session.get(Vehicle, trip.vehicle_id)
+        driver = await session.get(Driver, trip.driver_id)
+        return vehicle.status, driver.status
+
+
+async def test_completing_a_delivered_trip_keeps_assets_on_their_newer_trip(
+    db_client, session_factory, auth_headers
+):
+    await seed_fleet(session_factory, size=1)
+    first = await _first_trip(session_factory)
+    headers = await auth_headers(RoleEnum.DISPATCHER)
+    for status in ("In Transit", "Out for Delivery", "Delivered"):
+        response = await db_client.patch(f"/api/v1/trips/{first.id}/status", json={"status": status}, headers=headers)
+        assert response.status_code == 200, response.text
+    assert await _asset_statuses(session_factory, first) == (VehicleStatus.AVAILABLE, DriverStatus.ON_DUTY)
+
+    dispatch = await db_client.post(
+        "/api/v1/trips/",
+        json={
+            "vehicle_id": first.vehicle_id,
+            "driver_id": first.driver_id,
+            "origin": "A",
+            "destination": "B",
+            "cargo_weight": 1,
+        },
+        headers=headers,
+    )
+    assert dispatch.status_code == 201, dispatch.text
+    second_id = dispatch.json()["id"]
+
+    # The delivered trip completes while the newer one is out: nothing is released.
+    completed = await db_client.patch(f"/api/v1/trips/{first.id}/status", json={"status": "Completed"}, headers=headers)
+    assert completed.status_code == 200, completed.text
+    assert await _asset_statuses(session_factory, first) == (VehicleStatus.ON_TRIP, DriverStatus.ON_TRIP)
+
+    # The newer trip completes last and releases them.
+    completed = await db_client.patch(
+        f"/api/v1/trips/{second_id}/status", json={"status": "Completed"}, headers=headers
+    )
+    assert completed.status_code == 200, completed.text
+    assert await _asset_statuses(session_factory, first) == (VehicleStatus.AVAILABLE, DriverStatus.ON_DUTY)
+
+
+async def test_cancelling_a_draft_keeps_assets_on_the_active_trip(db_client, session_factory, auth_headers):
+    await seed_fleet(session_factory, size=1)
+    active = await _first_trip(session_factory)
+    draft = await _add_trip(session_factory, active, TripStatus.DRAFT)
+    headers = await auth_headers(RoleEnum.DISPATCHER)
+
+    response = await db_client.patch(f"/api/v1/trips/{draft.id}/status", json={"status": "Cancelled"}, headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert await _asset_statuses(session_factory, active) == (VehicleStatus.ON_TRIP, DriverStatus.ON_TRIP)
+
+
+def test_postgresql_statement_guards_releases_against_other_active_trips():
+    moved = (
+        update(Trip)
+        .where(Trip.id == "trip", Trip.status.in_(_SOURCES[TripStatus.COMPLETED]))
+        .values(status=TripStatus.COMPLETED)
+    )
+
+    sql = str(_one_statement(moved, True, 100).compile(dialect=postgresql.asyncpg.dialect()))
+
+    assert sql.startswith("WITH moved AS \n(UPDATE trips")
+    for cte, asset in (("released_vehicle", "vehicle_id"), ("released_driver", "driver_id")):
+        body = sql.split(f"{cte} AS", 1)[1].split("RETURNING", 1)[0]
+        assert "NOT (EXISTS (SELECT trips.id" in body
+        assert f"trips.{asset} = moved.{asset} AND trips.id != moved.id" in body
+
+
+@pytest.mark.postgres
+async def test_postgresql_transition_statement(pg_session_factory):
+    async with pg_session_factory() as session:
+        vehicle = Vehicle(name="Truck", model="2024", license_plate="PG1", max_capacity_kg=1000, acquisition_cost=1)
+        expiry = date.today() + timedelta(days=30)
+        driver = Driver(name="D", license_number="PG1", license_expiry=expiry, status=DriverStatus.ON_DUTY)
+        session.add_all([vehicle, driver])
+        await session.commit()
+    order = TripCreate(vehicle_id=vehicle.id, driver_id=driver.id, origin="A", destination="B", cargo_weight=1)
+
+    async def dispatch() -> Trip:
+        async with pg_session_factory() as session:
+            return await TripService.dispatch_trip(session, order)
+
+    async def move(trip_id: str, status: TripStatus, odometer_km: int | None = None) -> Trip:
+        async with pg_session_factory() as session:
+            payload = TripStatusUpdate(status=status, odometer_km=odometer_km)
+            return await TripService.update_trip_status(session, trip_id, payload)
+
+    async def state(trip_id: str) -> tuple:
+        async with pg_session_factory() as session:
+            view = (await session.execute(select(TrackingView).where(TrackingView.trip_id == trip_id))).scalar_one()
+            return (
+                (await session.get(Vehicle, vehicle.id)).status,
+                (await session.get(Driver, driver.id)).status,
+                view.status,
+                view.end_time is not None,
+            )
+
+    first = await dispatch()
+    for status in (TripStatus.IN_TRANSIT, TripStatus.OUT_FOR_DELIVERY, TripStatus.DELIVERED):
+        delivered = await move(first.id, status)
+    assert await state(first.id) == (VehicleStatus.AVAILABLE, DriverStatus.ON_DUTY, TripStatus.DELIVERED, True)
+    second = await dispatch()
+
+    # The delivered trip completes while its assets are out on the second one.
+    completed = await move(first.id, TripStatus.COMPLETED)
+    assert (completed.status, completed.version) == (TripStatus.COMPLETED, delivered.version + 1)
+    assert await state(first.id) == (VehicleStatus.ON_TRIP, DriverStatus.ON_TRIP, TripStatus.COMPLETED, True)
+
+    completed = await move(second.id, TripStatus.COMPLETED, odometer_km=1500)
+    assert (completed.status, completed.version) == (TripStatus.COMPLETED, second.version + 1)
+    assert await state(second.id) == (VehicleStatus.AVAILABLE, DriverStatus.ON_DUTY, TripStatus.COMPLETED, True)
+    async with pg_session_factory() as session:
+        assert (await session.get(Vehicle, vehicle.id)).odometer_km == 1500
@@ -0,0 +1,52 @@
+"""Versioned PATCH endpoints reject edits made against stale copies."""
+
+from httpx import AsyncClient
+
+from app.models.driver import Driver
+from app.models.user import RoleEnum
+from app.models.vehicle import Vehicle
+
+
+async def test_vehicle_patch_checks_client_version(db_client: AsyncClient, session_factory, auth_headers):
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+    created = await db_client.post(
+        "/api/v1/vehicles/",
+        json={"name": "Van", "model": "2024", "license_plate": "GJ01", "max_capacity_kg": 10, "acquisition_cost": 1},
+        headers=headers,
+    )
+    vehicle = created.json()
+    assert vehicle["version"] == 1
+    url = f"/api/v1/vehicles/{vehicle['id']}"
+
+    # Two editors load the same copy and both save it.
+    first = await db_client.patch(url, json={"name": "Van A", "version": vehicle["version"]}, headers=headers)
+    second = await db_client.patch(url, json={"name": "Van B", "version": vehicle["version"]}, headers=headers)
+    unversioned = await db_client.patch(url, json={"odometer_km": 5}, headers=headers)
+
+    assert first.status_code == 200
+    assert first.json()["version"] == 2
+    assert second.status_code == 409
+    assert unversioned.status_code == 422
+    async with session_factory() as session:
+        stored = await session.get(Vehicle, vehicle["id"])
+    assert (stored.name, stored.version) == ("Van A", 2)
+
+
+async def test_driver_patch_checks_client_version(db_client: AsyncClient, session_factory, auth_headers):
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+    created = await db_client.post(
+        "/api/v1/drivers/",
+        json={"name": "Ravi", "license_number": "LIC-1", "license_expiry": "2099-01-01"},
+        headers=headers,
+    )
+    driver = created.json()
+    url = f"/api/v1/drivers/{driver['id']}"
+
+    first = await db_client.patch(url, json={"safety_score": 90, "version": driver["version"]}, headers=headers)
+    second = await db_client.patch(url, json={"name": "Ravi P", "version": driver["version"]}, headers=headers)
+
+    assert first.status_code == 200
+    assert second.status_code == 409
+    async with session_factory() as session:
+        stored = await session.get(Driver, driver["id"])
+    assert (stored.name, stored.safety_score, stored.version) == ("Ravi", 90, 2)
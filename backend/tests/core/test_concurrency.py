@@ -0,0 +1,64 @@
+"""Optimistic retry re-runs an operation against fresh state."""
+
+import pytest
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.config import settings
+from app.db.concurrency import run_optimistic
+from app.models.vehicle import Vehicle, VehicleStatus
+
+
+async def _seed_vehicle(session_factory) -> str:
+    async with session_factory() as session:
+        vehicle = Vehicle(name="Truck", model="2024", license_plate="GJ01", max_capacity_kg=100, acquisition_cost=1.0)
+        session.add(vehicle)
+        await session.commit()
+    return vehicle.id
+
+
+async def _concurrent_edit(session_factory, vehicle_id: str) -> None:
+    async with session_factory() as other:
+        (await other.get(Vehicle, vehicle_id)).odometer_km += 100
+        await other.commit()
+
+
+async def test_conflict_is_retried_with_fresh_state(session_factory):
+    vehicle_id = await _seed_vehicle(session_factory)
+    seen_versions: list[int] = []
+
+    async with session_factory() as db:
+
+        async def _operation() -> Vehicle:
+            vehicle = await db.get(Vehicle, vehicle_id)
+            seen_versions.append(vehicle.version)
+            if len(seen_versions) == 1:
+                await _concurrent_edit(session_factory, vehicle_id)
+            vehicle.status = VehicleStatus.IN_SHOP
+            await db.commit()
+            return vehicle
+
+        vehicle = await run_optimistic(db, _operation)
+
+    assert seen_versions == [1, 2]
+    assert (vehicle.version, vehicle.odometer_km, vehicle.status) == (3, 100, VehicleStatus.IN_SHOP)
+
+
+async def test_gives_up_after_configured_attempts(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "OPTIMISTIC_RETRY_ATTEMPTS", 2)
+    vehicle_id = await _seed_vehicle(session_factory)
+    calls = 0
+
+    async with session_factory() as db:
+
+        async def _always_loses() -> None:
+            nonlocal calls
+            calls += 1
+            vehicle = await db.get(Vehicle, vehicle_id)
+            await _concurrent_edit(session_factory, vehicle_id)
+            vehicle.status = VehicleStatus.IN_SHOP
+            await db.commit()
+
+        with pytest.raises(StaleDataError):
+            await run_optimistic(db, _always_loses)
+
+    assert calls == 2
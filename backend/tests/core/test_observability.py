@@ -0,0 +1,67 @@
+"""Request metrics middleware, SQL instrumentation and Prometheus rendering."""
+
+from httpx import AsyncClient
+
+from app.core.metrics import Histogram, render_metric
+from app.core.observability import instrument_engine, request_metrics
+from app.models.user import RoleEnum
+from tests.factories import seed_fleet
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram(buckets=(0.1, 1))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(3)
+
+    text = render_metric("latency_seconds", "histogram", "Latency.", [({"route": '/a"b'}, histogram)])
+
+    assert text.splitlines() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a\\"b",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a\\"b",le="1"} 2',
+        'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a\\"b"} 3.550000',
+        'latency_seconds_count{route="/a\\"b"} 3',
+    ]
+
+
+async def test_requests_are_recorded_per_route_template_with_their_statements(
+    db_client: AsyncClient, db_engine, session_factory, auth_headers
+):
+    instrument_engine(db_engine)
+    await seed_fleet(session_factory, size=2)
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+    request_metrics.clear()
+
+    for _ in range(2):
+        assert (await db_client.get("/api/v1/vehicles/", headers=headers)).status_code == 200
+
+    key = ("GET", "/api/v1/vehicles/")
+    assert request_metrics.latency[("GET", "/api/v1/vehicles/", "200")].count == 2
+    # One statement per listing: the principal comes from the token claims.
+    assert request_metrics.statements[key].sum == 2
+    assert request_metrics.db_seconds[key].sum > 0
+
+
+async def test_unmatched_paths_share_one_label(client: AsyncClient):
+    request_metrics.clear()
+
+    await client.get("/no/such/path/1")
+    await client.get("/no/such/path/2")
+
+    assert request_metrics.latency[("GET", "unmatched", "404")].count == 2
+
+
+async def test_metrics_endpoint_exposes_request_and_pool_families(client: AsyncClient):
+    await client.get("/health")
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in body
+    for family in ("http_request_sql_statements", "db_pool_checkout_wait_seconds", "password_pool_pending"):
+        assert f"# TYPE {family} " in body
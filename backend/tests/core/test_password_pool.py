@@ -0,0 +1,45 @@
+"""Password work runs off the event loop with bounded queueing."""
+
+import asyncio
+import threading
+
+import bcrypt
+import pytest
+
+from app.core.security import PasswordPoolBusy, PasswordWorkPool
+
+
+async def test_hashing_does_not_block_the_event_loop():
+    pool = PasswordWorkPool(workers=1, max_pending=4)
+    hashed = bcrypt.hashpw(b"secret", bcrypt.gensalt(rounds=10))
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    task = asyncio.create_task(ticker())
+    assert await pool.run(bcrypt.checkpw, b"secret", hashed)
+    task.cancel()
+    pool.shutdown()
+
+    assert ticks > 5
+    assert pool.stats()["completed"] == 1
+
+
+async def test_saturated_pool_rejects_new_work():
+    pool = PasswordWorkPool(workers=1, max_pending=1)
+    release = threading.Event()
+    first = asyncio.create_task(pool.run(release.wait))
+    await asyncio.sleep(0)
+
+    with pytest.raises(PasswordPoolBusy):
+        await pool.run(lambda: None)
+
+    release.set()
+    await first
+    pool.shutdown()
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["pending"] == 0
@@ -0,0 +1,51 @@
+"""Connection-pool sizing and instrumentation."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool, compute_pool_limits
+
+
+def test_auto_size_splits_connections_across_workers():
+    tuned = settings.model_copy(
+        update={
+            "DB_POOL_AUTO_SIZE": True,
+            "DB_MAX_CONNECTIONS": 100,
+            "DB_RESERVED_CONNECTIONS": 10,
+            "WEB_CONCURRENCY": 4,
+        }
+    )
+    pool_size, max_overflow = compute_pool_limits(tuned)
+
+    assert (pool_size, max_overflow) == (14, 8)
+    assert (pool_size + max_overflow) * 4 <= 90
+
+
+def test_explicit_limits_are_used_without_auto_size():
+    tuned = settings.model_copy(update={"DB_POOL_AUTO_SIZE": False, "DB_POOL_SIZE": 3, "DB_MAX_OVERFLOW": 2})
+    assert compute_pool_limits(tuned) == (3, 2)
+
+
+async def test_instrumented_pool_counts_checkouts_and_timeouts(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    async with engine.connect() as held:
+        await held.execute(text("select 1"))
+        assert engine.pool.stats()["checkedOut"] == 1
+        with pytest.raises(PoolTimeoutError):
+            async with engine.connect():
+                pass
+
+    stats = engine.pool.stats()
+    await engine.dispose()
+    assert stats["timeouts"] == 1
+    assert stats["waiters"] == 0
+    assert stats["checkoutWaitSeconds"]["count"] == 2
@@ -0,0 +1,55 @@
+"""Test data builders shared across test modules."""
+
+from datetime import date, datetime, timedelta, timezone
+
+from app.models.driver import Driver, DriverStatus
+from app.models.expense import Expense
+from app.models.maintenance import MaintenanceLog, MaintenanceType
+from app.models.trip import Trip, TripStatus
+from app.models.vehicle import Vehicle, VehicleStatus
+
+
+async def seed_fleet(session_factory, size: int = 5) -> None:
+    """Insert *size* vehicles, each on a dispatched trip with one expense and one maintenance log."""
+    async with session_factory() as session:
+        for i in range(size):
+            vehicle = Vehicle(
+                name=f"Truck {i}",
+                model="2024",
+                license_plate=f"GJ01AB{i:04d}",
+                max_capacity_kg=10000,
+                acquisition_cost=1000000.0,
+                status=VehicleStatus.ON_TRIP,
+            )
+            driver = Driver(
+                name=f"Driver {i}",
+                license_number=f"LIC-{i:04d}",
+                license_expiry=date.today() + timedelta(days=365),
+                status=DriverStatus.ON_TRIP,
+            )
+            session.add_all([vehicle, driver])
+            await session.flush()
+            trip = Trip(
+                vehicle_id=vehicle.id,
+                driver_id=driver.id,
+                origin="Ahmedabad",
+                destination="Mumbai",
+                cargo_weight=5000,
+                distance_km=500.0,
+                revenue=50000.0,
+                status=TripStatus.DISPATCHED,
+                start_time=datetime.now(timezone.utc),
+            )
+            session.add(trip)
+            await session.flush()
+            session.add_all(
+                [
+                    Expense(
+                        vehicle_id=vehicle.id, trip_id=trip.id, fuel_liters=50.0, fuel_cost=4600.0, date=date.today()
+                    ),
+                    MaintenanceLog(
+                        vehicle_id=vehicle.id, type=MaintenanceType.PREVENTATIVE, cost=1000.0, date=date.today()
+                    ),
+                ]
+            )
+        await session.commit()
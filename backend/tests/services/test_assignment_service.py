@@ -0,0 +1,80 @@
+"""Best-fit assignment is optimal on small instances and wires through to dispatch."""
+
+import itertools
+import random
+from datetime import date, timedelta
+
+from httpx import AsyncClient
+
+from app.models.driver import Driver, DriverStatus
+from app.models.user import RoleEnum
+from app.models.vehicle import Vehicle
+from app.services.assignment_service import NO_DRIVER, NO_VEHICLE, best_fit
+
+
+def _brute_force(weights: list[int], capacities: list[int]) -> tuple[int, int]:
+    """Return (most trips assigned, least unused capacity at that count) by exhaustive search."""
+    best = (0, 0)
+    slots = list(range(len(capacities))) + [None] * len(weights)
+    for choice in set(itertools.permutations(slots, len(weights))):
+        pairs = [(w, capacities[v]) for w, v in zip(weights, choice) if v is not None]
+        if all(c >= w for w, c in pairs):
+            candidate = (len(pairs), -sum(c - w for w, c in pairs))
+            best = max(best, candidate)
+    return best[0], -best[1]
+
+
+def test_best_fit_matches_exhaustive_optimum():
+    rng = random.Random(7)
+    for _ in range(200):
+        weights = [rng.randint(1, 10) for _ in range(rng.randint(1, 4))]
+        capacities = sorted(rng.randint(1, 10) for _ in range(rng.randint(1, 4)))
+        vehicles = [(f"v{i}", c) for i, c in enumerate(capacities)]
+        plan = best_fit(weights, vehicles, [f"d{i}" for i in range(len(weights))])
+
+        used = [(w, dict(vehicles)[m[0]]) for w, m in zip(weights, plan) if isinstance(m, tuple)]
+        assert len({m[0] for m in plan if isinstance(m, tuple)}) == len(used)
+        assert all(c >= w for w, c in used)
+        assert (len(used), sum(c - w for w, c in used)) == _brute_force(weights, capacities), (weights, capacities)
+
+
+def test_best_fit_reports_why_trips_stay_unassigned():
+    plan = best_fit([50, 5, 5], [("small", 10), ("large", 20)], ["d1"])
+
+    assert plan == [NO_VEHICLE, ("small", "d1"), NO_DRIVER]
+
+
+async def test_assign_endpoint_plans_and_dispatches(db_client: AsyncClient, session_factory, auth_headers):
+    async with session_factory() as session:
+        vehicles = [
+            Vehicle(name=f"V{c}", model="2024", license_plate=f"GJ{c:04d}", max_capacity_kg=c, acquisition_cost=1.0)
+            for c in (500, 1000, 5000)
+        ]
+        drivers = [
+            Driver(
+                name=f"D{i}",
+                license_number=f"LIC-{i}",
+                license_expiry=date.today() + timedelta(days=30),
+                status=DriverStatus.ON_DUTY,
+                safety_score=score,
+            )
+            for i, score in enumerate((70, 95))
+        ]
+        session.add_all(vehicles + drivers)
+        await session.commit()
+    headers = await auth_headers(RoleEnum.DISPATCHER)
+    trips = [{"origin": "A", "destination": "B", "cargo_weight": w} for w in (900, 400, 100)]
+
+    plan = await db_client.post("/api/v1/trips/assign", json={"trips": trips}, headers=headers)
+    dispatched = await db_client.post("/api/v1/trips/assign", json={"trips": trips, "dispatch": True}, headers=headers)
+
+    assert plan.status_code == 200
+    assert [r["vehicle_id"] for r in plan.json()] == [vehicles[1].id, vehicles[0].id, None]
+    assert [r["driver_id"] for r in plan.json()] == [drivers[1].id, drivers[0].id, None]
+    assert [r["unused_capacity_kg"] for r in plan.json()] == [100, 100, None]
+    assert plan.json()[2]["error"] == NO_DRIVER
+    assert all(r["trip"] is None for r in plan.json())
+
+    assert dispatched.status_code == 200
+    assert [r["trip"]["vehicle_id"] for r in dispatched.json()[:2]] == [vehicles[1].id, vehicles[0].id]
+    assert dispatched.json()[0]["trip"]["status"] == "Dispatched"
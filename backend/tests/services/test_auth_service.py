@@ -0,0 +1,65 @@
+"""Login verification and transparent rehashing."""
+
+import bcrypt
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.security import bcrypt_rounds
+from app.models.user import Role, RoleEnum, User
+from app.services.auth_service import AuthService
+
+
+async def _create_user(session_factory, password: str, rounds: int) -> None:
+    async with session_factory() as session:
+        role = Role(name=RoleEnum.DISPATCHER)
+        session.add(role)
+        await session.flush()
+        hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=rounds)).decode()
+        session.add(User(email="dispatch@fleetflow.test", password_hash=hashed, role_id=role.id))
+        await session.commit()
+
+
+async def test_outdated_hash_is_upgraded_on_login(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+    await _create_user(session_factory, "dispatch123", rounds=4)
+
+    async with session_factory() as session:
+        _access, _refresh, role = await AuthService.authenticate(session, "dispatch@fleetflow.test", "dispatch123")
+    assert role == RoleEnum.DISPATCHER.value
+
+    async with session_factory() as session:
+        stored = (await session.execute(select(User.password_hash))).scalar_one()
+    assert bcrypt_rounds(stored) == 5
+    assert bcrypt.checkpw(b"dispatch123", stored.encode())
+
+
+async def test_wrong_password_does_not_rehash(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+    await _create_user(session_factory, "dispatch123", rounds=4)
+
+    async with session_factory() as session:
+        with pytest.raises(ValueError):
+            await AuthService.authenticate(session, "dispatch@fleetflow.test", "wrong")
+
+    async with session_factory() as session:
+        stored = (await session.execute(select(User.password_hash))).scalar_one()
+    assert bcrypt_rounds(stored) == 4
+
+
+async def test_failed_rehash_does_not_fail_login(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+    await _create_user(session_factory, "dispatch123", rounds=4)
+
+    async def _lost_connection():
+        raise OperationalError("COMMIT", {}, Exception("connection lost"))
+
+    async with session_factory() as session:
+        monkeypatch.setattr(session, "commit", _lost_connection)
+        _access, _refresh, role = await AuthService.authenticate(session, "dispatch@fleetflow.test", "dispatch123")
+    assert role == RoleEnum.DISPATCHER.value
+
+    async with session_factory() as session:
+        stored = (await session.execute(select(User.password_hash))).scalar_one()
+    assert bcrypt_rounds(stored) == 4
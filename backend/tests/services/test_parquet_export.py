@@ -0,0 +1,76 @@
+"""Incremental, month-partitioned Parquet export."""
+
+import asyncio
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.models.user import RoleEnum
+from app.services.parquet_export_service import ParquetExportService
+from tests.factories import seed_fleet
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+THIS_MONTH = datetime.now(timezone.utc).strftime("%Y-%m")
+
+
+async def test_export_writes_month_partitions(session_factory, tmp_path):
+    await seed_fleet(session_factory, size=3)
+
+    summary = await ParquetExportService.export(session_factory, tmp_path)
+
+    assert summary == {
+        "trips": {THIS_MONTH: 3},
+        "expenses": {date.today().strftime("%Y-%m"): 3},
+        "maintenance_logs": {date.today().strftime("%Y-%m"): 3},
+        "vehicles": {"all": 3},
+    }
+    trips = pq.read_table(tmp_path / "trips" / f"month={THIS_MONTH}" / "part-0.parquet")
+    assert trips.num_rows == 3
+    assert set(trips.column("status").to_pylist()) == {"Dispatched"}
+    assert trips.column("revenue").to_pylist() == [50000.0] * 3
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+async def test_incremental_run_leaves_closed_months_alone(session_factory, tmp_path):
+    await seed_fleet(session_factory, size=2)
+    closed = tmp_path / "trips" / "month=2000-01"
+    closed.mkdir(parents=True)
+    (closed / "part-0.parquet").write_bytes(b"closed month")
+    stale = tmp_path / "trips" / "month=2999-01"
+    stale.mkdir(parents=True)
+
+    summary = await ParquetExportService.export(session_factory, tmp_path, since=date(2000, 2, 1))
+
+    assert summary["trips"] == {THIS_MONTH: 2}
+    assert (closed / "part-0.parquet").read_bytes() == b"closed month"
+    # Inside the rewritten range but without rows any more.
+    assert not stale.exists()
+    assert ParquetExportService.watermark(tmp_path / "trips") == date.fromisoformat(f"{THIS_MONTH}-01")
+
+
+async def test_export_endpoint(db_client, session_factory, auth_headers, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PARQUET_EXPORT_DIR", str(tmp_path))
+    await seed_fleet(session_factory, size=1)
+    headers = await auth_headers(RoleEnum.FINANCIAL_ANALYST)
+
+    response = await db_client.post("/api/v1/analytics/exports/parquet", params={"full": True}, headers=headers)
+
+    assert response.status_code == 202
+    assert response.json() == {"directory": str(tmp_path), "since": None, "full": True}
+    # The in-process transport runs background tasks before returning.
+    assert (tmp_path / "vehicles" / "part-0.parquet").exists()
+
+
+async def test_concurrent_exports_take_turns(session_factory, tmp_path):
+    await seed_fleet(session_factory, size=2)
+
+    first, second = await asyncio.gather(
+        ParquetExportService.export(session_factory, tmp_path, full=True),
+        ParquetExportService.export(session_factory, tmp_path, full=True),
+    )
+
+    assert first == second
+    assert pq.read_table(tmp_path / "trips" / f"month={THIS_MONTH}" / "part-0.parquet").num_rows == 2
+    assert not list(tmp_path.rglob("*.tmp"))
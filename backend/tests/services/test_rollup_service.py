@@ -0,0 +1,81 @@
+"""Incremental rollups must agree with a full rebuild."""
+
+from datetime import date, timedelta
+
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.models.driver import Driver, DriverStatus
+from app.models.rollup import DailyRollup, VehicleRollup
+from app.models.user import RoleEnum
+from app.models.vehicle import Vehicle, VehicleStatus
+from app.services.rollup_service import METRICS, RollupService
+
+
+async def _snapshot(session_factory) -> tuple[dict, dict]:
+    async with session_factory() as session:
+        vehicles = {
+            r.vehicle_id: tuple(float(getattr(r, m)) for m in METRICS)
+            for r in (await session.execute(select(VehicleRollup))).scalars()
+        }
+        days = {
+            (r.vehicle_id, r.day): tuple(float(getattr(r, m)) for m in METRICS)
+            for r in (await session.execute(select(DailyRollup))).scalars()
+        }
+    return vehicles, days
+
+
+async def test_write_paths_maintain_rollups(db_client: AsyncClient, session_factory, auth_headers):
+    async with session_factory() as session:
+        truck = Vehicle(
+            name="Truck", model="2024", license_plate="GJ01AB0001", max_capacity_kg=10000, acquisition_cost=1.0,
+            status=VehicleStatus.AVAILABLE,
+        )
+        spare = Vehicle(
+            name="Spare", model="2024", license_plate="GJ01AB0002", max_capacity_kg=10000, acquisition_cost=1.0,
+            status=VehicleStatus.AVAILABLE,
+        )
+        driver = Driver(
+            name="Driver", license_number="LIC-1", license_expiry=date.today() + timedelta(days=30),
+            status=DriverStatus.ON_DUTY,
+        )
+        session.add_all([truck, spare, driver])
+        await session.commit()
+    headers = await auth_headers(RoleEnum.FLEET_MANAGER)
+
+    trip = await db_client.post(
+        "/api/v1/trips/",
+        headers=headers,
+        json={
+            "vehicle_id": truck.id, "driver_id": driver.id, "origin": "A", "destination": "B",
+            "cargo_weight": 100, "distance_km": 250.0, "revenue": 9000.0,
+        },
+    )
+    assert trip.status_code == 201
+    expense = await db_client.post(
+        "/api/v1/expenses/",
+        headers=headers,
+        json={
+            "vehicle_id": truck.id, "trip_id": trip.json()["id"], "fuel_liters": 25.0, "fuel_cost": 2300.0,
+            "date": date.today().isoformat(),
+        },
+    )
+    assert expense.status_code == 201
+    log = await db_client.post(
+        "/api/v1/maintenance/",
+        headers=headers,
+        json={"vehicle_id": spare.id, "type": "Reactive", "cost": 700.0, "date": date.today().isoformat()},
+    )
+    assert log.status_code == 201
+
+    incremental = await _snapshot(session_factory)
+    assert incremental[0][truck.id] == (1, 9000.0, 250.0, 25.0, 2300.0, 0)
+    assert incremental[0][spare.id] == (0, 0, 0, 0, 0, 700.0)
+    # Daily rows are per vehicle, so writes for different vehicles never touch the same row.
+    for vehicle_id, totals in incremental[0].items():
+        days = [row for (owner, _), row in incremental[1].items() if owner == vehicle_id]
+        assert tuple(map(sum, zip(*days))) == totals
+
+    async with session_factory() as session:
+        await RollupService.rebuild(session)
+    assert await _snapshot(session_factory) == incremental
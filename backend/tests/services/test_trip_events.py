@@ -0,0 +1,107 @@
+"""Trip events are published on commit and fanned out to subscribers."""
+
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.models.driver import Driver, DriverStatus
+from app.models.trip import Trip, TripStatus
+from app.models.user import RoleEnum
+from app.models.vehicle import Vehicle
+from app.schemas.trip import TripCreate, TripStatusUpdate
+from app.services import trip_events
+from app.services.trip_events import TripEvent, broker
+from app.services.trip_service import TripService
+
+
+@pytest.fixture(autouse=True)
+def _fresh_broker():
+    yield
+    broker.close_all()
+
+
+async def _seed(session_factory) -> TripCreate:
+    async with session_factory() as session:
+        vehicle = Vehicle(
+            name="Truck", model="2024", license_plate="GJ01AB0001", max_capacity_kg=10000, acquisition_cost=1.0
+        )
+        driver = Driver(
+            name="Driver",
+            license_number="LIC-1",
+            license_expiry=date.today() + timedelta(days=30),
+            status=DriverStatus.ON_DUTY,
+        )
+        session.add_all([vehicle, driver])
+        await session.commit()
+    return TripCreate(vehicle_id=vehicle.id, driver_id=driver.id, origin="A", destination="B", cargo_weight=10)
+
+
+def _event(**overrides) -> TripEvent:
+    fields = dict.fromkeys(TripEvent.__dataclass_fields__) | {"tracking_id": "TRK-1", "status": "Dispatched"}
+    return TripEvent(**(fields | overrides))
+
+
+async def test_service_writes_publish_after_commit(session_factory):
+    trip_in = await _seed(session_factory)
+    subscription = broker.subscribe()
+
+    async with session_factory() as session:
+        trip = await TripService.dispatch_trip(session, trip_in)
+        await TripService.update_trip_status(session, trip.id, TripStatusUpdate(status=TripStatus.COMPLETED))
+
+    first, second = await subscription.get(), await subscription.get()
+    assert (first.trip_id, first.status) == (trip.id, "Dispatched")
+    assert (second.trip_id, second.status) == (trip.id, "Completed")
+    assert second.end_time is not None
+
+
+async def test_rolled_back_write_publishes_nothing(session_factory):
+    trip_in = await _seed(session_factory)
+    subscription = broker.subscribe()
+
+    async with session_factory() as session:
+        trip = Trip(**trip_in.model_dump(), status=TripStatus.DISPATCHED, start_time=datetime.now(timezone.utc))
+        session.add(trip)
+        await session.flush()
+        await trip_events.stage(session, trip)
+        await session.rollback()
+        await session.commit()
+
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(subscription.get(), timeout=0.05)
+
+
+async def test_predicate_filters_and_slow_subscriber_is_dropped(monkeypatch):
+    monkeypatch.setattr(settings, "TRACKING_STREAM_QUEUE_SIZE", 1)
+    mine = broker.subscribe(lambda e: e.customer_id == "me")
+    slow = broker.subscribe()
+
+    broker.publish(_event(customer_id="someone-else"))
+    broker.publish(_event(customer_id="me"))
+
+    assert (await mine.get()).customer_id == "me"
+    assert slow.closed
+    assert await slow.get() is None
+    assert len(broker) == 1
+
+
+async def test_stream_endpoint_delivers_visible_events(db_client: AsyncClient, auth_headers):
+    headers = await auth_headers(RoleEnum.DISPATCHER)
+    request = asyncio.create_task(db_client.get("/api/v1/tracking/stream?tracking_id=TRK-2", headers=headers))
+    while len(broker) == 0:
+        await asyncio.sleep(0.01)
+
+    broker.publish(_event(tracking_id="TRK-1"))
+    broker.publish(_event(tracking_id="TRK-2", customer_id="secret"))
+    await asyncio.sleep(0.05)  # let the stream drain its queue before it is closed
+    broker.close_all()
+    response = await request
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert "TRK-1" not in response.text
+    assert 'event: trip_status\ndata: {"trip_id": null, "tracking_id": "TRK-2"' in response.text
+    assert "secret" not in response.text
@@ -2,6 +2,9 @@ import apiClient from './client';
 
 export interface LoginResponse {
     access_token: string;
+    refresh_token: string;
+    token_type: string;
+    expires_in: number;
     role: string;
 }
 
@@ -13,3 +16,14 @@ export const login = async (email: string, password: string): Promise<LoginRespo
 
     return response.data;
 };
+
+export const logout = async (): Promise<void> => {
+    const refreshToken = localStorage.getItem('refresh_token');
+    try {
+        await apiClient.post('/auth/logout', { refresh_token: refreshToken });
+    } finally {
+        localStorage.removeItem('token');
+        localStorage.removeItem('refresh_token');
+        localStorage.removeItem('role');
+    }
+};
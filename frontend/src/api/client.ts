@@ -1,12 +1,39 @@
 import axios, { InternalAxiosRequestConfig, AxiosResponse, AxiosError } from 'axios';
 
+const baseURL = import.meta.env.VITE_API_URL || 'http://localhost:8001/api/v1';
+
 const apiClient = axios.create({
-    baseURL: import.meta.env.VITE_API_URL || 'http://localhost:8001/api/v1',
+    baseURL,
     headers: {
         'Content-Type': 'application/json',
     },
 });
 
+// A single in-flight refresh shared by every request that hit a 401 meanwhile.
+let refreshInFlight: Promise<string | null> | null = null;
+
+const refreshAccessToken = (): Promise<string | null> => {
+    const refreshToken = localStorage.getItem('refresh_token');
+    if (!refreshToken) {
+        return Promise.resolve(null);
+    }
+    if (!refreshInFlight) {
+        refreshInFlight = axios
+            .post(`${baseURL}/auth/refresh`, { refresh_token: refreshToken })
+            .then((response) => {
+                localStorage.setItem('token', response.data.access_token);
+                localStorage.setItem('refresh_token', response.data.refresh_token);
+                localStorage.setItem('role', response.data.role);
+                return response.data.access_token as string;
+            })
+            .catch(() => null)
+            .finally(() => {
+                refreshInFlight = null;
+            });
+    }
+    return refreshInFlight;
+};
+
 // Add a request interceptor to attach the JWT token
 apiClient.interceptors.request.use(
     (config: InternalAxiosRequestConfig) => {
@@ -22,10 +49,23 @@ apiClient.interceptors.request.use(
 // Add a response interceptor to handle 401 Unauthorized
 apiClient.interceptors.response.use(
     (response: AxiosResponse) => response,
-    (error: AxiosError) => {
+    async (error: AxiosError) => {
+        const original = error.config as (InternalAxiosRequestConfig & { _retried?: boolean }) | undefined;
+
+        // Access tokens are short-lived: try one silent refresh before giving up.
+        if (error.response?.status === 401 && original && !original._retried) {
+            original._retried = true;
+            const token = await refreshAccessToken();
+            if (token) {
+                original.headers.Authorization = `Bearer ${token}`;
+                return apiClient(original);
+            }
+        }
+
         // If the error is 401 and we aren't already on the login page
         if (error.response?.status === 401 && window.location.pathname !== '/login') {
             localStorage.removeItem('token');
+            localStorage.removeItem('refresh_token');
             localStorage.removeItem('user');
             window.location.href = '/login';
         }
@@ -33,4 +73,20 @@ apiClient.interceptors.response.use(
     }
 );
 
+// List endpoints return one keyset page at a time and put the cursor for the
+// next one in X-Next-Cursor; it is absent on the last page.
+const NEXT_CURSOR_HEADER = 'x-next-cursor';
+const PAGE_SIZE = 500; // the server's MAX_PAGE_SIZE
+
+export const getAllPages = async <T>(url: string, params: Record<string, unknown> = {}): Promise<T[]> => {
+    const rows: T[] = [];
+    let cursor: string | undefined;
+    do {
+        const response = await apiClient.get<T[]>(url, { params: { ...params, limit: PAGE_SIZE, cursor } });
+        rows.push(...response.data);
+        cursor = response.headers[NEXT_CURSOR_HEADER] || undefined;
+    } while (cursor);
+    return rows;
+};
+
 export default apiClient;
@@ -1,4 +1,4 @@
-import apiClient from './client';
+import apiClient, { getAllPages } from './client';
 
 export interface Driver {
     id: string;
@@ -7,6 +7,7 @@ export interface Driver {
     license_expiry: string;
     safety_score: number | null;
     status: 'Off Duty' | 'On Duty' | 'On Trip' | 'Suspended';
+    version: number;
 }
 
 export interface DriverCreate {
@@ -21,11 +22,11 @@ export interface DriverUpdate {
     status?: string;
     license_expiry?: string;
     safety_score?: number;
+    version: number; // the version the edit was made against; 409 if it has changed since
 }
 
 export const getDrivers = async (): Promise<Driver[]> => {
-    const response = await apiClient.get<Driver[]>('/drivers/');
-    return response.data;
+    return getAllPages<Driver>('/drivers/');
 };
 
 export const createDriver = async (data: DriverCreate): Promise<Driver> => {
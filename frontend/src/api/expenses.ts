@@ -1,4 +1,4 @@
-import apiClient from './client';
+import apiClient, { getAllPages } from './client';
 
 export interface Expense {
     id: string;
@@ -18,8 +18,7 @@ export interface ExpenseCreate {
 }
 
 export const getExpenses = async (): Promise<Expense[]> => {
-    const response = await apiClient.get<Expense[]>('/expenses/');
-    return response.data;
+    return getAllPages<Expense>('/expenses/');
 };
 
 export const createExpense = async (data: ExpenseCreate): Promise<Expense> => {
@@ -1,4 +1,4 @@
-import apiClient from './client';
+import apiClient, { getAllPages } from './client';
 
 export interface MaintenanceLog {
     id: string;
@@ -24,8 +24,7 @@ export interface MaintenanceLogUpdate {
 }
 
 export const getMaintenanceLogs = async (): Promise<MaintenanceLog[]> => {
-    const response = await apiClient.get<MaintenanceLog[]>('/maintenance/');
-    return response.data;
+    return getAllPages<MaintenanceLog>('/maintenance/');
 };
 
 export const getMaintenanceLog = async (id: string): Promise<MaintenanceLog> => {
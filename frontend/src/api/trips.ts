@@ -1,4 +1,4 @@
-import apiClient from './client';
+import apiClient, { getAllPages } from './client';
 export interface Trip {
     id: string;
     vehicle_id: string;
@@ -27,8 +27,7 @@ export interface TripUpdateStatus {
 }
 
 export const getTrips = async (): Promise<Trip[]> => {
-    const response = await apiClient.get<Trip[]>('/trips/');
-    return response.data;
+    return getAllPages<Trip>('/trips/');
 };
 
 export const createTrip = async (data: TripCreate): Promise<Trip> => {
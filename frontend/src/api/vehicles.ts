@@ -1,4 +1,4 @@
-import apiClient from './client';
+import apiClient, { getAllPages } from './client';
 
 export interface Vehicle {
     id: string;
@@ -8,6 +8,7 @@ export interface Vehicle {
     year: number;
     max_capacity_kg: number;
     status: 'Available' | 'On Trip' | 'In Shop' | 'Retired';
+    version: number;
 }
 
 export interface VehicleCreate {
@@ -21,11 +22,11 @@ export interface VehicleCreate {
 export interface VehicleUpdate {
     max_capacity_kg?: number;
     status?: string;
+    version: number; // the version the edit was made against; 409 if it has changed since
 }
 
 export const getVehicles = async (): Promise<Vehicle[]> => {
-    const response = await apiClient.get<Vehicle[]>('/vehicles/');
-    return response.data;
+    return getAllPages<Vehicle>('/vehicles/');
 };
 
 export const createVehicle = async (data: VehicleCreate): Promise<Vehicle> => {
@@ -1,6 +1,7 @@
 import React from 'react';
 import { Truck, ShieldCheck, Wrench, FileText, BarChart, LogOut, LayoutDashboard, Package, MapPin } from 'lucide-react';
 import { Link, useLocation, useNavigate } from 'react-router-dom';
+import { logout } from '../api/auth';
 
 interface SidebarProps {
     role: string | null;
@@ -10,10 +11,12 @@ const Sidebar: React.FC<SidebarProps> = ({ role }) => {
     const location = useLocation();
     const navigate = useNavigate();
 
-    const handleLogout = () => {
-        localStorage.removeItem('token');
-        localStorage.removeItem('role');
-        navigate('/login');
+    const handleLogout = async () => {
+        try {
+            await logout();
+        } finally {
+            navigate('/login');
+        }
     };
 
     const isCustomer = role === 'Customer';
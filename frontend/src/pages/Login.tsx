@@ -19,6 +19,7 @@ const Login: React.FC = () => {
         try {
             const data = await login(email, password);
             localStorage.setItem('token', data.access_token);
+            localStorage.setItem('refresh_token', data.refresh_token);
             localStorage.setItem('role', data.role);
 
             // Role-aware redirect